@@ -0,0 +1,18 @@
+"""
+Gunicorn settings for serving app.wsgi or app.asgi.
+
+Use with ``gunicorn --config python:app.gunicorn_conf``.
+"""
+
+
+def post_worker_init(worker):
+    """Open the worker's connection pools before it accepts requests.
+
+    Pools are per process (see core.db.backends.postgresql_pool), so each
+    worker warms its own once Django is set up.
+    """
+    from django.db import connections
+
+    for connection in connections.all():
+        if hasattr(connection, 'warm_pool'):
+            connection.warm_pool()
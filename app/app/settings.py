@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'core',
     'user',
     'book',
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -79,16 +81,126 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
+# Connections persist for DB_CONN_MAX_AGE seconds and are checked before
+# reuse. Set DB_POOL=true to borrow connections from an in-process pool
+# instead (core.db.backends.postgresql_pool), e.g. for ASGI workers; the
+# pool then owns connection lifetime, so Django closes them per request.
+
+DB_POOL = os.environ.get('DB_POOL', 'false').lower() == 'true'
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': (
+            'core.db.backends.postgresql_pool' if DB_POOL
+            else 'django.db.backends.postgresql'
+        ),
         'HOST': os.environ.get('DB_HOST'),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
-        'PASSWORD': os.environ.get('DB_PASS')
+        'PASSWORD': os.environ.get('DB_PASS'),
+        'CONN_MAX_AGE': (
+            0 if DB_POOL else int(os.environ.get('DB_CONN_MAX_AGE', 60))
+        ),
+        'CONN_HEALTH_CHECKS': os.environ.get(
+            'DB_CONN_HEALTH_CHECKS', 'true').lower() == 'true',
+        'POOL': {
+            'MIN_SIZE': int(os.environ.get('DB_POOL_MIN_SIZE', 1)),
+            'MAX_SIZE': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'TIMEOUT': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        },
+    }
+}
+
+
+# DB_ENGINE=sqlite runs on a local SQLite file instead, e.g. for
+# benchmarks without a database server. Full-text search then falls back
+# to substring matching.
+
+if os.environ.get('DB_ENGINE', 'postgresql') == 'sqlite':
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('DB_NAME') or BASE_DIR / 'db.sqlite3',
+    }
+
+
+# Read replicas: DB_REPLICA_HOSTS lists replica hosts, comma separated. API
+# reads go to a random replica except for PIN_SECONDS after a write (see
+# core.routers). Tests read the default database instead.
+
+READ_REPLICAS = {
+    'ALIASES': [],
+    'PIN_SECONDS': int(os.environ.get('DB_REPLICA_PIN_SECONDS', 5)),
+    'CACHE_ALIAS': 'default',
+}
+
+for index, host in enumerate(
+        filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), 1):
+    alias = f'replica{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    READ_REPLICAS['ALIASES'].append(alias)
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# Use a shared backend (e.g. Redis) when running more than one worker, so
+# cache invalidation reaches every process.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
     }
 }
 
+# CATALOG_CACHE_ENABLED=true caches book API responses and sends list
+# ETags. It needs a shared CACHE_BACKEND (see book.caching).
+
+CATALOG_CACHE = {
+    'ALIAS': 'default',
+    'ENABLED': os.environ.get('CATALOG_CACHE_ENABLED',
+                              'false').lower() == 'true',
+    'TIMEOUT': int(os.environ.get('CATALOG_CACHE_TIMEOUT', 300)),
+}
+
+
+# Password hashing
+# PASSWORD_HASHER picks the algorithm for new hashes: scrypt, argon2 (needs
+# argon2-cffi) or pbkdf2. The others stay listed so existing hashes verify
+# and are upgraded on login. PASSWORD_HASHING_WORKERS > 0 hashes on a
+# bounded thread pool (see core.hashers).
+
+PASSWORD_HASHING = {
+    'WORKERS': int(os.environ.get('PASSWORD_HASHING_WORKERS', 0)),
+    'SCRYPT': {
+        'WORK_FACTOR': int(os.environ.get('PASSWORD_SCRYPT_WORK_FACTOR',
+                                          2 ** 14)),
+    },
+    'ARGON2': {
+        'TIME_COST': int(os.environ.get('PASSWORD_ARGON2_TIME_COST', 2)),
+        'MEMORY_COST': int(os.environ.get('PASSWORD_ARGON2_MEMORY_COST',
+                                          19456)),
+    },
+}
+
+_PASSWORD_HASHERS = {
+    'scrypt': 'core.hashers.TunedScryptPasswordHasher',
+    'argon2': 'core.hashers.TunedArgon2PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [
+    _PASSWORD_HASHERS.pop(os.environ.get('PASSWORD_HASHER', 'scrypt')),
+    *_PASSWORD_HASHERS.values(),
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -133,6 +245,71 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.User'
 
+# Tests tagged 'slow' only run with `manage.py test --tag slow`.
+
+TEST_RUNNER = 'core.runner.TestRunner'
+
+# JSON_LIBRARY=orjson renders and parses API JSON with orjson (see
+# core.renderers), falling back to the json module when it is not
+# installed; json keeps DRF's own JSONRenderer and JSONParser.
+
+_JSON_CLASSES = {
+    'orjson': ('core.renderers.FastJSONRenderer',
+               'core.parsers.FastJSONParser'),
+    'json': ('rest_framework.renderers.JSONRenderer',
+             'rest_framework.parsers.JSONParser'),
+}
+_JSON_RENDERER, _JSON_PARSER = _JSON_CLASSES[
+    os.environ.get('JSON_LIBRARY', 'orjson')
+]
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS' : 'drf_spectacular.openapi.AutoSchema',
-}
\ No newline at end of file
+    'DEFAULT_RENDERER_CLASSES': [
+        _JSON_RENDERER,
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        _JSON_PARSER,
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Token authentication cache
+# ALIAS selects a shared Django cache, whose entries live TTL seconds. None
+# keeps an in-process LRU instead: deleting a token or deactivating a user
+# only evicts it in the worker making the change, so other workers may
+# still accept it for up to LOCAL_TTL seconds.
+
+TOKEN_AUTH_CACHE = {
+    'ALIAS': os.environ.get('TOKEN_AUTH_CACHE_ALIAS') or None,
+    'MAX_SIZE': int(os.environ.get('TOKEN_AUTH_CACHE_MAX_SIZE', 10000)),
+    'TTL': int(os.environ.get('TOKEN_AUTH_CACHE_TTL', 300)),
+    'LOCAL_TTL': int(os.environ.get('TOKEN_AUTH_CACHE_LOCAL_TTL', 5)),
+}
+
+# Throttling of the token and signup APIs (see core.throttling)
+# CACHE_ALIAS shares limits between workers as fixed windows; None keeps
+# token buckets in-process.
+
+THROTTLING = {
+    'CACHE_ALIAS': os.environ.get('THROTTLE_CACHE_ALIAS') or None,
+    'RATES': {
+        'login_ip': os.environ.get('THROTTLE_LOGIN_IP', '20/min'),
+        'login_email': os.environ.get('THROTTLE_LOGIN_EMAIL', '5/min'),
+        'signup_ip': os.environ.get('THROTTLE_SIGNUP_IP', '10/hour'),
+    },
+}
+
+# Profiling
+# A PROFILING_SAMPLE_RATE fraction of API requests is profiled into the
+# histograms at /api/profile-stats/ (see core.profiling). Each worker
+# process keeps its own histograms.
+# PROFILING_HEADERS=true adds X-Query-Count and Server-Timing headers and
+# profiles every request sending X-Profile.
+
+PROFILING = {
+    'SAMPLE_RATE': float(os.environ.get('PROFILING_SAMPLE_RATE', 0)),
+    'HEADERS': os.environ.get('PROFILING_HEADERS', 'false').lower() == 'true',
+}
@@ -20,6 +20,8 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from core.views import ProfileStatsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
@@ -27,4 +29,6 @@ urlpatterns = [
          name='api-docs'),
     path('api/user/', include('user.urls')),
     path('api/books/', include('book.urls')),
+    path('api/profile-stats/', ProfileStatsView.as_view(),
+         name='profile-stats'),
 ]
@@ -0,0 +1,77 @@
+"""
+Benchmarks, run with ``python manage.py benchmark <name>``.
+
+Each bench_<name> module defines run(options), returning a list of result
+rows (dicts), and optionally add_arguments(parser) for its own options and
+check(rows, options), returning a message for each regression; any make
+the command fail.
+
+Benchmarks seed books and create users, so the command runs them in a
+throwaway test database, never the configured one.
+"""
+import importlib
+import pkgutil
+import threading
+import time
+from contextlib import contextmanager
+
+from django.test.utils import (
+    setup_databases,
+    teardown_databases,
+)
+
+PREFIX = 'bench_'
+
+
+def get_names():
+    """Return the names of the available benchmarks."""
+    return sorted(
+        name[len(PREFIX):] for _, name, _ in pkgutil.iter_modules(__path__)
+        if name.startswith(PREFIX)
+    )
+
+
+def load(name):
+    return importlib.import_module(f'{__name__}.{PREFIX}{name}')
+
+
+@contextmanager
+def test_database(keepdb=False):
+    """Run the block in test databases, created as the test runner does."""
+    old_config = setup_databases(verbosity=0, interactive=False,
+                                 keepdb=keepdb)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0, keepdb=keepdb)
+
+
+def rate(func, duration):
+    """Call func for about duration seconds; return calls per second."""
+    calls = 0
+    start = time.perf_counter()
+    deadline = start + duration
+    while True:
+        func()
+        calls += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            return calls / (now - start)
+
+
+def parallel_rate(func, duration, threads):
+    """Call func from threads at once; return total calls per second."""
+    rates = []
+    barrier = threading.Barrier(threads)
+
+    def worker():
+        barrier.wait()
+        rates.append(rate(func, duration))
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    return sum(rates)
@@ -0,0 +1,323 @@
+"""
+Latency, queries and memory of the book and token APIs.
+
+Seeds books up to --books, then drives list, retrieve, create and update
+on the book API, plus token login. Requests go through the Django test
+client and through a wsgiref server on a local port. Each scenario
+reports p50/p99 latency and the most queries any request ran. It also
+reports the peak memory allocated while serving one request, measured
+with tracemalloc in a separate, shorter pass. Results over the limits
+in --thresholds fail the command.
+
+Runs in a test database of the configured engine; use DB_ENGINE=sqlite
+for SQLite. The benchmark admin gets a random password and is deleted
+afterwards. Response caching is off unless --cache is given, so every
+request does its full work. Throttles are lifted for the run.
+"""
+import http.client
+import json
+import math
+import random
+import secrets
+import threading
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from wsgiref.simple_server import (
+    WSGIRequestHandler,
+    make_server,
+)
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.test import (
+    Client,
+    override_settings,
+)
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from benchmarks.seed import seed_books
+from core.models import (
+    Book,
+    Author,
+)
+
+THRESHOLDS = Path(__file__).with_name('thresholds.json')
+TRANSPORTS = ['client', 'wsgi']
+MEMORY_REQUESTS = 20
+BENCH_EMAIL = 'bench@example.com'
+BENCH_TITLE = 'bench book'
+UNLIMITED = '1000000/s'
+
+
+def _positive_int(value):
+    value = int(value)
+    if value < 1:
+        raise ValueError(value)
+
+    return value
+
+
+def add_arguments(parser):
+    parser.add_argument('--books', type=_positive_int, default=10000,
+                        help='Seed books up to this many first')
+    parser.add_argument('--requests', type=_positive_int, default=200,
+                        help='Requests per scenario and transport')
+    parser.add_argument('--transport', nargs='+', choices=TRANSPORTS,
+                        default=TRANSPORTS)
+    parser.add_argument('--cache', action='store_true',
+                        help='Keep the response cache on')
+    parser.add_argument('--thresholds', default=str(THRESHOLDS),
+                        help='JSON file of limits per scenario; empty to '
+                             'skip the check')
+
+
+class ClientTransport:
+    """Requests through the Django test client."""
+
+    def __init__(self):
+        self.client = Client()
+
+    def request(self, method, path, data=None, token=None):
+        """Send a request; return (status, queries it ran)."""
+        headers = {'HTTP_X_PROFILE': '1'}
+        if token:
+            headers['HTTP_AUTHORIZATION'] = f'Token {token}'
+        response = self.client.generic(
+            method, path, json.dumps(data) if data is not None else '',
+            content_type='application/json', **headers,
+        )
+
+        return response.status_code, int(response['X-Query-Count'])
+
+    def close(self):
+        pass
+
+
+class _QuietHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+class WSGITransport:
+    """Requests over HTTP to a wsgiref server in a thread."""
+
+    def __init__(self):
+        self.server = make_server('127.0.0.1', 0, get_wsgi_application(),
+                                  handler_class=_QuietHandler)
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+        self.connection = http.client.HTTPConnection(
+            '127.0.0.1', self.server.server_port,
+        )
+
+    def _serve(self):
+        try:
+            self.server.serve_forever()
+        finally:
+            # Release the server thread's connections to the test database.
+            connections.close_all()
+
+    def request(self, method, path, data=None, token=None):
+        """Send a request; return (status, queries it ran)."""
+        headers = {'X-Profile': '1', 'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Token {token}'
+        body = json.dumps(data) if data is not None else None
+        self.connection.request(method, path, body, headers)
+        response = self.connection.getresponse()
+        response.read()
+
+        return response.status, int(response.getheader('X-Query-Count'))
+
+    def close(self):
+        self.connection.close()
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+
+
+def _seeded_ids():
+    return list(Book.objects.exclude(title__startswith=BENCH_TITLE)
+                .order_by('id').values_list('id', flat=True)[:1000])
+
+
+def _book_list(count, token, password):
+    url = reverse('book:book-list') + '?page_size=20'
+    for i in range(count):
+        yield 'GET', url, None, token
+
+
+def _book_retrieve(count, token, password):
+    ids = _seeded_ids()
+    rng = random.Random(0)
+    for i in range(count):
+        url = reverse('book:book-detail', args=[rng.choice(ids)])
+        yield 'GET', url, None, token
+
+
+def _book_create(count, token, password):
+    url = reverse('book:book-list')
+    for i in range(count):
+        yield 'POST', url, {
+            'title': f'{BENCH_TITLE} {i}',
+            'price': 1000,
+            'description': 'Created by the API benchmark.',
+            'authors': [{'name': 'bench author',
+                         'email': 'bench-author@example.com'}],
+        }, token
+
+
+def _book_update(count, token, password):
+    # Seeded books stand in should every create have failed.
+    ids = list(Book.objects.filter(title__startswith=BENCH_TITLE)
+               .values_list('id', flat=True)) or _seeded_ids()
+    for i in range(count):
+        url = reverse('book:book-detail', args=[ids[i % len(ids)]])
+        yield 'PATCH', url, {'price': 2000 + i}, token
+
+
+def _token_login(count, token, password):
+    url = reverse('user:token')
+    for i in range(count):
+        yield 'POST', url, {'email': BENCH_EMAIL,
+                            'password': password}, None
+
+
+# Update reuses the books create made.
+SCENARIOS = {
+    'book_list': _book_list,
+    'book_retrieve': _book_retrieve,
+    'book_create': _book_create,
+    'book_update': _book_update,
+    'token_login': _token_login,
+}
+
+
+def _percentile(values, fraction):
+    """Return the nearest-rank percentile of values."""
+    values = sorted(values)
+    return values[max(math.ceil(fraction * len(values)) - 1, 0)]
+
+
+def _measure(transport, scenario, count, token, password):
+    latencies = []
+    queries = []
+    errors = 0
+    for method, path, data, auth in SCENARIOS[scenario](count, token,
+                                                        password):
+        start = perf_counter()
+        status, query_count = transport.request(method, path, data, auth)
+        latencies.append(perf_counter() - start)
+        queries.append(query_count)
+        errors += status >= 400
+
+    return latencies, queries, errors
+
+
+def _peak_memory(transport, scenario, count, token, password):
+    """Return the most memory, in KiB, allocated serving one request."""
+    peak = 0
+    tracemalloc.start()
+    try:
+        for method, path, data, auth in SCENARIOS[scenario](count, token,
+                                                            password):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            transport.request(method, path, data, auth)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+
+    return round(peak / 1024, 1)
+
+
+def _bench_settings(options):
+    throttling = getattr(settings, 'THROTTLING', {})
+    catalog_cache = getattr(settings, 'CATALOG_CACHE', {})
+    overrides = {
+        'DEBUG': False,
+        'ALLOWED_HOSTS': ['testserver', '127.0.0.1'],
+        'PROFILING': {'SAMPLE_RATE': 0, 'HEADERS': True},
+        'THROTTLING': {
+            **throttling,
+            'RATES': dict.fromkeys(
+                ['login_ip', 'login_email', 'signup_ip'], UNLIMITED,
+            ),
+        },
+    }
+    overrides['CATALOG_CACHE'] = {**catalog_cache,
+                                  'ENABLED': options['cache']}
+
+    return override_settings(**overrides)
+
+
+def _cleanup():
+    Book.objects.filter(title__startswith=BENCH_TITLE).delete()
+    Author.objects.filter(email='bench-author@example.com').delete()
+    get_user_model().objects.filter(email=BENCH_EMAIL).delete()
+
+
+def run(options):
+    seed_books(options['books'])
+    _cleanup()
+    password = secrets.token_urlsafe()
+
+    rows = []
+    try:
+        user = get_user_model().objects.create_superuser(BENCH_EMAIL,
+                                                         password)
+        token = Token.objects.create(user=user).key
+        with _bench_settings(options):
+            for name in options['transport']:
+                transport = {'client': ClientTransport,
+                             'wsgi': WSGITransport}[name]()
+                try:
+                    for scenario in SCENARIOS:
+                        latencies, queries, errors = _measure(
+                            transport, scenario, options['requests'], token,
+                            password,
+                        )
+                        peak_kb = _peak_memory(
+                            transport, scenario,
+                            min(options['requests'], MEMORY_REQUESTS), token,
+                            password,
+                        )
+                        rows.append({
+                            'scenario': scenario,
+                            'transport': name,
+                            'requests': len(latencies),
+                            'p50_ms': round(
+                                _percentile(latencies, 0.5) * 1000, 2),
+                            'p99_ms': round(
+                                _percentile(latencies, 0.99) * 1000, 2),
+                            'queries': max(queries),
+                            'peak_kb': peak_kb,
+                            'errors': errors,
+                        })
+                finally:
+                    transport.close()
+    finally:
+        _cleanup()
+
+    return rows
+
+
+def check(rows, options):
+    """Return a message for each result over its threshold."""
+    if not options['thresholds']:
+        return []
+    with open(options['thresholds']) as f:
+        thresholds = json.load(f)
+
+    return [
+        f'{row["scenario"]} ({row["transport"]}): {metric} {row[metric]} '
+        f'> {limit}'
+        for row in rows
+        for metric, limit in thresholds.get(row['scenario'], {}).items()
+        if row[metric] > limit
+    ]
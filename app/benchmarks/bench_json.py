@@ -0,0 +1,69 @@
+"""
+JSON rendering and parsing of book list pages, json against orjson.
+
+Seeds books up to --books, then renders a book list page of --page
+books, as the list API returns it, with DRF's JSONRenderer and with
+FastJSONRenderer, and parses the rendered page back with JSONParser and
+FastJSONParser.
+"""
+import io
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from benchmarks import rate
+from benchmarks.seed import seed_books
+from book.rows import ValuesRenderer
+from book.serializers import BookSerializer
+from core import renderers
+from core.models import Book
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+
+
+def add_arguments(parser):
+    parser.add_argument('--books', type=int, default=1000,
+                        help='Seed books up to this many first')
+    parser.add_argument('--page', type=int, default=50,
+                        help='Books per rendered page')
+    parser.add_argument('--duration', type=float, default=2.0,
+                        help='Seconds to run each measurement')
+
+
+def _page(count):
+    rows = ValuesRenderer.for_serializer(BookSerializer)
+    books = rows.render_rows(list(
+        rows.values(Book.objects.order_by('id'))[:count]
+    ))
+
+    return {'next': 'http://testserver/api/book/books/?cursor=cD0xMDA%3D',
+            'previous': None, 'results': books}
+
+
+def run(options):
+    seed_books(options['books'])
+    page = _page(options['page'])
+    body = JSONRenderer().render(page)
+
+    measurements = [
+        ('render', 'json', JSONRenderer().render, page),
+        ('render', 'orjson', FastJSONRenderer().render, page),
+        ('parse', 'json',
+         lambda data: JSONParser().parse(io.BytesIO(data)), body),
+        ('parse', 'orjson',
+         lambda data: FastJSONParser().parse(io.BytesIO(data)), body),
+    ]
+
+    rows = []
+    for step, library, func, data in measurements:
+        if library == 'orjson' and renderers.orjson is None:
+            continue
+        pages = rate(lambda: func(data), options['duration'])
+        rows.append({
+            'step': step,
+            'library': library,
+            'pages/s': round(pages),
+            'MB/s': round(pages * len(body) / 1e6, 1),
+        })
+
+    return rows
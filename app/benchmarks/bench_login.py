@@ -0,0 +1,48 @@
+"""
+Logins per second per core for each configured password hasher.
+
+Times the password check a login runs, which is what a login storm
+spends its CPU on: on one thread (one core) and on --workers threads at
+once, as the hashing pool runs them.
+"""
+import os
+
+from django.contrib.auth.hashers import get_hashers
+
+from benchmarks import (
+    parallel_rate,
+    rate,
+)
+
+PASSWORD = 'correct horse battery staple'
+
+
+def add_arguments(parser):
+    parser.add_argument('--duration', type=float, default=2.0,
+                        help='Seconds to run each measurement')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Threads checking passwords at once')
+
+
+def run(options):
+    rows = []
+    for hasher in get_hashers():
+        try:
+            encoded = hasher.encode(PASSWORD, hasher.salt())
+        except ValueError:
+            # The hasher's library is not installed.
+            continue
+
+        def login():
+            assert hasher.verify(PASSWORD, encoded)
+
+        rows.append({
+            'hasher': hasher.algorithm,
+            'logins/s/core': round(rate(login, options['duration']), 1),
+            f'logins/s ({options["workers"]} threads)': round(
+                parallel_rate(login, options['duration'],
+                              options['workers']), 1
+            ),
+        })
+
+    return rows
@@ -0,0 +1,62 @@
+"""
+Book list rendering throughput, DRF serializers against values() rows.
+
+Seeds books up to --books, then renders a page of --page books with
+BookSerializer and with ValuesRenderer. The "render" steps time the
+rendering of rows already read; the "read + render" steps include the
+queries, with the serializer's authors and genres prefetched.
+"""
+from benchmarks import rate
+from benchmarks.seed import seed_books
+from book.rows import ValuesRenderer
+from book.serializers import BookSerializer
+from book.views import get_related_lookups
+from core.models import Book
+
+
+def add_arguments(parser):
+    parser.add_argument('--books', type=int, default=1000,
+                        help='Seed books up to this many first')
+    parser.add_argument('--page', type=int, default=100,
+                        help='Books rendered per call')
+    parser.add_argument('--duration', type=float, default=2.0,
+                        help='Seconds to run each measurement')
+
+
+def run(options):
+    seed_books(options['books'])
+    page = options['page']
+    queryset = Book.objects.order_by('id')
+    select, prefetch = get_related_lookups(BookSerializer)
+    prefetched = queryset.select_related(*select).prefetch_related(*prefetch)
+    renderer = ValuesRenderer.for_serializer(BookSerializer)
+
+    books = list(prefetched[:page])
+    rows = list(renderer.values(queryset)[:page])
+    pks = [row['id'] for row in rows]
+    related = {name: relation.fetch(pks)
+               for name, relation in renderer.relations.items()}
+
+    def read_serializer():
+        return BookSerializer(prefetched[:page], many=True).data
+
+    def read_values():
+        return renderer.render_rows(list(renderer.values(queryset)[:page]))
+
+    measurements = [
+        ('render', 'serializer',
+         lambda: BookSerializer(books, many=True).data),
+        ('render', 'values',
+         lambda: [renderer.render(row, related) for row in rows]),
+        ('read + render', 'serializer', read_serializer),
+        ('read + render', 'values', read_values),
+    ]
+
+    return [
+        {
+            'step': step,
+            'path': path,
+            'rows/s': round(rate(func, options['duration']) * len(rows)),
+        }
+        for step, path, func in measurements
+    ]
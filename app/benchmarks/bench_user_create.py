@@ -0,0 +1,77 @@
+"""
+Bulk user creation throughput.
+
+Times the email check create_user runs, the old way (compiling the
+pattern on every call, then normalizing) against the shared validator,
+and then whole create_user calls. Users are created in a transaction
+that is rolled back. Without --password they get unusable passwords, so
+the numbers show the validation and insert cost rather than hashing.
+"""
+import re
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import BaseUserManager
+from django.db import transaction
+
+from benchmarks import rate
+from core.validators import normalize_email
+
+EMAIL = 'Bench.User+tag@Example.COM'
+
+
+class Rollback(Exception):
+    pass
+
+
+def old_normalize_email(email):
+    p = re.compile('^[a-zA-Z0-9+-_.]+@[a-zA-Z0-9-]+\\.[a-zA-Z0-9-.]+$')  # noqa
+    if not p.match(email):
+        raise ValueError('Check your email is valid.')
+
+    return BaseUserManager.normalize_email(email)
+
+
+def add_arguments(parser):
+    parser.add_argument('--duration', type=float, default=2.0,
+                        help='Seconds to run each email measurement')
+    parser.add_argument('--count', type=int, default=1000,
+                        help='Users to create')
+    parser.add_argument('--password', default=None,
+                        help='Password to hash for each user')
+
+
+def users_per_second(count, password):
+    manager = get_user_model().objects
+    start = time.perf_counter()
+    try:
+        with transaction.atomic():
+            for i in range(count):
+                manager.create_user(f'bench{i}@Example.com', password)
+            elapsed = time.perf_counter() - start
+            raise Rollback
+    except Rollback:
+        pass
+
+    return count / elapsed
+
+
+def run(options):
+    duration = options['duration']
+
+    return [
+        {
+            'step': 'email (compile per call)',
+            'ops/s': round(rate(lambda: old_normalize_email(EMAIL),
+                                duration)),
+        },
+        {
+            'step': 'email (shared validator)',
+            'ops/s': round(rate(lambda: normalize_email(EMAIL), duration)),
+        },
+        {
+            'step': f'create_user x{options["count"]}',
+            'ops/s': round(users_per_second(options['count'],
+                                            options['password'])),
+        },
+    ]
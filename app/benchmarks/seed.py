@@ -0,0 +1,91 @@
+"""
+Seed data for benchmarks.
+
+Books are generated deterministically and written with bulk_create in
+chunks, so 1M books take minutes and constant memory.
+"""
+import random
+
+from django.db import transaction
+
+from core.models import (
+    Book,
+    Author,
+    Genre,
+)
+from core.search import update_search_vectors
+from book.signals import invalidate
+
+SEED_CHUNK_SIZE = 5000
+BOOKS_PER_AUTHOR = 10
+GENRES = 20
+
+
+def _ensure_authors(count):
+    """Return the ids of count seed authors, creating missing ones."""
+    for start in range(0, count, SEED_CHUNK_SIZE):
+        Author.objects.bulk_create([
+            Author(name=f'seed author {i}', email=f'seed{i}@example.com')
+            for i in range(start, min(start + SEED_CHUNK_SIZE, count))
+        ], ignore_conflicts=True)
+
+    return list(Author.objects.filter(
+        name__startswith='seed author ',
+    ).order_by('id').values_list('id', flat=True)[:count])
+
+
+def _ensure_genres():
+    """Return the ids of the seed genres, creating missing ones."""
+    names = [f'seed genre {i}' for i in range(GENRES)]
+    existing = set(Genre.objects.filter(name__in=names)
+                   .values_list('name', flat=True))
+    Genre.objects.bulk_create([
+        Genre(name=name) for name in names if name not in existing
+    ])
+
+    return list(Genre.objects.filter(name__in=names)
+                .values_list('id', flat=True))
+
+
+@transaction.atomic
+def _create_books(start, stop, author_ids, genre_ids, authors_per_book):
+    rng = random.Random(start)
+    books = Book.objects.bulk_create([
+        Book(title=f'seed book {i}', price=rng.randrange(1000, 50000, 100),
+             description=f'Description of seed book {i}.')
+        for i in range(start, stop)
+    ])
+    BookAuthor = Book.authors.through
+    BookAuthor.objects.bulk_create([
+        BookAuthor(book_id=book.id, author_id=author_id)
+        for book in books
+        for author_id in rng.sample(author_ids, authors_per_book)
+    ])
+    BookGenre = Book.genres.through
+    BookGenre.objects.bulk_create([
+        BookGenre(book_id=book.id, genre_id=rng.choice(genre_ids))
+        for book in books
+    ])
+    update_search_vectors(Book.objects.filter(pk__in=[b.id for b in books]))
+
+
+def seed_books(count, authors_per_book=2):
+    """Add seed books until there are count books; return how many."""
+    existing = Book.objects.count()
+    if existing >= count:
+        return 0
+
+    author_ids = _ensure_authors(
+        max(count // BOOKS_PER_AUTHOR, authors_per_book)
+    )
+    genre_ids = _ensure_genres()
+    for start in range(existing, count, SEED_CHUNK_SIZE):
+        _create_books(start, min(start + SEED_CHUNK_SIZE, count),
+                      author_ids, genre_ids, authors_per_book)
+    Genre.objects.refresh_book_counts(genre_ids)
+    # bulk_create sends no signals.
+    invalidate(Book)
+    invalidate(Author)
+    invalidate(Genre)
+
+    return count - existing
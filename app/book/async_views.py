@@ -0,0 +1,199 @@
+"""
+Async read views for the book APIs.
+
+These serve list and retrieve for books, authors and genres on Django's
+async ORM, so an ASGI worker keeps many slow clients open without a
+thread each. They reuse the DRF views' serializers, filters and cursor
+pagination, and render the same JSON. Like the DRF views they send
+ETag and Last-Modified, cache responses, read from replicas and report
+to the profiler, sharing book.caching and core.routers. Writes and the
+other actions stay on the DRF views in book.views.
+"""
+from contextlib import nullcontext
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from core import routers
+from core.authentication import CachedTokenAuthentication
+from core.profiling import (
+    report_action,
+    serializing,
+)
+from book import (
+    caching,
+    views,
+)
+from book.rows import ValuesRenderer
+
+
+class AsyncReadView(View):
+    """List (no pk) and retrieve (pk) one model for authenticated users."""
+    http_method_names = ['get', 'head', 'options']
+    viewset = None
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        viewset = self.viewset
+        self.queryset = viewset.queryset
+        self.filter_backends = viewset.filter_backends
+        self.filter_fields = viewset.filter_fields
+        self.pagination_class = viewset.pagination_class
+        self.cache_models = viewset.cache_models
+        self.last_modified_fields = viewset.last_modified_fields
+
+    def get_queryset(self):
+        # Relations are read by ValuesRenderer, not prefetched.
+        return self.queryset.all()
+
+    def get_serializer_class(self):
+        return self.viewset(action=self.action).get_serializer_class()
+
+    def filter_queryset(self, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset,
+                                                 self)
+
+        return queryset
+
+    async def authenticate(self, request):
+        credentials = await CachedTokenAuthentication().aauthenticate(
+            request
+        )
+        if credentials is None:
+            raise exceptions.NotAuthenticated()
+        request.user, request.auth = credentials
+
+    async def get(self, request, pk=None):
+        self.request = Request(request)
+        self.request.accepted_renderer = self.renderer
+        self.action = 'list' if pk is None else 'retrieve'
+        report_action(self.action)
+        try:
+            await self.authenticate(self.request)
+            replica = nullcontext()
+            if routers.get_replicas() and await sync_to_async(
+                    routers.use_replica)(self.request, self.replica_models()):
+                replica = routers.replica_reads()
+            with replica:
+                return await self.conditional(pk)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    def replica_models(self):
+        return self.viewset(action=self.action).get_replica_models()
+
+    async def conditional(self, pk):
+        """Answer from the request's validators as ConditionalGetMixin."""
+        etag = last_modified = None
+        if pk is None:
+            if caching.is_enabled():
+                etag = await sync_to_async(caching.get_list_etag)(
+                    self, self.request
+                )
+        else:
+            last_modified = await sync_to_async(caching.get_last_modified)(
+                self.queryset.filter(pk=pk), self.last_modified_fields
+            )
+            if last_modified is not None:
+                etag = caching.get_detail_etag(self, self.request,
+                                               last_modified)
+        if etag is None:
+            return await self.cached(pk)
+
+        response = caching.get_not_modified(self.request, etag,
+                                            last_modified)
+        if response is None:
+            response = await self.cached(pk)
+        caching.set_validators(response, etag, last_modified)
+
+        return response
+
+    async def cached(self, pk):
+        """Render data, from the cache as CachedResponseMixin when on."""
+        if not caching.is_enabled():
+            return self.render(await self.get_data(pk))
+
+        key = await sync_to_async(caching.get_cache_key)(self, self.request)
+        data = await sync_to_async(caching.get_cached)(key)
+        if data is not None:
+            response = self.render(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        data = await self.get_data(pk)
+        await sync_to_async(caching.set_cached)(key, data)
+        response = self.render(data)
+        response['X-Cache'] = 'MISS'
+
+        return response
+
+    async def get_data(self, pk):
+        if pk is None:
+            return await self.list(self.request)
+
+        return await self.retrieve(self.request, pk)
+
+    async def list(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = ValuesRenderer.for_serializer(self.get_serializer_class())
+        paginator = self.pagination_class()
+        ordering = paginator.get_ordering(request, queryset, self)
+        queryset = rows.values(
+            queryset, *[order.lstrip('-') for order in ordering]
+        )
+
+        page = await paginator.apaginate_queryset(queryset, request, self)
+        with serializing():
+            if page is None:
+                return await rows.arender([row async for row in queryset])
+
+            return paginator.get_paginated_data(await rows.arender(page))
+
+    async def retrieve(self, request, pk):
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = ValuesRenderer.for_serializer(self.get_serializer_class())
+        try:
+            row = await rows.values(queryset).aget(pk=pk)
+        except ObjectDoesNotExist:
+            raise exceptions.NotFound()
+        with serializing():
+            return (await rows.arender([row]))[0]
+
+    def render(self, data, status=200):
+        return HttpResponse(self.renderer.render(data), status=status,
+                            content_type=self.renderer.media_type)
+
+    def handle_exception(self, exc):
+        """Render exc as DRF's exception handler does."""
+        if isinstance(exc.detail, (list, dict)):
+            data = exc.detail
+        else:
+            data = {'detail': exc.detail}
+        response = self.render(data, status=exc.status_code)
+        if isinstance(exc, (exceptions.NotAuthenticated,
+                            exceptions.AuthenticationFailed)):
+            response['WWW-Authenticate'] = CachedTokenAuthentication.keyword
+
+        return response
+
+
+class BookView(AsyncReadView):
+    """Async list and retrieve for books."""
+    viewset = views.BookViewSet
+
+
+class AuthorView(AsyncReadView):
+    """Async list and retrieve for authors."""
+    viewset = views.AuthorViewSet
+
+
+class GenreView(AsyncReadView):
+    """Async list and retrieve for genres."""
+    viewset = views.GenreViewSet
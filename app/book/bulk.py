@@ -0,0 +1,195 @@
+"""
+Bulk import and export of books.
+"""
+import csv
+import json
+from collections import Counter
+
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.models import (
+    Book,
+    Author,
+    Genre,
+)
+from core.search import update_search_vectors
+from book.serializers import BookDetailSerializer
+from book.signals import invalidate
+
+IMPORT_CHUNK_SIZE = 500
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ['ndjson', 'csv']
+CSV_HEADER = ['id', 'title', 'price', 'description', 'authors', 'genres']
+
+
+def _iter_chunks(lines, chunk_size):
+    """Yield lists of (line number, line) pairs, skipping blank lines."""
+    chunk = []
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        chunk.append((line_no, line))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _validate_genres(genres, genre_ids):
+    """Return errors for genre ids, checked against ids known upfront."""
+    if not isinstance(genres, list):
+        return ['Expected a list of genre ids.']
+
+    errors = []
+    for genre in genres:
+        # bool is an int subclass; PrimaryKeyRelatedField rejects it too.
+        if isinstance(genre, bool) or not isinstance(genre, int):
+            errors.append('Incorrect type. Expected pk value, received '
+                          f'{type(genre).__name__}.')
+        elif genre not in genre_ids:
+            errors.append(f'Invalid pk "{genre}" - object does not exist.')
+
+    return errors
+
+
+def _validate_chunk(chunk, errors, genre_ids):
+    """Return validated rows of a chunk, collecting errors per line.
+
+    Genres are checked against genre_ids instead of one query per row.
+    """
+    rows = []
+    for line_no, line in chunk:
+        try:
+            data = json.loads(line)
+        except ValueError:
+            errors.append({'line': line_no,
+                           'errors': {'non_field_errors': ['Invalid JSON.']}})
+            continue
+
+        genres = data.pop('genres', []) if isinstance(data, dict) else []
+        serializer = BookDetailSerializer(data=data)
+        row_errors = {}
+        if not serializer.is_valid():
+            row_errors.update(serializer.errors)
+        genre_errors = _validate_genres(genres, genre_ids)
+        if genre_errors:
+            row_errors['genres'] = genre_errors
+
+        if row_errors:
+            errors.append({'line': line_no, 'errors': row_errors})
+        else:
+            rows.append({**serializer.validated_data,
+                         'genres': list(dict.fromkeys(genres))})
+
+    return rows
+
+
+@transaction.atomic
+def _create_books(rows, author_ids):
+    """Write a chunk of validated rows, reusing already resolved authors."""
+    author_keys = [
+        [(author['name'], author['email'])
+         for author in row.get('authors', [])]
+        for row in rows
+    ]
+    missing = [
+        {'name': name, 'email': email}
+        for keys in author_keys for name, email in keys
+        if (name, email) not in author_ids
+    ]
+    for key, author in Author.objects.get_or_create_many(missing).items():
+        author_ids[key] = author.id
+
+    books = Book.objects.bulk_create([
+        Book(**{k: v for k, v in row.items()
+                if k not in ('authors', 'genres')})
+        for row in rows
+    ])
+    BookAuthor = Book.authors.through
+    BookAuthor.objects.bulk_create([
+        BookAuthor(book_id=book.id, author_id=author_ids[key])
+        for book, keys in zip(books, author_keys)
+        for key in dict.fromkeys(keys)
+    ])
+    BookGenre = Book.genres.through
+    links = BookGenre.objects.bulk_create([
+        BookGenre(book_id=book.id, genre_id=genre_id)
+        for book, row in zip(books, rows)
+        for genre_id in row['genres']
+    ])
+    Genre.objects.add_book_counts(Counter(link.genre_id for link in links))
+    update_search_vectors(Book.objects.filter(pk__in=[b.id for b in books]))
+
+    return len(books)
+
+
+def import_books(lines, chunk_size=IMPORT_CHUNK_SIZE):
+    """Import books from an iterable of JSON lines.
+
+    Lines are validated and written one chunk at a time, so the input is
+    never held in memory as a whole. Authors are deduplicated across the
+    whole import.
+    """
+    created = 0
+    errors = []
+    author_ids = {}
+    genre_ids = set(Genre.objects.values_list('id', flat=True))
+    for chunk in _iter_chunks(lines, chunk_size):
+        rows = _validate_chunk(chunk, errors, genre_ids)
+        if rows:
+            created += _create_books(rows, author_ids)
+
+    if created:
+        # bulk_create sends no signals.
+        invalidate(Book)
+        invalidate(Author)
+        invalidate(Genre)
+
+    return {'created': created, 'errors': errors}
+
+
+class _Echo:
+    """File-like object returning what is written, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _iter_export_rows(chunk_size):
+    """Yield serialized books, fetching relations once per chunk."""
+    books = (
+        Book.objects.defer('search_vector')
+        .order_by('id')
+        .prefetch_related('authors', 'genres')
+        .iterator(chunk_size=chunk_size)
+    )
+    for book in books:
+        yield BookDetailSerializer(book).data
+
+
+def export_books(output='ndjson', chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the whole catalog as JSON lines or CSV rows.
+
+    Books are read through a server-side cursor in chunks, so memory
+    does not grow with the size of the catalog.
+    """
+    rows = _iter_export_rows(chunk_size)
+    if output == 'ndjson':
+        encoder = JSONEncoder(ensure_ascii=False)
+        for row in rows:
+            yield encoder.encode(row) + '\n'
+        return
+
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for row in rows:
+        authors = '; '.join(
+            f"{author['name']} <{author['email']}>"
+            for author in row['authors']
+        )
+        genres = ';'.join(str(genre) for genre in row['genres'])
+        yield writer.writerow([row['id'], row['title'], row['price'],
+                               row['description'], authors, genres])
@@ -0,0 +1,243 @@
+"""
+Response caching for book APIs.
+
+Cached responses are keyed by a version number per model. Writes bump the
+version (see book.signals), so older entries are never read again and
+simply expire.
+
+Versions must be seen by every worker, so response caching and list ETags
+are off unless CATALOG_CACHE['ENABLED'] is set, and the book.E002 check
+rejects enabling them on a process-local cache.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+DEFAULTS = {
+    'ALIAS': 'default',
+    'ENABLED': False,
+    'TIMEOUT': 300,
+}
+PROCESS_LOCAL_BACKENDS = [
+    'django.core.cache.backends.locmem.LocMemCache',
+]
+STATS_KEYS = {
+    'hits': 'catalog:stats:hits',
+    'misses': 'catalog:stats:misses',
+}
+
+
+def get_options():
+    return {**DEFAULTS, **getattr(settings, 'CATALOG_CACHE', {})}
+
+
+def get_cache():
+    return caches[get_options()['ALIAS']]
+
+
+def is_enabled():
+    return get_options()['ENABLED']
+
+
+def is_shared(alias):
+    """Return whether a cache alias is seen by every worker process."""
+    return settings.CACHES[alias]['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+
+def _version_key(model):
+    return f'catalog:version:{model._meta.label_lower}'
+
+
+def get_versions(models):
+    """Return the current cache version of each model."""
+    cache = get_cache()
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        # Start from the clock so a lost version never reuses old keys.
+        for key in missing:
+            cache.add(key, time.time_ns(), None)
+        versions.update(cache.get_many(missing))
+
+    return [versions[key] for key in keys]
+
+
+def get_view_versions(view):
+    """Return the versions of view.cache_models, read once per request."""
+    if not hasattr(view, '_cache_versions'):
+        view._cache_versions = get_versions(view.cache_models)
+
+    return view._cache_versions
+
+
+def bump_version(model):
+    """Invalidate every cached response that depends on model."""
+    cache = get_cache()
+    try:
+        cache.incr(_version_key(model))
+    except ValueError:
+        cache.set(_version_key(model), time.time_ns(), None)
+
+
+def _count(name):
+    cache = get_cache()
+    try:
+        cache.incr(STATS_KEYS[name])
+    except ValueError:
+        if not cache.add(STATS_KEYS[name], 1, None):
+            cache.incr(STATS_KEYS[name])
+
+
+def get_stats():
+    """Return the hit and miss counters."""
+    values = get_cache().get_many(STATS_KEYS.values())
+    return {name: values.get(key, 0) for name, key in STATS_KEYS.items()}
+
+
+def _digest(view, request, *parts):
+    raw = ':'.join([
+        type(view).__name__,
+        view.action,
+        request.get_host(),
+        request.get_full_path(),
+        request.accepted_renderer.format,
+        *(str(part) for part in parts),
+    ])
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def get_list_etag(view, request):
+    """Return a list ETag built from the versions of view.cache_models."""
+    return '"%s"' % _digest(view, request, *get_view_versions(view))
+
+
+def get_last_modified(queryset, fields):
+    """Return the latest value of fields in queryset, in one query."""
+    values = queryset.aggregate(*[Max(field) for field in fields]).values()
+    values = [value for value in values if value is not None]
+
+    return max(values) if values else None
+
+
+def get_detail_etag(view, request, last_modified):
+    return '"%s"' % _digest(view, request, last_modified.isoformat())
+
+
+def _timestamp(last_modified):
+    return last_modified and int(last_modified.timestamp())
+
+
+def get_not_modified(request, etag, last_modified):
+    """Return a 304 response if request's validators match, else None."""
+    return get_conditional_response(request, etag=etag,
+                                    last_modified=_timestamp(last_modified))
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(_timestamp(last_modified))
+
+
+def get_cache_key(view, request):
+    """Return the key caching view's response to request."""
+    versions = get_view_versions(view)
+    return 'catalog:response:' + _digest(view, request, *versions)
+
+
+def get_cached(key):
+    """Return cached response data for key, counting a hit or miss."""
+    data = get_cache().get(key)
+    _count('misses' if data is None else 'hits')
+
+    return data
+
+
+def set_cached(key, data):
+    get_cache().set(key, data, get_options()['TIMEOUT'])
+
+
+class ConditionalGetMixin:
+    """Answer If-None-Match and If-Modified-Since with 304 Not Modified.
+
+    List ETags come from the model cache versions and need no query;
+    they are only sent when caching is enabled. Detail validators come
+    from the updated_at columns in last_modified_fields, read with one
+    aggregate query instead of the full rows.
+    """
+    cache_models = []
+    last_modified_fields = ['updated_at']
+
+    def _get_last_modified(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.queryset.filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+
+        return get_last_modified(queryset, self.last_modified_fields)
+
+    def _conditional(self, handler, request, etag, last_modified, *args,
+                     **kwargs):
+        response = get_not_modified(request, etag, last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        set_validators(response, etag, last_modified)
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if not is_enabled():
+            return super().list(request, *args, **kwargs)
+        etag = get_list_etag(self, request)
+
+        return self._conditional(super().list, request, etag, None,
+                                 *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        last_modified = self._get_last_modified()
+        if last_modified is None:
+            return super().retrieve(request, *args, **kwargs)
+        etag = get_detail_etag(self, request, last_modified)
+
+        return self._conditional(super().retrieve, request, etag,
+                                 last_modified, *args, **kwargs)
+
+
+class CachedResponseMixin:
+    """Cache list and retrieve responses until a dependent model changes."""
+    cache_models = []
+
+    def get_cache_key(self, request):
+        return get_cache_key(self, request)
+
+    def _cached(self, handler, request, *args, **kwargs):
+        if not is_enabled():
+            return handler(request, *args, **kwargs)
+        key = self.get_cache_key(request)
+        data = get_cached(key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            set_cached(key, response.data)
+        response['X-Cache'] = 'MISS'
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(super().retrieve, request, *args, **kwargs)
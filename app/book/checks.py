@@ -0,0 +1,63 @@
+"""
+System checks for book APIs.
+"""
+from django.core import checks
+
+
+def is_indexed(model, name):
+    """Return whether lookups on a model field can use an index."""
+    field = model._meta.get_field(name)
+    if field.many_to_many:
+        # Foreign keys of auto-created through tables are indexed.
+        return field.remote_field.through._meta.auto_created
+    if field.primary_key or field.unique or field.db_index:
+        return True
+
+    leading_fields = [
+        index.fields[0].lstrip('-')
+        for index in model._meta.indexes if index.fields
+    ] + [
+        constraint.fields[0]
+        for constraint in model._meta.constraints
+        if getattr(constraint, 'fields', None)
+    ]
+    return field.name in leading_fields
+
+
+@checks.register(checks.Tags.models)
+def check_filter_fields_indexed(app_configs=None, **kwargs):
+    """Check every filter declared by a book viewset uses an index."""
+    from book.urls import router
+
+    errors = []
+    for prefix, viewset, basename in router.registry:
+        model = viewset.queryset.model
+        for name in getattr(viewset, 'filter_fields', {}):
+            if not is_indexed(model, name):
+                errors.append(checks.Error(
+                    f'{viewset.__name__}.filter_fields includes {name!r}, '
+                    f'which has no index on {model._meta.label}.',
+                    hint='Add an index or remove the filter.',
+                    obj=viewset,
+                    id='book.E001',
+                ))
+
+    return errors
+
+
+@checks.register(checks.Tags.caches)
+def check_catalog_cache_shared(app_configs=None, **kwargs):
+    """Check response caching is only enabled on a shared cache."""
+    from book import caching
+
+    alias = caching.get_options()['ALIAS']
+    if not caching.is_enabled() or caching.is_shared(alias):
+        return []
+
+    return [checks.Error(
+        f'CATALOG_CACHE is enabled on the {alias!r} cache, which is local '
+        'to each process, so writes would not invalidate other workers.',
+        hint='Use a shared cache backend such as Redis, or disable '
+             'CATALOG_CACHE.',
+        id='book.E002',
+    )]
@@ -0,0 +1,111 @@
+"""
+Filters for book APIs.
+"""
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from core import search
+
+RANGE_LOOKUPS = ['gt', 'gte', 'lt', 'lte', 'startswith']
+
+
+class IndexedFilterBackend(BaseFilterBackend):
+    """Filter on the fields and lookups a view declares in filter_fields.
+
+    Every declared field must be backed by an index (see book.checks).
+    Filters on other model fields are rejected, and so are range lookups
+    on more than one field, since only one of them could use an index.
+    """
+
+    def get_filters(self, request, view):
+        """Return validated {(field, lookup): value} from the query."""
+        allowed = getattr(view, 'filter_fields', {})
+        model = view.queryset.model
+        model_fields = {field.name for field in model._meta.get_fields()}
+        filters = {}
+        for param, value in request.query_params.items():
+            name, _, lookup = param.partition('__')
+            lookup = lookup or 'exact'
+            if name not in allowed:
+                if name in model_fields:
+                    raise ValidationError(
+                        {param: 'Filtering on this field is not supported.'}
+                    )
+                continue
+            if lookup not in allowed[name]:
+                raise ValidationError({param: 'Supported lookups: {}.'.format(
+                    ', '.join(allowed[name])
+                )})
+
+            field = model._meta.get_field(name)
+            target = field.target_field if field.is_relation else field
+            try:
+                filters[(name, lookup)] = target.to_python(value)
+            except DjangoValidationError as e:
+                raise ValidationError({param: e.messages})
+
+        range_fields = {
+            name for name, lookup in filters if lookup in RANGE_LOOKUPS
+        }
+        if len(range_fields) > 1:
+            raise ValidationError(
+                'Range filters can only be applied to one field at a time.'
+            )
+
+        return filters
+
+    def filter_queryset(self, request, queryset, view):
+        filters = self.get_filters(request, view)
+        if not filters:
+            return queryset
+
+        return queryset.filter(**{
+            name if lookup == 'exact' else f'{name}__{lookup}': value
+            for (name, lookup), value in filters.items()
+        })
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': name if lookup == 'exact' else f'{name}__{lookup}',
+                'required': False,
+                'in': 'query',
+                'schema': {'type': 'string'},
+            }
+            for name, lookups in getattr(view, 'filter_fields', {}).items()
+            for lookup in lookups
+        ]
+
+
+class BookSearchFilter(BaseFilterBackend):
+    """Full-text search over books with ?q=, ordered by rank."""
+    search_param = 'q'
+    ranked_ordering = ('-rank', '-id')
+
+    def get_search_terms(self, request):
+        return request.query_params.get(self.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        return search.search_books(queryset, terms)
+
+    def get_ordering(self, request, queryset, view):
+        """Return the ordering cursor pagination should page by."""
+        if self.get_search_terms(request) and search.is_supported(queryset):
+            return self.ranked_ordering
+
+        return view.pagination_class.ordering
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Full-text search over title, description and '
+                           'author names.',
+            'schema': {'type': 'string'},
+        }]
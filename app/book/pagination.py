@@ -0,0 +1,39 @@
+"""
+Pagination for book APIs.
+"""
+from asgiref.sync import sync_to_async
+from rest_framework.pagination import CursorPagination
+
+
+class AsyncCursorPaginationMixin:
+    """Cursor pagination usable from async views.
+
+    apaginate_queryset() runs CursorPagination.paginate_queryset, which
+    reads the page into a list, in the sync thread, so the async views
+    hand out the same cursors and links.
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return await sync_to_async(self.paginate_queryset)(queryset,
+                                                           request, view)
+
+    def get_paginated_data(self, data):
+        """Return the body get_paginated_response() would render."""
+        return {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+
+class BookCursorPagination(AsyncCursorPaginationMixin, CursorPagination):
+    """Keyset pagination for books, newest first."""
+    ordering = '-id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class NameCursorPagination(BookCursorPagination):
+    """Keyset pagination by name, with id as a tiebreaker."""
+    ordering = ('-name', 'id')
@@ -0,0 +1,173 @@
+"""
+Render serializer output from values() rows.
+
+Reading values() skips building model instances, and the relations a
+serializer nests are read with one values() query each, grouped by the
+parent row. Fields are compiled once per serializer into a plan of
+(name, column, converter) steps, so rendering a row skips DRF's
+per-field attribute lookups. The output matches what the serializer
+renders for the same objects.
+"""
+from collections import defaultdict
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+
+
+def _check_column(serializer, name, field):
+    """Fail unless field reads one column of the serializer's model."""
+    if (isinstance(field, (serializers.BaseSerializer,
+                           serializers.RelatedField,
+                           serializers.ManyRelatedField))
+            or field.source == '*' or '.' in field.source):
+        raise ImproperlyConfigured(
+            f'{type(serializer).__name__}.{name} is not a model column.'
+        )
+
+
+def _readable_fields(serializer):
+    return [(name, field) for name, field in serializer.fields.items()
+            if not field.write_only]
+
+
+def _converter(field):
+    """Return a function rendering a non-null value as field does."""
+    # These fields render with plain str() and int().
+    if type(field) in (serializers.CharField, serializers.EmailField):
+        return str
+    if type(field) is serializers.IntegerField:
+        return int
+
+    return field.to_representation
+
+
+class Relation:
+    """A many-to-many field rendered as nested objects or a pk list."""
+
+    def __init__(self, model_field, child=None):
+        through = model_field.remote_field.through
+        target = model_field.m2m_reverse_field_name()
+        self.source = model_field.m2m_field_name() + '_id'
+        self.plan = None
+        if child is not None:
+            self.plan = []
+            for name, field in _readable_fields(child):
+                _check_column(child, name, field)
+                self.plan.append((name, f'{target}__{field.source}',
+                                  _converter(field)))
+            columns = [column for _, column, _ in self.plan]
+        else:
+            columns = [target + '_id']
+        self.columns = columns
+        # values() rather than values_list(): Django 4.1 cannot iterate
+        # values_list() querysets asynchronously.
+        self.queryset = through.objects.order_by(target + '_id').values(
+            self.source, *columns
+        )
+
+    def _render(self, row):
+        if self.plan is None:
+            return row[self.columns[0]]
+
+        data = {}
+        for name, column, convert in self.plan:
+            value = row[column]
+            data[name] = None if value is None else convert(value)
+
+        return data
+
+    def fetch(self, pks):
+        """Return rendered related items keyed by parent pk."""
+        grouped = defaultdict(list)
+        queryset = self.queryset.filter(**{self.source + '__in': pks})
+        for row in queryset:
+            grouped[row[self.source]].append(self._render(row))
+
+        return grouped
+
+    async def afetch(self, pks):
+        """Return rendered related items keyed by parent pk."""
+        grouped = defaultdict(list)
+        queryset = self.queryset.filter(**{self.source + '__in': pks})
+        async for row in queryset.aiterator():
+            grouped[row[self.source]].append(self._render(row))
+
+        return grouped
+
+
+class ValuesRenderer:
+    """Render rows the way serializer_class renders model instances.
+
+    Supports model columns, nested serializers over many-to-many fields
+    and primary key lists, which is everything the book serializers use.
+    """
+    _renderers = {}
+
+    def __init__(self, serializer_class):
+        serializer = serializer_class()
+        model = serializer_class.Meta.model
+        self.pk = model._meta.pk.attname
+        self.fields = _readable_fields(serializer)
+        self.relations = {}
+        # (name, column, converter) per field; relations have no column.
+        self.plan = []
+        for name, field in self.fields:
+            if isinstance(field, serializers.ListSerializer):
+                self.relations[name] = Relation(
+                    model._meta.get_field(field.source), field.child
+                )
+                self.plan.append((name, None, None))
+            elif isinstance(field, serializers.ManyRelatedField):
+                self.relations[name] = Relation(
+                    model._meta.get_field(field.source)
+                )
+                self.plan.append((name, None, None))
+            else:
+                _check_column(serializer, name, field)
+                self.plan.append((name, field.source, _converter(field)))
+
+    @classmethod
+    def for_serializer(cls, serializer_class):
+        if serializer_class not in cls._renderers:
+            cls._renderers[serializer_class] = cls(serializer_class)
+
+        return cls._renderers[serializer_class]
+
+    def values(self, queryset, *extra):
+        """Return queryset.values() with the columns render() reads."""
+        columns = [self.pk] + [
+            field.source for name, field in self.fields
+            if name not in self.relations
+        ]
+
+        return queryset.values(*dict.fromkeys(columns + list(extra)))
+
+    def render(self, row, related):
+        data = {}
+        for name, column, convert in self.plan:
+            if column is None:
+                data[name] = related[name].get(row[self.pk], [])
+            else:
+                value = row[column]
+                data[name] = None if value is None else convert(value)
+
+        return data
+
+    def render_rows(self, rows):
+        """Render values() rows, reading each relation with one query."""
+        pks = [row[self.pk] for row in rows]
+        related = {
+            name: relation.fetch(pks) if pks else {}
+            for name, relation in self.relations.items()
+        }
+
+        return [self.render(row, related) for row in rows]
+
+    async def arender(self, rows):
+        """Render values() rows, reading each relation with one query."""
+        pks = [row[self.pk] for row in rows]
+        related = {}
+        for name, relation in self.relations.items():
+            related[name] = await relation.afetch(pks) if pks else {}
+
+        return [self.render(row, related) for row in rows]
@@ -1,34 +1,40 @@
 """
 Serializers for book APIs.
 """
+import logging
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from rest_framework import serializers
+from rest_framework.validators import UniqueTogetherValidator
 from core.models import (
     Book,
     Author,
     Genre,
 )
+from core.validators import NormalizedEmailField
+
+logger = logging.getLogger(__name__)
 
 class GenreSerializer(serializers.ModelSerializer):
     """Serializer for Genres."""
 
     class Meta:
         model = Genre
-        fields = ['id', 'name']
-        read_only_fields = ['id']
+        fields = ['id', 'name', 'book_count']
+        read_only_fields = ['id', 'book_count']
 
 
-class AuthorCreateSerializer(GenreSerializer):
+class GenreCreateSerializer(GenreSerializer):
 
     class Meta(GenreSerializer.Meta):
         fields = GenreSerializer.Meta.fields
 
-    def validate_email(self, value):
-            if value is not None:
-                genre_name = Genre.objects.filter(name=value).exists()
-                if genre_name:
-                    raise serializers.ValidationError("It's already exist.")
+    def validate_name(self, value):
+        if Genre.objects.filter(name=value).exists():
+            raise serializers.ValidationError("It's already exist.")
 
-            return value
+        return value
 
 
 class AuthorSerializer(serializers.ModelSerializer):
@@ -40,7 +46,21 @@ class AuthorSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
+class AuthorUpdateSerializer(AuthorSerializer):
+    """Serializer for updating authors.
+
+    Not nested in books, which link to existing (name, email) pairs.
+    """
+
+    class Meta(AuthorSerializer.Meta):
+        validators = [
+            UniqueTogetherValidator(queryset=Author.objects.all(),
+                                    fields=['name', 'email']),
+        ]
+
+
 class AuthorCreateSerializer(AuthorSerializer):
+    email = NormalizedEmailField(max_length=255)
 
     class Meta(AuthorSerializer.Meta):
         fields = AuthorSerializer.Meta.fields
@@ -54,40 +74,112 @@ class AuthorCreateSerializer(AuthorSerializer):
             return value
 
 
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """Many related objects by primary key, looked up with one query."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pk_field = queryset.model._meta.pk
+        pks = []
+        for value in data:
+            try:
+                pks.append(pk_field.to_python(value))
+            except DjangoValidationError:
+                child.fail('incorrect_type', data_type=type(value).__name__)
+
+        found = queryset.in_bulk(pks)
+        for pk in pks:
+            if pk not in found:
+                child.fail('does_not_exist', pk_value=pk)
+
+        return [found[pk] for pk in dict.fromkeys(pks)]
+
+
+def set_related(manager, wanted_ids, current_ids):
+    """Add and remove only the through rows that differ.
+
+    Returns the number of rows changed.
+    """
+    removed_ids = current_ids - wanted_ids
+    added_ids = wanted_ids - current_ids
+    if removed_ids:
+        manager.remove(*removed_ids)
+    if added_ids:
+        manager.add(*added_ids)
+
+    return len(removed_ids) + len(added_ids)
+
+
 class BookSerializer(serializers.ModelSerializer):
     """Serializer for books."""
     authors = AuthorSerializer(many=True, required=False)
+    genres = BulkManyRelatedField(
+        child_relation=serializers.PrimaryKeyRelatedField(
+            queryset=Genre.objects.all()
+        ),
+        required=False,
+    )
 
     class Meta:
         model = Book
         fields = [
-            'id', 'title', 'price', 'authors'
+            'id', 'title', 'price', 'authors', 'genres'
         ]
         read_only_fields = ['id']
 
-    def _get_or_create_authors(self, authors, book):
-        """Handel getting or creating authors as needed."""
-        for author in authors:
-            author_obj, created = Author.objects.get_or_create(
-                **author
-            )
-            book.authors.add(author_obj)
+    def _set_authors(self, authors, book, created=False):
+        """Link book to exactly the given authors, creating them as needed.
+
+        Only the through rows that differ from the current set are
+        inserted or deleted. Returns the number of rows changed.
+        """
+        author_objs = Author.objects.get_or_create_many(authors)
+        wanted_ids = {author.id for author in author_objs.values()}
+        current_ids = set() if created else {
+            author.id for author in book.authors.all()
+        }
+
+        changed = set_related(book.authors, wanted_ids, current_ids)
+        logger.info('Book %s authors: %d rows changed', book.id, changed)
+
+        return changed
+
+    def _set_genres(self, genres, book, created=False):
+        """Link book to exactly the given genres."""
+        wanted_ids = {genre.id for genre in genres}
+        current_ids = set() if created else {
+            genre.id for genre in book.genres.all()
+        }
+
+        return set_related(book.genres, wanted_ids, current_ids)
 
+    @transaction.atomic
     def create(self, validated_data):
         """Create a book."""
         authors = validated_data.pop('authors', [])
+        genres = validated_data.pop('genres', [])
         book = Book.objects.create(**validated_data)
-        self._get_or_create_authors(authors, book)
+        self.authors_changed = self._set_authors(authors, book, created=True)
+        self._set_genres(genres, book, created=True)
 
         return book
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         """Update a book."""
         authors = validated_data.pop('authors', None)
+        genres = validated_data.pop('genres', None)
 
         if authors is not None:
-            instance.authors.clear()
-            self._get_or_create_authors(authors, instance)
+            self.authors_changed = self._set_authors(authors, instance)
+        if genres is not None:
+            self._set_genres(genres, instance)
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
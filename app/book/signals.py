@@ -0,0 +1,62 @@
+"""
+Signal handlers invalidating cached book API responses.
+"""
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+)
+from django.dispatch import receiver
+
+from core import routers
+from core.models import (
+    Book,
+    Author,
+    Genre,
+)
+from book.caching import bump_version
+
+
+def _changed(model):
+    bump_version(model)
+    routers.pin_to_primary(routers.model_key(model))
+
+
+def invalidate(model):
+    """Bump model's cache version now and again once the write commits.
+
+    The second bump drops responses cached by readers that saw the old
+    rows while the transaction was still open. Reads of model also stay
+    on the primary until replicas have had time to catch up.
+    """
+    _changed(model)
+    transaction.on_commit(lambda: _changed(model))
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Genre)
+def invalidate_model(sender, **kwargs):
+    invalidate(sender)
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+def invalidate_book_authors(sender, action, **kwargs):
+    if action.startswith('post_'):
+        invalidate(Book)
+
+
+@receiver(m2m_changed, sender=Book.genres.through)
+def invalidate_book_genres(sender, action, **kwargs):
+    if action.startswith('post_'):
+        invalidate(Book)
+        invalidate(Genre)
+
+
+@receiver(post_delete, sender=Book)
+def invalidate_genre_counts(sender, **kwargs):
+    invalidate(Genre)
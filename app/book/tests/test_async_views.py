@@ -0,0 +1,197 @@
+"""
+Tests for the async book read views.
+"""
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.test import (
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core import routers
+from core.models import (
+    Book,
+    Author,
+    Genre,
+)
+
+
+def async_url(name, *args):
+    """Create and return an async view URL."""
+    return reverse(f'book:async-{name}', args=args)
+
+
+def sync_url(name, *args):
+    """Create and return the matching DRF view URL."""
+    return reverse(f'book:{name}', args=args)
+
+
+class AsyncReadViewTests(TestCase):
+    """Test async list and retrieve match the DRF views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='password123',
+        )
+        cls.token = Token.objects.create(user=cls.user)
+        cls.genre = Genre.objects.create(name='Novel')
+        Genre.objects.create(name='Comic')
+        for i in range(5):
+            book = Book.objects.create(title=f'book{i}', price=1000 * i,
+                                       description=f'description{i}')
+            book.authors.add(
+                Author.objects.create(name=f'name{i}',
+                                      email=f'test{i}@example.com'),
+                Author.objects.create(name=f'other{i}',
+                                      email=f'other{i}@example.com'),
+            )
+            book.genres.add(cls.genre)
+        cls.book = book
+
+    def setUp(self):
+        self.sync_client = APIClient()
+        self.sync_client.credentials(
+            HTTP_AUTHORIZATION=f'Token {self.token.key}'
+        )
+
+    async def get(self, url, params=None, token=None, **headers):
+        """Request url from the async client with a token header."""
+        token = self.token.key if token is None else token
+        return await self.async_client.get(url, params,
+                                           authorization=f'Token {token}',
+                                           **headers)
+
+    async def assertSameResponse(self, name, *args, params=None):
+        res = await self.get(async_url(name, *args), params)
+        expected = await sync_to_async(self.sync_client.get)(
+            sync_url(name, *args), params, HTTP_ACCEPT='application/json',
+        )
+
+        self.assertEqual(res.status_code, expected.status_code)
+        self.assertEqual(res.content.replace(b'/async', b''),
+                         expected.content)
+
+        return res
+
+    async def test_lists_match_drf_views(self):
+        """Test async lists render the same JSON as the DRF views."""
+        for name in ['book-list', 'author-list', 'genre-list']:
+            await self.assertSameResponse(name)
+
+    async def test_retrieve_matches_drf_views(self):
+        """Test async retrieve renders the same JSON as the DRF views."""
+        await self.assertSameResponse('book-detail', self.book.id)
+        await self.assertSameResponse('author-detail',
+                                      (await Author.objects.afirst()).id)
+        await self.assertSameResponse('genre-detail', self.genre.id)
+
+    async def test_cursor_pages_match_drf_views(self):
+        """Test following async cursors walks the same pages."""
+        res = await self.assertSameResponse('book-list',
+                                            params={'page_size': 2})
+        while res.json()['next']:
+            cursor = res.json()['next'].split('cursor=')[1].split('&')[0]
+            res = await self.assertSameResponse(
+                'book-list', params={'page_size': 2, 'cursor': cursor},
+            )
+
+    async def test_filters_match_drf_views(self):
+        """Test async lists apply and validate the same filters."""
+        await self.assertSameResponse('book-list',
+                                      params={'price__gte': 2000})
+        await self.assertSameResponse('book-list',
+                                      params={'description': 'x'})
+        await self.assertSameResponse('author-list',
+                                      params={'email': 'test1@example.com'})
+
+    def test_list_query_count_is_fixed(self):
+        """Test a book list reads the page and each relation once."""
+        auth = f'Token {self.token.key}'
+        self.client.get(async_url('book-list'), HTTP_AUTHORIZATION=auth)
+
+        with self.assertNumQueries(3):
+            res = self.client.get(async_url('book-list'),
+                                  HTTP_AUTHORIZATION=auth)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    async def test_missing_object_not_found(self):
+        """Test retrieving a missing object returns 404."""
+        await self.assertSameResponse('book-detail', self.book.id + 1)
+
+    async def test_auth_required(self):
+        """Test requests without a valid token are rejected."""
+        res = await self.async_client.get(async_url('book-list'))
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res['WWW-Authenticate'], 'Token')
+
+        res = await self.get(async_url('book-list'), token='bad')
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_detail_validators_match_drf_views(self):
+        """Test async details send the DRF views' Last-Modified."""
+        url = async_url('book-detail', self.book.id)
+        res = await self.get(url)
+        expected = await sync_to_async(self.sync_client.get)(
+            sync_url('book-detail', self.book.id)
+        )
+        self.assertEqual(res['Last-Modified'], expected['Last-Modified'])
+
+        res = await self.get(url,
+                             if_none_match=res['ETag'])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(CATALOG_CACHE={'ALIAS': 'default', 'ENABLED': True})
+    async def test_list_cached_with_etag(self):
+        """Test async lists are cached and answer If-None-Match."""
+        await sync_to_async(cache.clear)()
+        res = await self.get(async_url('book-list'))
+        self.assertEqual(res['X-Cache'], 'MISS')
+
+        res = await self.get(async_url('book-list'))
+        self.assertEqual(res['X-Cache'], 'HIT')
+
+        res = await self.get(async_url('book-list'),
+                             if_none_match=res['ETag'])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_lists_not_cached_by_default(self):
+        """Test async lists follow the disabled cache like the DRF views."""
+        res = await self.get(async_url('book-list'))
+
+        self.assertNotIn('X-Cache', res)
+        self.assertNotIn('ETag', res)
+
+    @override_settings(READ_REPLICAS={'ALIASES': [DEFAULT_DB_ALIAS]})
+    async def test_reads_use_replica(self):
+        """Test async reads go to a replica unless the model is pinned."""
+        decisions = []
+        original = routers.PrimaryReplicaRouter.db_for_read
+
+        def record(router, model, **hints):
+            decisions.append(routers.reading_from_replica())
+            return original(router, model, **hints)
+
+        await sync_to_async(cache.clear)()
+        with patch.object(routers.PrimaryReplicaRouter, 'db_for_read',
+                          autospec=True, side_effect=record):
+            await self.get(async_url('book-list'))
+            self.assertTrue(decisions and all(decisions))
+
+            decisions.clear()
+            await sync_to_async(routers.pin_to_primary)(
+                routers.model_key(Book)
+            )
+            await self.get(async_url('book-list'))
+            self.assertFalse(any(decisions))
@@ -6,11 +6,11 @@ from django.urls import reverse
 from django.test import TestCase
 
 from rest_framework import status
-from rest_framework.test import APIClient
 
 from core.models import (
     Author,
 )
+from core.testing import QueryBudgetMixin
 from book.serializers import (
     BookSerializer,
     AuthorSerializer,
@@ -26,12 +26,9 @@ def create_user(email='user@example.com', password='password123'):
     """Create and return a user."""
     return get_user_model().objects.create_user(email=email, password=password)
 
-class PublicAuthorApiTests(TestCase):
+class PublicAuthorApiTests(QueryBudgetMixin, TestCase):
     """Test unauthenticated API requests."""
 
-    def setUp(self):
-        self.client = APIClient()
-
     def test_auth_required(self):
         """Test auth is required for retreving author."""
         res = self.client.get(AUTHOR_URL)
@@ -39,11 +36,11 @@ class PublicAuthorApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivateAuthorApiTests(TestCase):
+class PrivateAuthorApiTests(QueryBudgetMixin, TestCase):
     """Test authenticated API requests."""
 
     def setUp(self):
-        self.client = APIClient()
+        super().setUp()
         self.superuser = get_user_model().objects.create_superuser(
             email='superuser@example.com',
             password='password123',
@@ -62,7 +59,52 @@ class PrivateAuthorApiTests(TestCase):
         authors = Author.objects.all().order_by('-name')
         serializer = AuthorSerializer(authors, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_retrieve_authors_paginated_with_same_names(self):
+        """Test author pages break name ties by id."""
+        authors = [
+            Author.objects.create(name='Same name',
+                                  email=f'test{i}@example.com')
+            for i in range(5)
+        ]
+
+        url = AUTHOR_URL + '?page_size=2'
+        ids = []
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids.extend(author['id'] for author in res.data['results'])
+            url = res.data['next']
+
+        self.assertEqual(ids, [author.id for author in authors])
+
+    def test_filter_authors_by_email(self):
+        """Test filtering authors by email."""
+        author = Author.objects.create(name='Test name1',
+                                       email='test1@example.com')
+        Author.objects.create(name='Test name2', email='test2@example.com')
+
+        res = self.client.get(AUTHOR_URL, {'email': author.email})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([a['id'] for a in res.data['results']], [author.id])
+
+    def test_create_author_normalizes_email(self):
+        """Test creating an author lowercases the email domain."""
+        payload = {'name': 'test name', 'email': 'Test@EXAMPLE.com'}
+        res = self.client.post(AUTHOR_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['email'], 'Test@example.com')
+
+    def test_create_author_invalid_email(self):
+        """Test creating an author with an invalid email fails."""
+        payload = {'name': 'test name', 'email': 'test@com'}
+        res = self.client.post(AUTHOR_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Author.objects.exists())
 
     def test_create_author_limited_to_user(self):
         """Test creating of authors is limited to user."""
@@ -89,6 +131,18 @@ class PrivateAuthorApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(payload['name'], author.name)
 
+    def test_update_author_to_existing_name_and_email(self):
+        """Test updating an author to another's name and email fails."""
+        Author.objects.create(name='taken', email='test@example.com')
+        author = Author.objects.create(name='test name',
+                                       email='test@example.com',)
+
+        res = self.client.patch(detail_url(author.id), {'name': 'taken'})
+        author.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(author.name, 'test name')
+
     def test_update_author_limited_to_user(self):
         """Test updating a author limited to user."""
         author = Author.objects.create(name='test name',
@@ -1,23 +1,33 @@
 """
 Test for book APIs.
 """
+import json
+
 from django.contrib.auth import get_user_model
+from unittest import skipUnless
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework import status
-from rest_framework.test import APIClient
 
 from core.models import (
     Book,
     Author,
+    Genre,
 )
+from core.testing import QueryBudgetMixin
+from book import bulk
 from book.serializers import (
     BookSerializer,
     BookDetailSerializer,
     )
 
 BOOK_URL = reverse('book:book-list')
+IMPORT_URL = reverse('book:book-import-books')
+EXPORT_URL = reverse('book:book-export-books')
 
 def create_book(**params):
     """Create and return a sample recipe."""
@@ -39,12 +49,9 @@ def create_superuser(**params):
     """Create and return a superuser."""
     return get_user_model().objects.create_superuser(**params)
 
-class PublicBookApiTest(TestCase):
+class PublicBookApiTest(QueryBudgetMixin, TestCase):
     """Test unauthenticated API requests."""
 
-    def setUp(self):
-        self.client = APIClient()
-
     def test_auth_required(self):
         """Test auth is required to call API."""
         res = self.client.get(BOOK_URL)
@@ -52,11 +59,11 @@ class PublicBookApiTest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivateBookApiTest(TestCase):
+class PrivateBookApiTest(QueryBudgetMixin, TestCase):
     """Test authenticated API requests."""
 
     def setUp(self):
-        self.client = APIClient()
+        super().setUp()
         self.user = get_user_model().objects.create_user(
             email='user@example.com',
             password='password',
@@ -79,7 +86,124 @@ class PrivateBookApiTest(TestCase):
         books = Book.objects.all().order_by('-id')
         serializer = BookSerializer(books, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_retrieve_books_query_count_is_fixed(self):
+        """Test listing books does not query authors per book."""
+        def create_books_with_authors(count):
+            for _ in range(count):
+                book = create_book()
+                book.authors.create(name=f'name{book.id}',
+                                    email=f'author{book.id}@example.com')
+
+        self.client.force_authenticate(self.user)
+        create_books_with_authors(2)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(BOOK_URL)
+
+        create_books_with_authors(10)
+        with CaptureQueriesContext(connection) as many:
+            res = self.client.get(BOOK_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 12)
+        self.assertEqual(len(few), len(many))
+
+    def test_retrieve_books_paginated_by_cursor(self):
+        """Test listing books follows cursors without counting rows."""
+        books = [create_book() for _ in range(5)]
+
+        self.client.force_authenticate(self.user)
+        url = BOOK_URL + '?page_size=2'
+        ids, query_counts = [], []
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertFalse(any('COUNT(' in query['sql']
+                                 for query in queries))
+            query_counts.append(len(queries))
+            ids.extend(book['id'] for book in res.data['results'])
+            url = res.data['next']
+
+        self.assertEqual(ids, sorted((book.id for book in books),
+                                     reverse=True))
+        self.assertEqual(len(set(query_counts)), 1)
+
+    def test_search_books(self):
+        """Test searching books by title, description and author name."""
+        by_title = create_book(title='The Capital')
+        by_description = create_book(description='A study of capital.')
+        by_author = create_book()
+        by_author.authors.create(name='Capital Writer',
+                                 email='writer@example.com')
+        other = create_book(title='Other')
+
+        self.client.force_authenticate(self.user)
+        res = self.client.get(BOOK_URL, {'q': 'capital'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = {book['id'] for book in res.data['results']}
+        self.assertEqual(ids, {by_title.id, by_description.id, by_author.id})
+        self.assertNotIn(other.id, ids)
+
+    @skipUnless(connection.vendor == 'postgresql', 'Requires PostgreSQL.')
+    def test_search_books_ranked(self):
+        """Test search results are ordered by rank and paginate by cursor."""
+        weak = create_book(title='Other', description='capital')
+        strong = create_book(title='Capital', description='capital')
+
+        self.client.force_authenticate(self.user)
+        url = BOOK_URL + '?q=capital&page_size=1'
+        ids = []
+        while url:
+            res = self.client.get(url)
+            ids.extend(book['id'] for book in res.data['results'])
+            url = res.data['next']
+
+        self.assertEqual(ids, [strong.id, weak.id])
+
+    def test_filter_books(self):
+        """Test filtering books by price range, author and title prefix."""
+        author = Author.objects.create(name='name1',
+                                       email='test1@example.com')
+        cheap = create_book(title='Cheap book', price=1000)
+        cheap.authors.add(author)
+        middle = create_book(title='Middle book', price=5000)
+        middle.authors.add(author)
+        create_book(title='Expensive book', price=9000)
+
+        self.client.force_authenticate(self.user)
+        params_and_expected = [
+            ({'price__gte': 2000, 'price__lte': 9000}, None),
+            ({'authors': author.id}, [middle.id, cheap.id]),
+            ({'title__startswith': 'Mid'}, [middle.id]),
+            ({'authors': author.id, 'price__lte': 2000}, [cheap.id]),
+        ]
+        for params, expected in params_and_expected:
+            res = self.client.get(BOOK_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids = [book['id'] for book in res.data['results']]
+            if expected is None:
+                self.assertEqual(len(ids), 2)
+                self.assertIn(middle.id, ids)
+            else:
+                self.assertEqual(ids, expected)
+
+    def test_filter_books_rejected(self):
+        """Test unindexed filters and expensive combinations are rejected."""
+        self.client.force_authenticate(self.user)
+        rejected = [
+            {'description': 'Sample'},
+            {'price__gt': 1000},
+            {'authors__name': 'name1'},
+            {'price__gte': 'cheap'},
+            {'price__gte': 1000, 'title__startswith': 'Sample'},
+        ]
+        for params in rejected:
+            res = self.client.get(BOOK_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST,
+                             params)
 
     def test_get_book_detail(self):
         """Test get book details."""
@@ -189,6 +313,47 @@ class PrivateBookApiTest(TestCase):
             ).exists()
             self.assertTrue(exists)
 
+    def test_create_book_with_authors_query_count_is_fixed(self):
+        """Test creating a book costs the same queries for any authors."""
+        def post_book(author_count, prefix):
+            payload = {
+                'title': 'test title',
+                'price': 10000,
+                'authors': [
+                    {'name': f'{prefix} name{i}',
+                     'email': f'{prefix}{i}@example.com'}
+                    for i in range(author_count)
+                ],
+            }
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(BOOK_URL, payload, format='json')
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            return len(queries)
+
+        self.assertEqual(post_book(2, 'few'), post_book(20, 'many'))
+        self.assertEqual(Author.objects.count(), 22)
+
+    def test_create_book_with_existing_authors(self):
+        """Test creating a book reuses existing authors."""
+        author = Author.objects.create(name='test name1',
+                                       email='test1@example.com')
+        payload = {
+            'title': 'test title',
+            'price': 10000,
+            'authors': [
+                {'name': 'test name1', 'email': 'test1@example.com'},
+                {'name': 'test name1', 'email': 'test1@example.com'},
+                {'name': 'test name2', 'email': 'test2@example.com'},
+            ]
+        }
+        res = self.client.post(BOOK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        book = Book.objects.get(id=res.data['id'])
+        self.assertEqual(book.authors.count(), 2)
+        self.assertIn(author, book.authors.all())
+        self.assertEqual(Author.objects.count(), 2)
+
     def test_create_author_on_update(self):
         """Test creating authors when updating a book."""
         book = create_book()
@@ -235,6 +400,53 @@ class PrivateBookApiTest(TestCase):
         self.assertIn(second_author, book.authors.all())
         self.assertNotIn(first_author, book.authors.all())
 
+    def test_update_book_same_authors_changes_no_rows(self):
+        """Test updating a book with its current authors writes nothing."""
+        author = Author.objects.create(name='test name1',
+                                       email='test1@example.com')
+        book = create_book()
+        book.authors.add(author)
+
+        payload = {'authors': [{'name': author.name, 'email': author.email}]}
+        url = detail_url(book.id)
+        with self.assertLogs('book.serializers', level='INFO') as logs, \
+                CaptureQueriesContext(connection) as queries:
+            res = self.client.patch(url, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('0 rows changed', logs.output[0])
+        self.assertFalse(any(
+            query['sql'].startswith(('DELETE', 'INSERT'))
+            for query in queries
+        ))
+        self.assertEqual(list(book.authors.all()), [author])
+
+    def test_update_book_authors_changes_only_difference(self):
+        """Test updating book authors only adds and removes the difference."""
+        kept = Author.objects.create(name='test name1',
+                                     email='test1@example.com')
+        removed = Author.objects.create(name='test name2',
+                                        email='test2@example.com')
+        book = create_book()
+        book.authors.add(kept, removed)
+        through_id = book.authors.through.objects.get(author=kept).id
+
+        payload = {'authors': [
+            {'name': kept.name, 'email': kept.email},
+            {'name': 'test name3', 'email': 'test3@example.com'},
+        ]}
+        url = detail_url(book.id)
+        with self.assertLogs('book.serializers', level='INFO') as logs:
+            res = self.client.patch(url, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('2 rows changed', logs.output[0])
+        self.assertNotIn(removed, book.authors.all())
+        self.assertEqual(book.authors.count(), 2)
+        self.assertTrue(
+            book.authors.through.objects.filter(id=through_id).exists()
+        )
+
     def test_clear_book_authors(self):
         """Test clearing a book tags"""
         author = Author.objects.create(name='test name1',
@@ -249,5 +461,198 @@ class PrivateBookApiTest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(book.authors.count(), 0)
 
-    def test_create_book_with_new_genre(self):
-        """Test creating a book with new book."""
\ No newline at end of file
+    def test_create_book_with_genres(self):
+        """Test creating a book with existing genres."""
+        novel = Genre.objects.create(name='Novel')
+        comic = Genre.objects.create(name='Comic')
+        payload = {
+            'title': 'Sample book',
+            'price': 10000,
+            'genres': [novel.id, comic.id],
+        }
+        res = self.client.post(BOOK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        book = Book.objects.get(id=res.data['id'])
+        self.assertEqual(set(book.genres.all()), {novel, comic})
+        novel.refresh_from_db()
+        self.assertEqual(novel.book_count, 1)
+
+    def test_create_book_with_unknown_genre(self):
+        """Test creating a book with a missing genre is rejected."""
+        payload = {'title': 'Sample book', 'price': 10000, 'genres': [999]}
+        res = self.client.post(BOOK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Book.objects.exists())
+
+    def test_update_book_genres(self):
+        """Test replacing book genres updates both counts."""
+        novel = Genre.objects.create(name='Novel')
+        comic = Genre.objects.create(name='Comic')
+        book = create_book()
+        book.genres.add(novel)
+
+        url = detail_url(book.id)
+        res = self.client.patch(url, {'genres': [comic.id]}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(book.genres.all()), [comic])
+        novel.refresh_from_db()
+        comic.refresh_from_db()
+        self.assertEqual(novel.book_count, 0)
+        self.assertEqual(comic.book_count, 1)
+
+    def test_filter_books_by_genre(self):
+        """Test filtering books by genre."""
+        novel = Genre.objects.create(name='Novel')
+        book = create_book(title='Novel book')
+        book.genres.add(novel)
+        create_book(title='Other book')
+
+        self.client.force_authenticate(self.user)
+        res = self.client.get(BOOK_URL, {'genres': novel.id})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([b['id'] for b in res.data['results']], [book.id])
+
+    def test_import_books(self):
+        """Test importing books from JSON lines."""
+        rows = [
+            {'title': 'book1', 'price': 1000, 'description': 'desc1',
+             'authors': [{'name': 'name1', 'email': 'test1@example.com'}]},
+            {'title': 'book2', 'price': 2000,
+             'authors': [{'name': 'name1', 'email': 'test1@example.com'},
+                         {'name': 'name2', 'email': 'test2@example.com'}]},
+        ]
+        body = '\n'.join(json.dumps(row) for row in rows)
+        res = self.client.post(IMPORT_URL, body,
+                               content_type='application/x-ndjson')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'created': 2, 'errors': []})
+        self.assertEqual(Author.objects.count(), 2)
+        book = Book.objects.get(title='book2')
+        self.assertEqual(book.price, 2000)
+        self.assertEqual(book.authors.count(), 2)
+        self.assertEqual(Book.objects.get(title='book1').description,
+                         'desc1')
+
+    def test_imported_books_searchable(self):
+        """Test imported books are found by title and author name."""
+        body = json.dumps({
+            'title': 'The Capital', 'price': 1000,
+            'authors': [{'name': 'Marx', 'email': 'marx@example.com'}],
+        })
+        self.client.post(IMPORT_URL, body,
+                         content_type='application/x-ndjson')
+
+        for terms in ['capital', 'marx']:
+            res = self.client.get(BOOK_URL, {'q': terms})
+            self.assertEqual([b['title'] for b in res.data['results']],
+                             ['The Capital'])
+
+    def test_import_books_reports_row_errors(self):
+        """Test importing books reports invalid rows by line number."""
+        body = '\n'.join([
+            json.dumps({'title': 'book1', 'price': 1000}),
+            'not json',
+            '',
+            json.dumps({'title': 'book2'}),
+        ])
+        res = self.client.post(IMPORT_URL, body,
+                               content_type='application/x-ndjson')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['created'], 1)
+        self.assertEqual([error['line'] for error in res.data['errors']],
+                         [2, 4])
+        self.assertIn('price', res.data['errors'][1]['errors'])
+        self.assertTrue(Book.objects.filter(title='book1').exists())
+
+    def test_import_books_rejects_bool_genres(self):
+        """Test true is not accepted as genre id 1."""
+        Genre.objects.create(id=1, name='Novel')
+        body = json.dumps({'title': 'book1', 'price': 1000,
+                           'genres': [True]})
+        res = self.client.post(IMPORT_URL, body,
+                               content_type='application/x-ndjson')
+
+        self.assertEqual(res.data['created'], 0)
+        self.assertEqual(res.data['errors'][0]['errors']['genres'],
+                         ['Incorrect type. Expected pk value, received bool.'])
+        self.assertFalse(Book.objects.exists())
+
+    def test_import_books_query_count_is_fixed_per_chunk(self):
+        """Test importing a chunk of books costs a fixed number of queries."""
+        def import_rows(count, prefix):
+            lines = [
+                json.dumps({
+                    'title': f'{prefix}{i}', 'price': 1000,
+                    'authors': [{'name': f'{prefix}{i}',
+                                 'email': f'{prefix}{i}@example.com'}],
+                })
+                for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                result = bulk.import_books(lines, chunk_size=100)
+            self.assertEqual(result['created'], count)
+            return len(queries)
+
+        self.assertEqual(import_rows(2, 'few'), import_rows(50, 'many'))
+
+    def test_import_books_limited_to_admin(self):
+        """Test importing books is limited to admin."""
+        self.client.force_authenticate(self.user)
+        body = json.dumps({'title': 'book1', 'price': 1000})
+        res = self.client.post(IMPORT_URL, body,
+                               content_type='application/x-ndjson')
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Book.objects.exists())
+
+    def test_export_books(self):
+        """Test exporting books as JSON lines."""
+        books = [create_book(title=f'book{i}') for i in range(3)]
+        books[0].authors.create(name='name1', email='test1@example.com')
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(rows, [
+            json.loads(json.dumps(BookDetailSerializer(book).data))
+            for book in books
+        ])
+
+    def test_export_books_csv(self):
+        """Test exporting books as CSV."""
+        book = create_book(title='book1')
+        book.authors.create(name='name1', email='test1@example.com')
+
+        res = self.client.get(EXPORT_URL, {'output': 'csv'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0],
+                         'id,title,price,description,authors,genres')
+        self.assertEqual(
+            lines[1],
+            f'{book.id},book1,10000,Sample book description,'
+            'name1 <test1@example.com>,',
+        )
+
+    def test_export_books_invalid_output(self):
+        """Test exporting books with unknown output format fails."""
+        res = self.client.get(EXPORT_URL, {'output': 'xml'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_books_limited_to_admin(self):
+        """Test exporting books is limited to admin."""
+        self.client.force_authenticate(self.user)
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,286 @@
+"""
+Tests for caching of book API responses.
+"""
+from django.contrib.auth import get_user_model
+from django.test import (
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Book,
+    Author,
+    Genre,
+)
+from book import caching
+
+BOOK_URL = reverse('book:book-list')
+AUTHOR_URL = reverse('book:author-list')
+CACHE_STATS_URL = reverse('book:cache-stats')
+CATALOG_CACHE = {'ALIAS': 'default', 'ENABLED': True}
+
+
+def detail_url(book_id):
+    """Create and return a book detail URL."""
+    return reverse('book:book-detail', args=[book_id])
+
+
+@override_settings(CATALOG_CACHE=CATALOG_CACHE)
+class CachedResponseTests(TestCase):
+    """Test cached list and retrieve responses."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='password123',
+        )
+        self.superuser = get_user_model().objects.create_superuser(
+            email='superuser@example.com',
+            password='password123',
+        )
+        self.book = Book.objects.create(title='Sample book', price=10000)
+        self.author = self.book.authors.create(name='name1',
+                                               email='test1@example.com')
+        self.client.force_authenticate(self.user)
+
+    def test_repeated_list_served_from_cache(self):
+        """Test a repeated list request runs no queries."""
+        res = self.client.get(BOOK_URL)
+        self.assertEqual(res['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(BOOK_URL)
+
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached['X-Cache'], 'HIT')
+        self.assertEqual(cached.data, res.data)
+
+    def test_book_update_invalidates_cache(self):
+        """Test reads after an admin update return the new data."""
+        url = detail_url(self.book.id)
+        self.client.get(url)
+
+        self.client.force_authenticate(self.superuser)
+        self.client.patch(url, {'title': 'New title'})
+        self.client.force_authenticate(self.user)
+        res = self.client.get(url)
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['title'], 'New title')
+
+    def test_author_update_invalidates_book_cache(self):
+        """Test renaming an author refreshes cached books."""
+        self.client.get(BOOK_URL)
+
+        self.author.name = 'new name'
+        self.author.save()
+        res = self.client.get(BOOK_URL)
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['results'][0]['authors'][0]['name'],
+                         'new name')
+
+    def test_book_authors_change_invalidates_cache(self):
+        """Test changing book authors refreshes cached books."""
+        self.client.get(BOOK_URL)
+
+        self.book.authors.clear()
+        res = self.client.get(BOOK_URL)
+
+        self.assertEqual(res.data['results'][0]['authors'], [])
+
+    def test_genre_delete_invalidates_book_cache(self):
+        """Test deleting a genre drops it from cached books."""
+        genre = Genre.objects.create(name='Novel')
+        self.book.genres.add(genre)
+        url = detail_url(self.book.id)
+        self.client.get(url)
+        self.client.get(BOOK_URL)
+
+        genre.delete()
+
+        for res in [self.client.get(url), self.client.get(BOOK_URL)]:
+            self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['results'][0]['genres'], [])
+
+    def test_cache_keys_depend_on_query(self):
+        """Test different pages are cached separately."""
+        Book.objects.create(title='Other book', price=10000)
+
+        self.client.get(BOOK_URL)
+        res = self.client.get(BOOK_URL, {'page_size': 1})
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_cache_stats(self):
+        """Test cache stats count hits and misses."""
+        before = caching.get_stats()
+        self.client.get(AUTHOR_URL)
+        self.client.get(AUTHOR_URL)
+
+        self.client.force_authenticate(self.superuser)
+        res = self.client.get(CACHE_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['hits'], before['hits'] + 1)
+        self.assertEqual(res.data['misses'], before['misses'] + 1)
+
+    def test_cache_stats_limited_to_admin(self):
+        """Test cache stats are limited to admin."""
+        res = self.client.get(CACHE_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_version_survives_lost_key(self):
+        """Test a lost version key never reuses an earlier version."""
+        old = caching.get_versions([Author])
+        caching.get_cache().delete('catalog:version:core.author')
+
+        self.assertNotEqual(caching.get_versions([Author]), old)
+
+
+@override_settings(CATALOG_CACHE=CATALOG_CACHE)
+class ConditionalGetTests(TestCase):
+    """Test conditional GET requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='password123',
+        )
+        self.book = Book.objects.create(title='Sample book', price=10000)
+        self.author = self.book.authors.create(name='name1',
+                                               email='test1@example.com')
+        self.client.force_authenticate(self.user)
+
+    def test_list_not_modified(self):
+        """Test a matching ETag on the list returns 304 without queries."""
+        etag = self.client.get(BOOK_URL)['ETag']
+
+        with self.assertNumQueries(0):
+            res = self.client.get(BOOK_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+
+    def test_list_modified_after_write(self):
+        """Test the list ETag changes after a write."""
+        etag = self.client.get(BOOK_URL)['ETag']
+        Book.objects.create(title='Other book', price=10000)
+
+        res = self.client.get(BOOK_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_detail_not_modified(self):
+        """Test a matching ETag on a detail returns 304 with one query."""
+        url = detail_url(self.book.id)
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(1):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_if_modified_since(self):
+        """Test If-Modified-Since is answered from Last-Modified."""
+        url = detail_url(self.book.id)
+        last_modified = self.client.get(url)['Last-Modified']
+
+        res = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_modified_by_author_change(self):
+        """Test a book detail ETag changes when its author changes."""
+        url = detail_url(self.book.id)
+        etag = self.client.get(url)['ETag']
+
+        self.author.name = 'new name'
+        self.author.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['authors'][0]['name'], 'new name')
+
+    def test_detail_modified_by_authors_removed(self):
+        """Test a book detail ETag changes when authors are removed."""
+        url = detail_url(self.book.id)
+        etag = self.client.get(url)['ETag']
+
+        self.book.authors.clear()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['authors'], [])
+
+    def test_detail_modified_by_genre_delete(self):
+        """Test a book detail ETag changes when its genre is deleted."""
+        genre = Genre.objects.create(name='Novel')
+        self.book.genres.add(genre)
+        url = detail_url(self.book.id)
+        etag = self.client.get(url)['ETag']
+
+        genre.delete()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['genres'], [])
+
+    def test_genre_detail_modified_by_book_count(self):
+        """Test a genre detail ETag changes when its book count does."""
+        genre = Genre.objects.create(name='Novel')
+        url = reverse('book:genre-detail', args=[genre.id])
+        etag = self.client.get(url)['ETag']
+
+        self.book.genres.add(genre)
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['book_count'], 1)
+
+    def test_missing_detail_not_found(self):
+        """Test a missing book still returns 404."""
+        res = self.client.get(detail_url(self.book.id + 1),
+                              HTTP_IF_NONE_MATCH='"anything"')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CachingDisabledTests(TestCase):
+    """Test the catalog without response caching."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(
+            email='user@example.com',
+            password='password123',
+        ))
+        self.book = Book.objects.create(title='Sample book', price=10000)
+
+    def test_list_not_cached(self):
+        """Test lists are served fresh and without a version ETag."""
+        self.client.get(BOOK_URL)
+
+        res = self.client.get(BOOK_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn('X-Cache', res)
+        self.assertNotIn('ETag', res)
+
+    def test_detail_validators_kept(self):
+        """Test details still answer conditional GETs from updated_at."""
+        url = detail_url(self.book.id)
+        etag = self.client.get(url)['ETag']
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -0,0 +1,66 @@
+"""
+Tests for book system checks.
+"""
+from unittest.mock import patch
+
+from django.test import (
+    SimpleTestCase,
+    override_settings,
+)
+
+from core.models import Book
+from book import checks
+
+
+class FilterFieldsCheckTests(SimpleTestCase):
+    """Test the check for indexed filter fields."""
+
+    def test_declared_filters_indexed(self):
+        """Test the book viewsets only filter on indexed fields."""
+        self.assertEqual(checks.check_filter_fields_indexed(), [])
+
+    def test_unindexed_filter_reported(self):
+        """Test a filter on an unindexed field is reported."""
+        class UnindexedViewSet:
+            queryset = Book.objects.all()
+            filter_fields = {'description': ['exact']}
+
+        registry = [('unindexed', UnindexedViewSet, 'unindexed')]
+        with patch('book.urls.router.registry', registry):
+            errors = checks.check_filter_fields_indexed()
+
+        self.assertEqual([error.id for error in errors], ['book.E001'])
+
+    def test_is_indexed(self):
+        """Test which book fields count as indexed."""
+        self.assertTrue(checks.is_indexed(Book, 'id'))
+        self.assertTrue(checks.is_indexed(Book, 'price'))
+        self.assertTrue(checks.is_indexed(Book, 'authors'))
+        self.assertFalse(checks.is_indexed(Book, 'description'))
+
+
+class CatalogCacheCheckTests(SimpleTestCase):
+    """Test the check for a shared catalog cache."""
+
+    @override_settings(CATALOG_CACHE={'ENABLED': True})
+    def test_enabled_on_local_cache_reported(self):
+        """Test enabling caching on LocMemCache is an error."""
+        errors = checks.check_catalog_cache_shared()
+
+        self.assertEqual([error.id for error in errors], ['book.E002'])
+
+    @override_settings(
+        CATALOG_CACHE={'ENABLED': True},
+        CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': 'redis://localhost:6379/0',
+        }},
+    )
+    def test_enabled_on_shared_cache(self):
+        """Test caching on a shared backend passes."""
+        self.assertEqual(checks.check_catalog_cache_shared(), [])
+
+    @override_settings(CATALOG_CACHE={'ENABLED': False})
+    def test_disabled(self):
+        """Test a disabled cache needs no shared backend."""
+        self.assertEqual(checks.check_catalog_cache_shared(), [])
@@ -1,31 +1,45 @@
 """
 Tests for the genre APIs.
 """
+import threading
+import time
+from unittest import skipUnless
+
 from django.contrib.auth import get_user_model
+from django.db import (
+    connection,
+    transaction,
+)
 from django.urls import reverse
-from django.test import TestCase
+from django.test import (
+    TestCase,
+    TransactionTestCase,
+)
 
 from rest_framework import status
-from rest_framework.test import APIClient
 
 from core.models import (Book,
                          Author,
                          Genre)
+from core.testing import QueryBudgetMixin
 from book.serializers import GenreSerializer
 
 GENRE_URL = reverse('book:genre-list')
 
+
+def books_url(id):
+    """Create and return a genre books URL."""
+    return reverse('book:genre-books', args=[id])
+
+
 def detail_url(id):
     """Create and return a genre detail URL."""
     return reverse('book:genre-detail', args=[id])
 
 
-class PublicGenreApiTests(TestCase):
+class PublicGenreApiTests(QueryBudgetMixin, TestCase):
     """Test unauthenticated API requests."""
 
-    def setUp(self):
-        self.client = APIClient()
-
     def test_auth_required(self):
         """Test auth required for retrieving genres."""
         res = self.client.get(GENRE_URL)
@@ -33,15 +47,15 @@ class PublicGenreApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivateGenreApiTests(TestCase):
+class PrivateGenreApiTests(QueryBudgetMixin, TestCase):
     """Test authenticate API requests."""
 
     def setUp(self):
+        super().setUp()
         self.user = get_user_model().objects.create_superuser(
             email='superuser@example.com',
             password='testpassword',
         )
-        self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_genres(self):
@@ -58,7 +72,7 @@ class PrivateGenreApiTests(TestCase):
         genres = Genre.objects.all().order_by('-name')
         serializer = GenreSerializer(genres, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_create_genre_limited_to_user(self):
         """Test creating of genre is limited to user."""
@@ -96,3 +110,135 @@ class PrivateGenreApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Genre.objects.filter(name=genre_name).exists())
 
+    def test_create_genre(self):
+        """Test creating a genre."""
+        res = self.client.post(GENRE_URL, {'name': 'Novel'})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Genre.objects.filter(name='Novel').exists())
+
+    def test_list_genre_books(self):
+        """Test listing the books of a genre."""
+        genre = Genre.objects.create(name='Novel')
+        other = Genre.objects.create(name='Comic')
+        books = [Book.objects.create(title=f'book{i}', price=1000)
+                 for i in range(3)]
+        for book in books:
+            book.genres.add(genre)
+            book.authors.create(name=f'name{book.id}',
+                                email=f'test{book.id}@example.com')
+        Book.objects.create(title='other', price=1000).genres.add(other)
+
+        url = books_url(genre.id)
+        with self.assertNumQueries(4):
+            res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([book['id'] for book in res.data['results']],
+                         [book.id for book in reversed(books)])
+
+    def test_list_genre_books_not_found(self):
+        """Test listing books of a missing genre returns 404."""
+        res = self.client.get(books_url(999))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class GenreBookCountTests(QueryBudgetMixin, TestCase):
+    """Test genre book counts follow book changes."""
+
+    def setUp(self):
+        super().setUp()
+        self.genre = Genre.objects.create(name='Novel')
+        self.book = Book.objects.create(title='book1', price=1000)
+
+    def assertBookCount(self, expected):
+        self.genre.refresh_from_db()
+        self.assertEqual(self.genre.book_count, expected)
+
+    def test_count_follows_add_remove_clear(self):
+        """Test adding, removing and clearing books updates the count."""
+        other = Book.objects.create(title='book2', price=1000)
+
+        self.book.genres.add(self.genre)
+        self.genre.book_set.add(other)
+        self.assertBookCount(2)
+
+        self.book.genres.remove(self.genre)
+        self.assertBookCount(1)
+
+        self.genre.book_set.clear()
+        self.assertBookCount(0)
+
+    def test_count_follows_book_delete(self):
+        """Test deleting a book updates the count."""
+        self.book.genres.add(self.genre)
+
+        self.book.delete()
+
+        self.assertBookCount(0)
+
+    def test_count_ignores_existing_and_missing_links(self):
+        """Test re-adding or removing an unlinked book keeps the count."""
+        self.book.genres.add(self.genre)
+
+        self.genre.book_set.add(self.book)
+        self.assertBookCount(1)
+
+        self.genre.book_set.remove(
+            Book.objects.create(title='book2', price=1000)
+        )
+        self.assertBookCount(1)
+
+    def test_list_shows_book_count(self):
+        """Test the genre list shows the book count."""
+        self.book.genres.add(self.genre)
+        self.client.force_authenticate(get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpassword',
+        ))
+
+        res = self.client.get(GENRE_URL)
+
+        self.assertEqual(res.data['results'][0]['book_count'], 1)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Requires PostgreSQL.')
+class ConcurrentGenreBookCountTests(TransactionTestCase):
+    """Test book counts stay exact across overlapping transactions."""
+
+    def test_overlapping_adds(self):
+        """Test two transactions adding books to a genre both count."""
+        genre = Genre.objects.create(name='Novel')
+        books = [Book.objects.create(title=f'book{i}', price=1000)
+                 for i in range(2)]
+        first_added = threading.Event()
+
+        def add_first():
+            try:
+                with transaction.atomic():
+                    books[0].genres.add(genre)
+                    first_added.set()
+                    # Commit once the second add is waiting on the genre.
+                    time.sleep(0.5)
+            finally:
+                connection.close()
+
+        def add_second():
+            try:
+                first_added.wait()
+                with transaction.atomic():
+                    books[1].genres.add(genre)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=add_first),
+                   threading.Thread(target=add_second)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        genre.refresh_from_db()
+        self.assertEqual(genre.book_set.count(), 2)
+        self.assertEqual(genre.book_count, 2)
@@ -0,0 +1,109 @@
+"""
+Tests for rendering serializer output from values() rows.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.models import (
+    Book,
+    Author,
+    Genre,
+)
+from book import serializers
+from book.rows import ValuesRenderer
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+class ValuesRendererParityTests(TestCase):
+    """Test values() rows render the same JSON as the serializers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='password123',
+        )
+        novel = Genre.objects.create(name='Novel')
+        Genre.objects.create(name='Comic ☃')
+        for i in range(4):
+            book = Book.objects.create(title=f'book{i} "é "',
+                                       price=10 ** (i * 3),
+                                       description=f'description{i}')
+            book.authors.add(
+                Author.objects.create(name=f'name{i} \U0001F4DA',
+                                      email=f'test{i}@example.com'),
+                Author.objects.create(name=f'other{i}',
+                                      email=f'other{i}@example.com'),
+            )
+            book.genres.add(novel)
+        cls.book = book
+        Book.objects.create(title='no relations', price=0)
+        Genre.objects.refresh_book_counts([novel.id])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertSameJSON(self, serializer_class, queryset):
+        renderer = ValuesRenderer.for_serializer(serializer_class)
+        rows = renderer.render_rows(list(renderer.values(queryset)))
+
+        self.assertEqual(render(rows),
+                         render(serializer_class(queryset, many=True).data))
+
+    def test_renderer_matches_serializers(self):
+        """Test rendered rows match each read serializer."""
+        self.assertSameJSON(serializers.BookSerializer,
+                            Book.objects.order_by('id'))
+        self.assertSameJSON(serializers.BookDetailSerializer,
+                            Book.objects.order_by('id'))
+        self.assertSameJSON(serializers.AuthorSerializer,
+                            Author.objects.order_by('id'))
+        self.assertSameJSON(serializers.GenreSerializer,
+                            Genre.objects.order_by('id'))
+
+    def test_empty_rows(self):
+        """Test no rows render an empty list without queries."""
+        renderer = ValuesRenderer.for_serializer(serializers.BookSerializer)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(renderer.render_rows([]), [])
+
+    def test_lists_match_serializers(self):
+        """Test list pages render the same JSON as the serializers."""
+        for name, model, serializer_class in [
+            ('book-list', Book, serializers.BookSerializer),
+            ('author-list', Author, serializers.AuthorSerializer),
+            ('genre-list', Genre, serializers.GenreSerializer),
+        ]:
+            res = self.client.get(reverse(f'book:{name}'), {'page_size': 2})
+
+            results = res.data['results']
+            objects = model.objects.in_bulk([row['id'] for row in results])
+            expected = serializer_class(
+                [objects[row['id']] for row in results], many=True,
+            ).data
+            self.assertEqual(len(results), 2)
+            self.assertEqual(render(results), render(expected))
+
+    def test_retrieve_matches_serializers(self):
+        """Test retrieve renders the same JSON as the serializers."""
+        author = self.book.authors.first()
+        genre = Genre.objects.get(name='Novel')
+        for name, obj, serializer_class in [
+            ('book-detail', self.book, serializers.BookDetailSerializer),
+            ('author-detail', author, serializers.AuthorSerializer),
+            ('genre-detail', genre, serializers.GenreSerializer),
+        ]:
+            res = self.client.get(reverse(f'book:{name}', args=[obj.id]),
+                                  HTTP_ACCEPT='application/json')
+
+            self.assertEqual(res.content,
+                             render(serializer_class(obj).data))
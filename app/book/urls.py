@@ -7,7 +7,10 @@ from django.urls import (
 )
 
 from rest_framework.routers import DefaultRouter
-from book import views
+from book import (
+    async_views,
+    views,
+)
 
 router = DefaultRouter()
 router.register(r'books', views.BookViewSet)
@@ -17,5 +20,18 @@ router.register(r'genres', views.GenreViewSet)
 app_name = 'book'
 
 urlpatterns = [
+    path('cache-stats/', views.CacheStatsView.as_view(), name='cache-stats'),
+    path('async/books/', async_views.BookView.as_view(),
+         name='async-book-list'),
+    path('async/books/<int:pk>/', async_views.BookView.as_view(),
+         name='async-book-detail'),
+    path('async/authors/', async_views.AuthorView.as_view(),
+         name='async-author-list'),
+    path('async/authors/<int:pk>/', async_views.AuthorView.as_view(),
+         name='async-author-detail'),
+    path('async/genres/', async_views.GenreView.as_view(),
+         name='async-genre-list'),
+    path('async/genres/<int:pk>/', async_views.GenreView.as_view(),
+         name='async-genre-detail'),
     path('', include(router.urls)),
 ]
@@ -1,27 +1,170 @@
 """
 Views for the book APIs.
 """
-from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.permissions import IsAuthenticated
+from django.http import StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import (
+    serializers as drf_serializers,
+    viewsets,
+)
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import (
+    IsAdminUser,
+    IsAuthenticated,
+)
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from core.models import (
     Book,
     Author,
     Genre,
     )
+from core.authentication import CachedTokenAuthentication
 from core.permissions import IsAdminOrReadOnly
-from book import serializers
+from core.profiling import (
+    ProfilingMixin,
+    SerializerProfilingMixin,
+    serializing,
+)
+from core.routers import ReplicaReadMixin
+from book import (
+    bulk,
+    caching,
+    serializers,
+)
+from book.filters import (
+    BookSearchFilter,
+    IndexedFilterBackend,
+)
+from book.pagination import (
+    BookCursorPagination,
+    NameCursorPagination,
+)
+from book.rows import ValuesRenderer
 
-class BookViewSet(viewsets.ModelViewSet):
+
+def get_related_lookups(serializer_class, prefix=''):
+    """Return select_related and prefetch_related lookups for serializer."""
+    select, prefetch = [], []
+    for field in serializer_class().fields.values():
+        if field.write_only or field.source == '*':
+            continue
+        lookup = prefix + field.source.replace('.', '__')
+        if isinstance(field, drf_serializers.ListSerializer):
+            prefetch.append(lookup)
+            nested = get_related_lookups(type(field.child), lookup + '__')
+            prefetch.extend(nested[0] + nested[1])
+        elif isinstance(field, drf_serializers.ManyRelatedField):
+            prefetch.append(lookup)
+        elif isinstance(field, drf_serializers.BaseSerializer):
+            select.append(lookup)
+            nested = get_related_lookups(type(field), lookup + '__')
+            select.extend(nested[0])
+            prefetch.extend(nested[1])
+
+    return select, prefetch
+
+
+class RelatedQuerysetMixin:
+    """Load the nested relations a serializer renders with the queryset."""
+    unshaped_actions = ['destroy']
+    _related_lookups = {}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in self.unshaped_actions:
+            return queryset
+
+        return self.shape_queryset(queryset, self.get_serializer_class())
+
+    def shape_queryset(self, queryset, serializer_class):
+        """Add the related lookups serializer_class renders to queryset."""
+        if serializer_class not in self._related_lookups:
+            self._related_lookups[serializer_class] = get_related_lookups(
+                serializer_class
+            )
+        select, prefetch = self._related_lookups[serializer_class]
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+
+        return queryset
+
+
+class ValuesReadMixin:
+    """Serve list and retrieve from values() rows.
+
+    ValuesRenderer renders the same JSON as the action's serializer
+    without building model instances or going through DRF's fields.
+    """
+
+    def get_values_renderer(self):
+        return ValuesRenderer.for_serializer(self.get_serializer_class())
+
+    def get_values_queryset(self):
+        # The renderer reads the relations itself.
+        queryset = self.filter_queryset(self.get_queryset())
+
+        return queryset.prefetch_related(None)
+
+    def list(self, request, *args, **kwargs):
+        rows = self.get_values_renderer()
+        queryset = self.get_values_queryset()
+        ordering = self.paginator.get_ordering(request, queryset, self)
+        queryset = rows.values(
+            queryset, *[order.lstrip('-') for order in ordering]
+        )
+        page = self.paginate_queryset(queryset)
+        with serializing():
+            data = rows.render_rows(list(queryset) if page is None else page)
+        if page is None:
+            return Response(data)
+
+        return self.get_paginated_response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        rows = self.get_values_renderer()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            rows.values(self.get_values_queryset()),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+        )
+        self.check_object_permissions(request, row)
+        with serializing():
+            data = rows.render_rows([row])[0]
+
+        return Response(data)
+
+
+class BookViewSet(SerializerProfilingMixin,
+                  ReplicaReadMixin,
+                  caching.ConditionalGetMixin,
+                  caching.CachedResponseMixin,
+                  ValuesReadMixin,
+                  RelatedQuerysetMixin,
+                  viewsets.ModelViewSet):
     """View for manage book APIs."""
     serializer_class = serializers.BookDetailSerializer
-    queryset = Book.objects.all()
-    authentication_classes = [TokenAuthentication]
+    queryset = Book.objects.defer('search_vector')
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
+    pagination_class = BookCursorPagination
+    cache_models = [Book, Author, Genre]
+    last_modified_fields = ['updated_at', 'authors__updated_at']
+    filter_backends = [IndexedFilterBackend, BookSearchFilter]
+    filter_fields = {
+        'price': ['exact', 'gte', 'lte'],
+        'authors': ['exact'],
+        'genres': ['exact'],
+        'title': ['exact', 'startswith'],
+    }
 
     def get_queryset(self):
-        return self.queryset.order_by('-id')
+        return super().get_queryset().order_by('-id')
 
     def get_serializer_class(self):
         """Return the serializer class for request."""
@@ -30,36 +173,114 @@ class BookViewSet(viewsets.ModelViewSet):
 
         return self.serializer_class
 
+    @action(methods=['POST'], detail=False, url_path='import',
+            permission_classes=[IsAuthenticated, IsAdminUser])
+    def import_books(self, request):
+        """Import books from a JSON Lines body, one book per line."""
+        result = bulk.import_books(request.stream or [])
+
+        return Response(result)
+
+    @action(methods=['GET'], detail=False, url_path='export',
+            permission_classes=[IsAuthenticated, IsAdminUser])
+    def export_books(self, request):
+        """Stream every book as JSON lines or, with ?output=csv, CSV."""
+        output = request.query_params.get('output', 'ndjson')
+        if output not in bulk.EXPORT_FORMATS:
+            raise drf_serializers.ValidationError(
+                {'output': f'Choose one of {", ".join(bulk.EXPORT_FORMATS)}.'}
+            )
+
+        content_type = {
+            'ndjson': 'application/x-ndjson',
+            'csv': 'text/csv',
+        }[output]
+        return StreamingHttpResponse(bulk.export_books(output),
+                                     content_type=content_type)
 
-class AuthorViewSet(viewsets.ModelViewSet):
+
+class AuthorViewSet(SerializerProfilingMixin,
+                    ReplicaReadMixin,
+                    caching.ConditionalGetMixin,
+                    caching.CachedResponseMixin,
+                    ValuesReadMixin,
+                    RelatedQuerysetMixin,
+                    viewsets.ModelViewSet):
     serializer_class = serializers.AuthorSerializer
     queryset = Author.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
+    pagination_class = NameCursorPagination
+    cache_models = [Author]
+    filter_backends = [IndexedFilterBackend]
+    filter_fields = {
+        'name': ['exact'],
+        'email': ['exact'],
+    }
 
     def get_queryset(self):
-        return self.queryset.order_by('-name')
+        return super().get_queryset().order_by('-name', 'id')
 
     def get_serializer_class(self):
         """Return the serializer class for request."""
         if self.action == 'create':
             return serializers.AuthorCreateSerializer
+        if self.action in ('update', 'partial_update'):
+            return serializers.AuthorUpdateSerializer
 
         return self.serializer_class
 
 
-class GenreViewSet(viewsets.ModelViewSet):
+class GenreViewSet(SerializerProfilingMixin,
+                   ReplicaReadMixin,
+                   caching.ConditionalGetMixin,
+                   caching.CachedResponseMixin,
+                   ValuesReadMixin,
+                   RelatedQuerysetMixin,
+                   viewsets.ModelViewSet):
     serializer_class = serializers.GenreSerializer
     queryset = Genre.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
+    pagination_class = NameCursorPagination
+    cache_models = [Genre]
+    filter_backends = [IndexedFilterBackend]
+    filter_fields = {
+        'name': ['exact'],
+    }
 
     def get_queryset(self):
-        return self.queryset.order_by('-name')
+        return super().get_queryset().order_by('-name', 'id')
 
     def get_serializer_class(self):
         """Return the serializer class for request."""
         if self.action == 'create':
             return serializers.GenreCreateSerializer
 
-        return self.serializer_class
\ No newline at end of file
+        return self.serializer_class
+
+    @action(methods=['GET'], detail=True, url_path='books',
+            pagination_class=BookCursorPagination, filter_backends=[])
+    def books(self, request, pk=None):
+        """List the books in a genre, newest first."""
+        genre = self.get_object()
+        books = self.shape_queryset(
+            Book.objects.defer('search_vector').filter(genres=genre),
+            serializers.BookSerializer,
+        )
+        page = self.paginate_queryset(books)
+        serializer = serializers.BookSerializer(page, many=True)
+        with serializing():
+            data = serializer.data
+
+        return self.get_paginated_response(data)
+
+
+class CacheStatsView(ProfilingMixin, APIView):
+    """Report response cache hits and misses."""
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def get(self, request):
+        return Response(caching.get_stats())
@@ -0,0 +1,177 @@
+"""
+Authentication for the APIs.
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    TokenAuthentication,
+    get_authorization_header,
+)
+
+DEFAULTS = {
+    'ALIAS': None,
+    'MAX_SIZE': 10000,
+    'TTL': 300,
+    'LOCAL_TTL': 5,
+}
+
+
+class LocalTokenCache:
+    """In-process LRU cache of token keys, expiring entries after a TTL.
+
+    Users are copied on the way out so requests never share an instance.
+    Evictions only reach this process, so other workers keep accepting a
+    deleted token or deactivated user until their entry expires; keep
+    the TTL short.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+
+        user, token = value
+        return copy.copy(user), token
+
+    def set(self, key, value):
+        user, token = value
+        value = (copy.copy(user), token)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def aget(self, key):
+        return self.get(key)
+
+    async def aset(self, key, value):
+        self.set(key, value)
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class SharedTokenCache:
+    """Token cache stored in a Django cache shared between workers."""
+
+    def __init__(self, alias, ttl):
+        self.cache = caches[alias]
+        self.ttl = ttl
+
+    def _make_key(self, key):
+        return 'auth-token:' + hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key):
+        return self.cache.get(self._make_key(key))
+
+    def set(self, key, value):
+        self.cache.set(self._make_key(key), value, self.ttl)
+
+    async def aget(self, key):
+        return await self.cache.aget(self._make_key(key))
+
+    async def aset(self, key, value):
+        await self.cache.aset(self._make_key(key), value, self.ttl)
+
+    def delete_many(self, keys):
+        self.cache.delete_many([self._make_key(key) for key in keys])
+
+
+_token_cache = None
+
+
+def get_token_cache():
+    """Return the token cache configured by TOKEN_AUTH_CACHE.
+
+    Without an ALIAS, entries are kept in-process for LOCAL_TTL seconds
+    instead of TTL.
+    """
+    global _token_cache
+    if _token_cache is None:
+        options = {**DEFAULTS, **getattr(settings, 'TOKEN_AUTH_CACHE', {})}
+        if options['ALIAS']:
+            _token_cache = SharedTokenCache(options['ALIAS'], options['TTL'])
+        else:
+            _token_cache = LocalTokenCache(options['MAX_SIZE'],
+                                           options['LOCAL_TTL'])
+
+    return _token_cache
+
+
+@receiver(setting_changed)
+def reset_token_cache(*, setting, **kwargs):
+    global _token_cache
+    if setting == 'TOKEN_AUTH_CACHE':
+        _token_cache = None
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication resolving known tokens without a query."""
+
+    def authenticate_credentials(self, key):
+        token_cache = get_token_cache()
+        credentials = token_cache.get(key)
+        if credentials is None:
+            credentials = super().authenticate_credentials(key)
+            token_cache.set(key, credentials)
+
+        return credentials
+
+    async def aauthenticate(self, request):
+        """Async authenticate() for views served on the event loop."""
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        token_cache = get_token_cache()
+        credentials = await token_cache.aget(key)
+        if credentials is None:
+            model = self.get_model()
+            try:
+                token = await model.objects.select_related('user').aget(
+                    key=key
+                )
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            if not token.user.is_active:
+                raise exceptions.AuthenticationFailed(
+                    _('User inactive or deleted.')
+                )
+            credentials = (token.user, token)
+            await token_cache.aset(key, credentials)
+
+        return credentials
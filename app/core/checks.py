@@ -0,0 +1,27 @@
+"""
+System checks for core.
+"""
+from importlib.util import find_spec
+
+from django.contrib.auth.hashers import get_hasher
+from django.core import checks
+
+
+@checks.register(checks.Tags.security)
+def check_password_hasher_available(app_configs=None, **kwargs):
+    """Check the preferred password hasher's library is installed."""
+    hasher = get_hasher()
+    if hasher.library is None:
+        return []
+    module = hasher.library
+    if isinstance(module, (tuple, list)):
+        module = module[1]
+    if find_spec(module) is not None:
+        return []
+
+    return [checks.Error(
+        f'The {hasher.algorithm} password hasher needs the {module!r} '
+        'package.',
+        hint='Install it or choose another PASSWORD_HASHER.',
+        id='core.E001',
+    )]
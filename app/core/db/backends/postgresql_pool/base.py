@@ -0,0 +1,159 @@
+"""
+PostgreSQL backend that borrows connections from an in-process pool.
+
+Django opens a connection per thread and closes it at the end of each
+request (CONN_MAX_AGE = 0). With this backend closing returns the
+connection to a pool shared by every thread of the process, so requests
+skip the connection handshake and the process never holds more than
+POOL['MAX_SIZE'] connections. This suits ASGI servers, where Django runs
+database work in worker threads, as well as threaded WSGI servers.
+
+Pools are kept per process: a forked worker never reuses the sockets of
+its parent and builds its own pool on first use.
+"""
+import os
+import threading
+
+import psycopg2
+import psycopg2.extras
+from psycopg2 import extensions
+from psycopg2.pool import ThreadedConnectionPool
+from django.db.backends.postgresql import base
+from django.utils.asyncio import async_unsafe
+
+POOL_DEFAULTS = {
+    'MIN_SIZE': 1,
+    'MAX_SIZE': 10,
+    'TIMEOUT': 10,
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """Thread-safe pool that waits up to timeout for a free connection."""
+
+    def __init__(self, conn_params, min_size, max_size, timeout):
+        self.pid = os.getpid()
+        self.timeout = timeout
+        self._pool = ThreadedConnectionPool(min_size, max_size,
+                                            **conn_params)
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def getconn(self, check=False):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise psycopg2.OperationalError(
+                'No database connection available in the pool after '
+                f'{self.timeout} seconds.'
+            )
+        try:
+            connection = self._pool.getconn()
+            if check and not is_usable(connection):
+                self._pool.putconn(connection, close=True)
+                connection = self._pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+
+        return connection
+
+    def putconn(self, connection):
+        try:
+            # The pool rolls back open transactions and drops broken
+            # connections before handing them out again.
+            self._pool.putconn(connection, close=bool(connection.closed))
+        finally:
+            self._slots.release()
+
+    def closeall(self):
+        self._pool.closeall()
+
+
+def is_usable(connection):
+    """Return whether a pooled connection still answers."""
+    if connection.closed:
+        return False
+    status = connection.info.transaction_status
+    if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except psycopg2.Error:
+        return False
+    finally:
+        if status == extensions.TRANSACTION_STATUS_IDLE:
+            connection.rollback()
+
+    return True
+
+
+def get_pool(conn_params, options):
+    """Return this process's pool for conn_params, creating it once."""
+    key = (os.getpid(), repr(sorted(conn_params.items())))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            # Pools built before a fork belong to the parent.
+            for stale in [k for k in _pools if k[0] != key[0]]:
+                del _pools[stale]
+            pool = _pools[key] = ConnectionPool(
+                conn_params,
+                options['MIN_SIZE'],
+                options['MAX_SIZE'],
+                options['TIMEOUT'],
+            )
+
+    return pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL connection wrapper backed by a per-process pool."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+
+    @property
+    def pool_options(self):
+        return {**POOL_DEFAULTS, **self.settings_dict.get('POOL', {})}
+
+    def warm_pool(self):
+        """Open the pool's minimum connections ahead of the first request."""
+        with self.wrap_database_errors:
+            return get_pool(self.get_connection_params(), self.pool_options)
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(conn_params, self.pool_options)
+        connection = self.pool.getconn(
+            check=self.settings_dict['CONN_HEALTH_CHECKS']
+        )
+
+        # Same session setup as the stock backend, which reconnects every
+        # time instead of reusing pooled connections.
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool, self.pool = self.pool, None
+        if pool is None:
+            return super()._close()
+        if pool.pid != os.getpid():
+            # Inherited across a fork; the parent still owns the socket.
+            return
+        with self.wrap_database_errors:
+            pool.putconn(self.connection)
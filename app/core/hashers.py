@@ -0,0 +1,128 @@
+"""
+Password hashing policy.
+
+The first of PASSWORD_HASHERS hashes new passwords, with the cost set in
+PASSWORD_HASHING. Hashes made with another listed algorithm or an older
+cost still verify and are upgraded on the user's next login.
+
+With WORKERS > 0, hashing runs on a bounded thread pool: a concurrency
+cap, so a login storm hashes at most WORKERS passwords at a time however
+many requests are waiting, and the rest queue for a pool thread rather
+than all competing for the CPU. The request thread still waits for its
+hash; the pool does not make hashing non-blocking. hashlib and
+argon2-cffi release the GIL, so the pool hashes in parallel. Database
+work stays in the request thread.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+DEFAULTS = {
+    'WORKERS': 0,
+    'SCRYPT': {
+        'WORK_FACTOR': 2 ** 14,
+        'BLOCK_SIZE': 8,
+        'PARALLELISM': 1,
+    },
+    'ARGON2': {
+        'TIME_COST': 2,
+        'MEMORY_COST': 19456,
+        'PARALLELISM': 1,
+    },
+}
+
+
+def get_options():
+    options = {**DEFAULTS, **getattr(settings, 'PASSWORD_HASHING', {})}
+    for name in ['SCRYPT', 'ARGON2']:
+        options[name] = {**DEFAULTS[name], **options[name]}
+
+    return options
+
+
+class TunedScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """scrypt with the cost from PASSWORD_HASHING['SCRYPT']."""
+
+    @property
+    def work_factor(self):
+        return get_options()['SCRYPT']['WORK_FACTOR']
+
+    @property
+    def block_size(self):
+        return get_options()['SCRYPT']['BLOCK_SIZE']
+
+    @property
+    def parallelism(self):
+        return get_options()['SCRYPT']['PARALLELISM']
+
+
+class TunedArgon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2id with the cost from PASSWORD_HASHING['ARGON2']."""
+
+    @property
+    def time_cost(self):
+        return get_options()['ARGON2']['TIME_COST']
+
+    @property
+    def memory_cost(self):
+        return get_options()['ARGON2']['MEMORY_COST']
+
+    @property
+    def parallelism(self):
+        return get_options()['ARGON2']['PARALLELISM']
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return this process's hashing pool, or None to hash inline."""
+    global _pool, _pool_pid
+    workers = get_options()['WORKERS']
+    if not workers:
+        return None
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ThreadPoolExecutor(max_workers=workers,
+                                       thread_name_prefix='password-hash')
+            _pool_pid = os.getpid()
+
+    return _pool
+
+
+@receiver(setting_changed)
+def reset_pool(*, setting, **kwargs):
+    global _pool
+    if setting == 'PASSWORD_HASHING' and _pool is not None:
+        _pool.shutdown(wait=False)
+        _pool = None
+
+
+def _run(func, *args):
+    """Call func on the pool, waiting for its result, or inline."""
+    pool = get_pool()
+    if pool is None:
+        return func(*args)
+
+    return pool.submit(func, *args).result()
+
+
+def make_password(password):
+    """Hash password with the preferred hasher."""
+    return _run(hashers.make_password, password)
+
+
+def check_password(password, encoded):
+    """Return (is_correct, must_update) for password against encoded."""
+    must_update = []
+    is_correct = _run(hashers.check_password, password, encoded,
+                      must_update.append)
+
+    return is_correct, bool(must_update)
@@ -0,0 +1,61 @@
+"""
+Django command to run a benchmark from the benchmarks package.
+"""
+import json
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+
+import benchmarks
+
+
+class Command(BaseCommand):
+    """Django command to run benchmarks and print their results"""
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true',
+                            help='Print results as JSON')
+        parser.add_argument('--keepdb', action='store_true',
+                            help='Keep the test database, and its seeded '
+                                 'data, for the next run')
+        subparsers = parser.add_subparsers(dest='benchmark', required=True)
+        for name in benchmarks.get_names():
+            module = benchmarks.load(name)
+            subparser = subparsers.add_parser(
+                name, help=(module.__doc__ or '').strip().splitlines()[0]
+            )
+            if hasattr(module, 'add_arguments'):
+                module.add_arguments(subparser)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        module = benchmarks.load(options['benchmark'])
+        with benchmarks.test_database(options['keepdb']):
+            rows = module.run(options)
+        self.write_rows(rows, options)
+        if hasattr(module, 'check'):
+            failures = module.check(rows, options)
+            if failures:
+                raise CommandError('\n'.join(failures))
+
+    def write_rows(self, rows, options):
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        widths = {
+            column: max([len(column)] + [len(str(row.get(column, '')))
+                                         for row in rows])
+            for column in columns
+        }
+        self.stdout.write('  '.join(
+            column.ljust(widths[column]) for column in columns
+        ))
+        for row in rows:
+            self.stdout.write('  '.join(
+                str(row.get(column, '')).ljust(widths[column])
+                for column in columns
+            ))
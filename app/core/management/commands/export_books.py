@@ -0,0 +1,28 @@
+"""
+Django command to export the book catalog.
+"""
+from django.core.management.base import BaseCommand
+
+from book import bulk
+
+
+class Command(BaseCommand):
+    """Django command to stream books as JSON lines or CSV"""
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-format', choices=bulk.EXPORT_FORMATS,
+                            default='ndjson')
+        parser.add_argument('--chunk-size', type=int,
+                            default=bulk.EXPORT_CHUNK_SIZE)
+        parser.add_argument('--file', help='Write to file instead of stdout')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        rows = bulk.export_books(options['output_format'],
+                                 options['chunk_size'])
+        if options['file']:
+            with open(options['file'], 'w', newline='') as f:
+                f.writelines(rows)
+        else:
+            for row in rows:
+                self.stdout.write(row, ending='')
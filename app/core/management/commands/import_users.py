@@ -0,0 +1,68 @@
+"""
+Django command to provision users in bulk.
+"""
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+
+from user import bulk
+
+
+class Command(BaseCommand):
+    """Django command to create users from JSON lines or CSV"""
+
+    def add_arguments(self, parser):
+        parser.add_argument('--input-format', choices=bulk.IMPORT_FORMATS,
+                            default='ndjson')
+        parser.add_argument('--chunk-size', type=int,
+                            default=bulk.IMPORT_CHUNK_SIZE)
+        parser.add_argument('--file', help='Read from file instead of stdin')
+        parser.add_argument('--processes', type=int, default=os.cpu_count(),
+                            help='Processes hashing passwords; 0 hashes on '
+                                 'the password hashing pool')
+        parser.add_argument('--tokens-file',
+                            help='Issue auth tokens, writing email,token '
+                                 'rows to this file')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        executor = None
+        if options['processes']:
+            executor = ProcessPoolExecutor(options['processes'],
+                                           initializer=django.setup)
+        try:
+            if options['file']:
+                with open(options['file'], newline='') as f:
+                    result = self.import_users(f, executor, options)
+            else:
+                result = self.import_users(sys.stdin, executor, options)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        for error in result['errors']:
+            self.stderr.write(f"line {error['line']}: "
+                              f"{json.dumps(error['errors'])}")
+        if options['tokens_file']:
+            with open(options['tokens_file'], 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['email', 'token'])
+                writer.writerows([token['email'], token['token']]
+                                 for token in result['tokens'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['created']} users in {result['seconds']}s "
+            f"({result['users_per_second']} users/s), "
+            f"{len(result['errors'])} errors"
+        ))
+
+    def import_users(self, lines, executor, options):
+        return bulk.import_users(
+            lines, options['input_format'], options['chunk_size'],
+            executor=executor, issue_tokens=bool(options['tokens_file']),
+        )
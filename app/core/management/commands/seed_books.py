@@ -0,0 +1,20 @@
+"""
+Django command to seed books for benchmarks.
+"""
+from django.core.management.base import BaseCommand
+
+from benchmarks.seed import seed_books
+
+
+class Command(BaseCommand):
+    """Django command to add generated books, e.g. 10k, 100k or 1M"""
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int,
+                            help='Total number of books wanted')
+        parser.add_argument('--authors-per-book', type=int, default=2)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        created = seed_books(options['count'], options['authors_per_book'])
+        self.stdout.write(self.style.SUCCESS(f'Created {created} books'))
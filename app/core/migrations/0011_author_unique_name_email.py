@@ -0,0 +1,49 @@
+# Generated by Django 4.1.13 on 2026-10-18 05:40
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicate_authors(apps, schema_editor):
+    """Point books at the oldest of each duplicate author and drop the rest."""
+    Author = apps.get_model('core', 'Author')
+    BookAuthor = apps.get_model('core', 'Book').authors.through
+
+    duplicates = (
+        Author.objects.values('name', 'email')
+        .annotate(keep_id=Min('id'), total=Count('id'))
+        .filter(total__gt=1)
+    )
+    for duplicate in duplicates:
+        keep_id = duplicate['keep_id']
+        drop_ids = list(
+            Author.objects.filter(name=duplicate['name'],
+                                  email=duplicate['email'])
+            .exclude(id=keep_id)
+            .values_list('id', flat=True)
+        )
+        linked = BookAuthor.objects.filter(author_id=keep_id)
+        BookAuthor.objects.filter(
+            author_id__in=drop_ids,
+            book_id__in=linked.values('book_id'),
+        ).delete()
+        BookAuthor.objects.filter(author_id__in=drop_ids).update(
+            author_id=keep_id
+        )
+        Author.objects.filter(id__in=drop_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_genre'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_authors,
+                             migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='author',
+            constraint=models.UniqueConstraint(fields=('name', 'email'), name='unique_author_name_email'),
+        ),
+    ]
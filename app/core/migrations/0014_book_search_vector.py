@@ -0,0 +1,71 @@
+# Generated by Django 4.1.13 on 2026-10-18 05:50
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+SEARCH_INDEX = django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='book_search_vector_idx')
+
+
+def add_search_index(apps, schema_editor):
+    """Create the GIN index, which only exists on PostgreSQL."""
+    if schema_editor.connection.vendor == 'postgresql':
+        Book = apps.get_model('core', 'Book')
+        schema_editor.add_index(Book, SEARCH_INDEX)
+
+
+def remove_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        Book = apps.get_model('core', 'Book')
+        schema_editor.remove_index(Book, SEARCH_INDEX)
+
+
+def fill_search_vectors(apps, schema_editor):
+    # The vector as of this migration; core.search may change later.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    Book = apps.get_model('core', 'Book')
+    alias = schema_editor.connection.alias
+    author_names = (
+        Book.authors.through.objects.using(alias)
+        .filter(book_id=OuterRef('pk'))
+        .values('book_id')
+        .annotate(names=StringAgg('author__name', ' '))
+        .values('names')
+    )
+    Book.objects.using(alias).update(search_vector=(
+        SearchVector('title', weight='A', config='english')
+        + SearchVector('description', weight='B', config='english')
+        + SearchVector(Subquery(author_names), weight='C', config='english')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_name_email_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(add_search_index, remove_search_index),
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='book',
+                    index=SEARCH_INDEX,
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.1.13 on 2026-10-18 05:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_book_price_title_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='genres',
+            field=models.ManyToManyField(blank=True, to='core.genre'),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='book_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
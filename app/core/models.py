@@ -1,27 +1,41 @@
 """
 Database models.
 """
-import re
-
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import (
+    models,
+    transaction,
+)
+from django.db.models import (
+    Count,
+    F,
+    OuterRef,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
     PermissionsMixin,
 )
 
+from core import hashers
+from core.validators import normalize_email
+
 class UserManager(BaseUserManager):
 
     def create_user(self, email, password=None, **kwargs):
         """Create, save and return a new user."""
-
-        p = re.compile('^[a-zA-Z0-9+-_.]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$') # noqa
-
-        if not p.match(email):
+        try:
+            email = normalize_email(email)
+        except ValidationError:
             raise ValueError('Check your email is valid.')
 
-        user = self.model(email=self.normalize_email(email), **kwargs)
+        user = self.model(email=email, **kwargs)
         user.set_password(password)
         user.save(using=self.db)
 
@@ -55,6 +69,26 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     USERNAME_FIELD = 'email'
 
+    def set_password(self, raw_password):
+        self.password = hashers.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """Check raw_password, upgrading an outdated hash.
+
+        Only the hashing is handed to the hashing pool; the upgrade is
+        saved from this thread.
+        """
+        is_correct, must_update = hashers.check_password(raw_password,
+                                                         self.password)
+        if is_correct and must_update:
+            self.set_password(raw_password)
+            # Hash upgrades are not password changes.
+            self._password = None
+            self.save(update_fields=['password'])
+
+        return is_correct
+
 
 class Book(models.Model):
     """Book object."""
@@ -62,23 +96,139 @@ class Book(models.Model):
     description = models.TextField(blank=True)
     price = models.IntegerField(null=False)
     authors = models.ManyToManyField('Author')
+    genres = models.ManyToManyField('Genre', blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='book_search_vector_idx'),
+            models.Index(fields=['price'], name='book_price_idx'),
+            models.Index(fields=['title'], name='book_title_idx',
+                         opclasses=['varchar_pattern_ops']),
+        ]
 
     def __str__(self):
         return self.title
 
 
+class AuthorManager(models.Manager):
+
+    def get_or_create_many(self, authors):
+        """Return authors keyed by (name, email), creating missing ones."""
+        keys = list(dict.fromkeys(
+            (author['name'], author['email']) for author in authors
+        ))
+        found = self._filter_keys(keys)
+        missing = [key for key in keys if key not in found]
+
+        if missing:
+            self.bulk_create(
+                [self.model(name=name, email=email)
+                 for name, email in missing],
+                ignore_conflicts=True,
+            )
+            found.update(self._filter_keys(missing))
+
+        return found
+
+    def _filter_keys(self, keys):
+        """Return existing authors for (name, email) pairs in one query."""
+        if not keys:
+            return {}
+
+        wanted = set(keys)
+        authors = self.filter(
+            name__in={name for name, email in wanted},
+            email__in={email for name, email in wanted},
+        )
+
+        return {
+            (author.name, author.email): author for author in authors
+            if (author.name, author.email) in wanted
+        }
+
+
 class Author(models.Model):
     """Author object."""
     name = models.CharField(max_length=255)
     email = models.EmailField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = AuthorManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['name', 'email'],
+                name='unique_author_name_email',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['-name', 'id'], name='author_name_desc_idx'),
+            models.Index(fields=['email'], name='author_email_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
+class GenreManager(models.Manager):
+
+    def lock(self, genre_ids):
+        """Lock genre rows, in id order, until the transaction ends.
+
+        Changes to a genre's books take this lock first, so they see
+        each other's links and keep book_count exact.
+        """
+        return list(
+            self.select_for_update().filter(pk__in=genre_ids)
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    def add_book_counts(self, deltas):
+        """Add {genre id: change} to book counts, atomically in SQL.
+
+        updated_at moves with the count, so genre ETags change with it.
+        """
+        by_delta = {}
+        for genre_id, delta in deltas.items():
+            if delta:
+                by_delta.setdefault(delta, []).append(genre_id)
+        for delta, genre_ids in by_delta.items():
+            self.filter(pk__in=genre_ids).update(
+                book_count=F('book_count') + delta,
+                updated_at=timezone.now(),
+            )
+
+    @transaction.atomic
+    def refresh_book_counts(self, genre_ids):
+        """Recount books of the given genres, leaving other rows alone."""
+        counts = (
+            Book.genres.through.objects
+            .filter(genre_id=OuterRef('pk'))
+            .values('genre_id')
+            .annotate(total=Count('*'))
+            .values('total')
+        )
+        self.filter(pk__in=self.lock(genre_ids)).update(
+            book_count=Coalesce(Subquery(counts), 0),
+            updated_at=timezone.now(),
+        )
+
+
 class Genre(models.Model):
     """Genre object."""
     name = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
+    book_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = GenreManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-name', 'id'], name='genre_name_desc_idx'),
+        ]
 
     def __str__(self):
         return self.name
\ No newline at end of file
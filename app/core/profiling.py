@@ -0,0 +1,308 @@
+"""
+Request profiling for the API.
+
+ProfilingMiddleware profiles a SAMPLE_RATE fraction of requests. For
+each one it records the SQL query count, time in the database, time
+serializing and total time. Results go into histograms per endpoint
+(URL name) and action, served by ProfileStatsView. Views using
+ProfilingMixin report their action, and generic views using
+SerializerProfilingMixin also their serialization time; other views
+are recorded by HTTP method.
+
+With HEADERS on, a request sending an X-Profile header is always
+profiled, and profiled responses carry X-Query-Count and Server-Timing
+headers.
+
+Queries are counted by an execute wrapper installed on every database
+connection. It costs one context variable lookup per query while a
+request is not being profiled. Histograms are kept per process.
+"""
+import asyncio
+import functools
+import random
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+DEFAULTS = {
+    'SAMPLE_RATE': 0.0,
+    'HEADERS': False,
+}
+REQUEST_HEADER = 'HTTP_X_PROFILE'
+MS_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+METRICS = {
+    'queries': QUERY_BUCKETS,
+    'db_ms': MS_BUCKETS,
+    'serialize_ms': MS_BUCKETS,
+    'total_ms': MS_BUCKETS,
+}
+
+_profile = ContextVar('profile', default=None)
+
+
+def get_options():
+    return {**DEFAULTS, **getattr(settings, 'PROFILING', {})}
+
+
+class Profile:
+    """Measurements of one request."""
+    __slots__ = ('action', 'queries', 'db_time', 'serialize_time')
+
+    def __init__(self):
+        self.action = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+
+
+def _record_query(execute, sql, params, many, context):
+    profile = _profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries += 1
+        profile.db_time += perf_counter() - start
+
+
+@receiver(connection_created)
+def install_query_recorder(*, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+class Histogram:
+    """Counts of values in fixed buckets, with their sum and maximum."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, fraction):
+        """Return the upper bound of the bucket holding the percentile."""
+        rank = fraction * sum(self.counts)
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+
+        return self.max
+
+    def as_dict(self, count):
+        labels = [str(bound) for bound in self.bounds] + ['+Inf']
+        return {
+            'mean': round(self.total / count, 3),
+            'max': round(self.max, 3),
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+            'buckets': dict(zip(labels, self.counts)),
+        }
+
+
+class ProfileStats:
+    """Histograms of profiled requests by endpoint and action."""
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, action, values):
+        with self._lock:
+            actions = self._endpoints.setdefault(endpoint, {})
+            if action not in actions:
+                actions[action] = {
+                    'count': 0,
+                    **{name: Histogram(bounds)
+                       for name, bounds in METRICS.items()},
+                }
+            stats = actions[action]
+            stats['count'] += 1
+            for name, value in values.items():
+                stats[name].add(value)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                endpoint: {
+                    action: {
+                        'count': stats['count'],
+                        **{name: stats[name].as_dict(stats['count'])
+                           for name in METRICS},
+                    }
+                    for action, stats in actions.items()
+                }
+                for endpoint, actions in self._endpoints.items()
+            }
+
+    def clear(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+_stats = None
+
+
+def get_stats():
+    """Return this process's ProfileStats."""
+    global _stats
+    if _stats is None:
+        _stats = ProfileStats()
+
+    return _stats
+
+
+@receiver(setting_changed)
+def reset_stats(*, setting, **kwargs):
+    global _stats
+    if setting == 'PROFILING':
+        _stats = None
+
+
+@contextmanager
+def serializing():
+    """Count the time spent in the block as serialization time."""
+    profile = _profile.get()
+    if profile is None:
+        yield
+        return
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        profile.serialize_time += perf_counter() - start
+
+
+def _serializing(to_representation):
+    @functools.wraps(to_representation)
+    def wrapper(instance):
+        with serializing():
+            return to_representation(instance)
+
+    return wrapper
+
+
+def report_action(action):
+    """Record the view action handling the request being profiled."""
+    profile = _profile.get()
+    if profile is not None:
+        profile.action = action
+
+
+class ProfilingMixin:
+    """Report the view's action to the profiler."""
+
+    def initial(self, request, *args, **kwargs):
+        report_action(getattr(self, 'action', None))
+        super().initial(request, *args, **kwargs)
+
+
+class SerializerProfilingMixin(ProfilingMixin):
+    """Also report serialization time, for views with get_serializer().
+
+    Plain APIViews must use ProfilingMixin: schema generators call
+    get_serializer() on any view that has it.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if _profile.get() is not None:
+            # Time the serializer rendering each object, not the list,
+            # whose iteration may run the query. Only this instance is
+            # wrapped; its class is left alone.
+            target = getattr(serializer, 'child', serializer)
+            target.to_representation = _serializing(target.to_representation)
+
+        return serializer
+
+
+class ProfilingMiddleware:
+    """Profile a sample of requests; see the module docstring."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Run as a coroutine, like Django's MiddlewareMixin.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        else:
+            self._is_coroutine = None
+
+    def _should_profile(self, request):
+        options = get_options()
+        if options['HEADERS'] and REQUEST_HEADER in request.META:
+            return True
+
+        return random.random() < options['SAMPLE_RATE']
+
+    def __call__(self, request):
+        if self._is_coroutine:
+            return self.__acall__(request)
+        if not self._should_profile(request):
+            return self.get_response(request)
+
+        start = perf_counter()
+        profile = Profile()
+        token = _profile.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            _profile.reset(token)
+
+        return self._finish(request, response, profile, start)
+
+    async def __acall__(self, request):
+        if not self._should_profile(request):
+            return await self.get_response(request)
+
+        start = perf_counter()
+        profile = Profile()
+        token = _profile.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _profile.reset(token)
+
+        return self._finish(request, response, profile, start)
+
+    def _finish(self, request, response, profile, start):
+        values = {
+            'queries': profile.queries,
+            'db_ms': profile.db_time * 1000,
+            'serialize_ms': profile.serialize_time * 1000,
+            'total_ms': (perf_counter() - start) * 1000,
+        }
+        match = request.resolver_match
+        endpoint = match.view_name if match else 'unresolved'
+        action = profile.action or request.method.lower()
+        get_stats().add(endpoint, action, values)
+
+        if get_options()['HEADERS']:
+            response['X-Query-Count'] = str(profile.queries)
+            response['Server-Timing'] = ', '.join(
+                f'{name[:-3]};dur={values[name]:.2f}'
+                for name in ['db_ms', 'serialize_ms', 'total_ms']
+            )
+
+        return response
@@ -0,0 +1,50 @@
+"""
+JSON rendering with orjson.
+
+FastJSONRenderer renders the same bytes as DRF's JSONRenderer: dates,
+times and decimals still go through DRF's encoder, and U+2028/U+2029
+are escaped. Without orjson installed, or for output orjson cannot
+produce (indented or ASCII-only JSON, integers over 64 bits), it
+renders with the json module like JSONRenderer. Floats still differ in
+exponent notation (1e16 rather than 1e+16), and NaN renders as null
+rather than failing with STRICT_JSON.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+               | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer rendering with orjson when it is installed."""
+
+    def __init__(self):
+        self.default = self.encoder_class().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii
+                or not self.compact
+                or self.get_indent(accepted_media_type,
+                                   renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            # Let the json module render it or raise its own error.
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+
+        # As JSONRenderer, keep the output a strict javascript subset.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028')
+            ret = ret.replace(b'\xe2\x80\xa9', b'\\u2029')
+
+        return ret
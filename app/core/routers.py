@@ -0,0 +1,167 @@
+"""
+Read replica routing.
+
+Reads go to a replica only inside replica_reads(), which API views enter
+for safe requests (see ReplicaReadMixin). Everything else, including
+writes, migrations, management commands and authentication, uses the
+primary.
+
+Replicas lag behind the primary, so reads are pinned to the primary for
+PIN_SECONDS after a write: for the client that wrote (read-your-writes)
+and for every reader of the models that changed, so cached responses
+and ETags are never built from rows a replica has not caught up with.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import permissions
+
+DEFAULTS = {
+    'ALIASES': [],
+    'PIN_SECONDS': 5,
+    'CACHE_ALIAS': 'default',
+}
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def get_options():
+    return {**DEFAULTS, **getattr(settings, 'READ_REPLICAS', {})}
+
+
+def get_replicas():
+    return get_options()['ALIASES']
+
+
+def reading_from_replica():
+    """Return whether reads in this context may go to a replica."""
+    return _replica_reads.get() and bool(get_replicas())
+
+
+@contextmanager
+def replica_reads():
+    """Send reads made inside the block to a replica."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def _pin_key(key):
+    return f'replica:pin:{key}'
+
+
+def client_key(request):
+    """Return the key pinning request's client."""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+
+    return 'ip:' + request.META.get('REMOTE_ADDR', '')
+
+
+def model_key(model):
+    return 'model:' + model._meta.label_lower
+
+
+def pin_to_primary(*keys):
+    """Keep reads for keys on the primary for PIN_SECONDS."""
+    options = get_options()
+    if not options['ALIASES']:
+        return
+    caches[options['CACHE_ALIAS']].set_many(
+        {_pin_key(key): True for key in keys}, options['PIN_SECONDS']
+    )
+
+
+def is_pinned(*keys):
+    options = get_options()
+    pinned = caches[options['CACHE_ALIAS']].get_many(
+        [_pin_key(key) for key in keys]
+    )
+
+    return bool(pinned)
+
+
+def use_replica(request, models):
+    """Return whether a request reading models may read from a replica.
+
+    Only safe requests may, while neither their client nor any of the
+    models is pinned to the primary.
+    """
+    if request.method not in permissions.SAFE_METHODS or not get_replicas():
+        return False
+    keys = [client_key(request)] + [model_key(model) for model in models]
+
+    return not is_pinned(*keys)
+
+
+class PrimaryReplicaRouter:
+    """Route reads inside replica_reads() to a random replica."""
+
+    def db_for_read(self, model, **hints):
+        if reading_from_replica():
+            return random.choice(get_replicas())
+
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Explicit, or Django would write back to where an object was read.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas copy the primary's schema.
+        if db in get_replicas():
+            return False
+
+        return None
+
+
+class ReplicaReadMixin:
+    """Serve authenticated safe requests from a read replica.
+
+    The view reads from the primary while its client, or a model in
+    replica_models (default: cache_models and the queryset's model), is
+    pinned. Successful unsafe requests pin the client.
+    """
+    replica_models = None
+
+    def get_replica_models(self):
+        if self.replica_models is not None:
+            return self.replica_models
+        models = list(getattr(self, 'cache_models', []))
+        queryset = getattr(self, 'queryset', None)
+        if queryset is not None:
+            models.append(queryset.model)
+
+        return models
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._replica_token = None
+        if use_replica(request, self.get_replica_models()):
+            self._replica_token = _replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _replica_reads.reset(token)
+            self._replica_token = None
+        if (request.method not in permissions.SAFE_METHODS
+                and response.status_code < 400):
+            pin_to_primary(client_key(request))
+
+        return super().finalize_response(request, response, *args,
+                                         **kwargs)
@@ -0,0 +1,20 @@
+"""
+Test runner.
+
+Tests tagged 'slow', such as query plans over large tables, are left
+out of the default run. Run them with `python manage.py test --tag slow`.
+"""
+from django.test.runner import DiscoverRunner
+
+SLOW_TAG = 'slow'
+
+
+class TestRunner(DiscoverRunner):
+    """Exclude slow tests unless they are asked for with --tag."""
+
+    def __init__(self, *args, tags=None, exclude_tags=None, **kwargs):
+        if SLOW_TAG not in (tags or []):
+            exclude_tags = [*(exclude_tags or []), SLOW_TAG]
+
+        super().__init__(*args, tags=tags, exclude_tags=exclude_tags,
+                         **kwargs)
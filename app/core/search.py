@@ -0,0 +1,76 @@
+"""
+Full-text search over books.
+
+Search vectors are stored on Book and indexed with GIN on PostgreSQL.
+Other databases fall back to unranked substring matching.
+
+Signals refresh the vector when a book, its authors or an author is
+saved. Writes that skip signals, such as bulk_create() and
+QuerySet.update() of titles, descriptions or author names, must call
+update_search_vectors() on the books they touch, as book.bulk does.
+"""
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db import connections
+from django.db.models import (
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = 'english'
+
+
+def is_supported(queryset):
+    """Return whether the queryset's database supports full-text search."""
+    return connections[queryset.db].vendor == 'postgresql'
+
+
+def _book_search_vector(model):
+    author_names = (
+        model.authors.through.objects
+        .filter(book_id=OuterRef('pk'))
+        .values('book_id')
+        .annotate(names=StringAgg('author__name', ' '))
+        .values('names')
+    )
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+        + SearchVector(Subquery(author_names), weight='C',
+                       config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(books):
+    """Recompute the stored search vector of a queryset of books."""
+    if is_supported(books):
+        books.update(search_vector=_book_search_vector(books.model))
+
+
+def search_books(queryset, terms):
+    """Filter books matching terms and annotate them with a rank."""
+    if is_supported(queryset):
+        query = SearchQuery(terms, search_type='websearch',
+                            config=SEARCH_CONFIG)
+        # Rank as double precision so cursor positions round-trip exactly.
+        return queryset.filter(search_vector=query).annotate(
+            rank=Cast(SearchRank(F('search_vector'), query), FloatField())
+        )
+
+    matches = queryset.model.objects.filter(
+        Q(title__icontains=terms)
+        | Q(description__icontains=terms)
+        | Q(authors__name__icontains=terms)
+    )
+    return queryset.filter(id__in=matches.values('id')).annotate(
+        rank=Value(0.0, output_field=FloatField())
+    )
@@ -0,0 +1,155 @@
+"""
+Signal handlers for core models.
+"""
+from django.conf import settings
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from core.authentication import get_token_cache
+from core.models import (
+    Book,
+    Author,
+    Genre,
+)
+from core.search import update_search_vectors
+
+
+@receiver(post_delete, sender=Token)
+def evict_deleted_token(sender, instance, **kwargs):
+    """Stop accepting a token as soon as it is deleted."""
+    get_token_cache().delete_many([instance.key])
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def evict_user_tokens(sender, instance, **kwargs):
+    """Drop cached credentials so changes like deactivation apply now."""
+    keys = Token.objects.filter(user=instance).values_list('key', flat=True)
+    get_token_cache().delete_many(list(keys))
+
+
+@receiver(post_save, sender=Book)
+def refresh_book_search_vector(sender, instance, **kwargs):
+    update_search_vectors(Book.objects.filter(pk=instance.pk))
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+def refresh_books_on_authors_change(sender, instance, action, reverse,
+                                    pk_set, **kwargs):
+    """Mark books modified and re-index them when their authors change."""
+    if action == 'pre_clear' and reverse:
+        instance._cleared_book_ids = list(
+            instance.book_set.values_list('pk', flat=True)
+        )
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        book_ids = [instance.pk]
+    elif action == 'post_clear':
+        book_ids = instance._cleared_book_ids
+    else:
+        book_ids = pk_set
+    books = Book.objects.filter(pk__in=book_ids)
+    books.update(updated_at=timezone.now())
+    update_search_vectors(books)
+
+
+@receiver(post_save, sender=Author)
+def refresh_books_on_author_change(sender, instance, created, **kwargs):
+    if not created:
+        update_search_vectors(Book.objects.filter(authors=instance))
+
+
+@receiver(pre_delete, sender=Author)
+def touch_books_on_author_delete(sender, instance, **kwargs):
+    """Mark books modified when one of their authors is deleted."""
+    books = Book.objects.filter(authors=instance)
+    instance._deleted_book_ids = list(books.values_list('pk', flat=True))
+    books.update(updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=Author)
+def refresh_books_on_author_delete(sender, instance, **kwargs):
+    book_ids = getattr(instance, '_deleted_book_ids', [])
+    update_search_vectors(Book.objects.filter(pk__in=book_ids))
+
+
+def _lock_genre_links(instance, reverse, pk_set=None):
+    """Lock the genres of a links change and return their current links.
+
+    Links are (book id, genre id) pairs of instance, limited to pk_set
+    when given. They are read again once the genres are locked, so they
+    include links committed by changes that held the locks before.
+    """
+    links = Book.genres.through.objects.filter(
+        **{'genre_id' if reverse else 'book_id': instance.pk}
+    )
+    if pk_set is not None:
+        links = links.filter(
+            **{'book_id__in' if reverse else 'genre_id__in': pk_set}
+        )
+    if reverse:
+        Genre.objects.lock([instance.pk])
+    else:
+        Genre.objects.lock(
+            pk_set if pk_set is not None
+            else list(links.values_list('genre_id', flat=True))
+        )
+
+    return set(links.values_list('book_id', 'genre_id'))
+
+
+@receiver(m2m_changed, sender=Book.genres.through)
+def count_genre_books(sender, instance, action, reverse, pk_set, **kwargs):
+    """Count links added or removed on genres; mark their books modified."""
+    if action in ('pre_add', 'pre_remove', 'pre_clear'):
+        instance._genre_links = _lock_genre_links(instance, reverse, pk_set)
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if action == 'post_add':
+        # Links that already existed are skipped by the insert.
+        changed = {
+            (pk, instance.pk) if reverse else (instance.pk, pk)
+            for pk in pk_set
+        } - instance._genre_links
+        delta = 1
+    else:
+        changed = instance._genre_links
+        delta = -1
+    deltas = {}
+    for book_id, genre_id in changed:
+        deltas[genre_id] = deltas.get(genre_id, 0) + delta
+    Genre.objects.add_book_counts(deltas)
+    Book.objects.filter(
+        pk__in={book_id for book_id, genre_id in changed}
+    ).update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=Genre)
+def touch_books_on_genre_delete(sender, instance, **kwargs):
+    """Mark books modified when one of their genres is deleted."""
+    # The cascade deletes the through rows without sending m2m_changed.
+    Book.objects.filter(genres=instance).update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=Book)
+def remember_book_genres(sender, instance, **kwargs):
+    instance._genre_links = _lock_genre_links(instance, reverse=False)
+
+
+@receiver(post_delete, sender=Book)
+def count_genre_books_on_delete(sender, instance, **kwargs):
+    Genre.objects.add_book_counts({
+        genre_id: -1
+        for book_id, genre_id in getattr(instance, '_genre_links', ())
+    })
@@ -0,0 +1,149 @@
+"""
+Query budgets for tests.
+
+A query budget is the number of queries a block of test code may run,
+recorded per database vendor in query_budgets.json next to the test
+module. A test that runs more queries than its budget fails with the
+queries it ran, so a change adding queries per row (N+1) or per request
+is caught in CI. A block without a recorded budget for the database in
+use fails too, so every budgeted block is enforced on every database
+the tests run on.
+
+QueryBudgetMixin budgets every request its test client makes, per test
+and endpoint. assertQueryBudget() budgets any other block.
+
+Run the tests with QUERY_BUDGET_RECORD=1 to record budgets for new
+tests or to accept a change in query counts, on SQLite (DB_ENGINE=sqlite)
+and on PostgreSQL; review the diff of the JSON files like any other
+change. Record with a single test process.
+"""
+import json
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.core.cache import caches
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connections,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import (
+    Resolver404,
+    resolve,
+)
+from rest_framework.test import APIClient
+
+RECORD_ENV = 'QUERY_BUDGET_RECORD'
+BUDGETS_FILE = 'query_budgets.json'
+
+
+def is_recording():
+    return os.environ.get(RECORD_ENV, '').lower() in ('1', 'true')
+
+
+class BudgetFile:
+    """Budgets of one directory, as {vendor: {test id: {name: queries}}}."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.budgets = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                self.budgets = json.load(f)
+
+    def check(self, vendor, test, name, queries):
+        """Fail if queries exceed the budget, or record it if recording."""
+        tests = self.budgets.setdefault(vendor, {})
+        budget = tests.get(test, {}).get(name)
+        if is_recording():
+            if budget is None or len(queries) > budget:
+                tests.setdefault(test, {})[name] = len(queries)
+                self.save()
+            return
+
+        if budget is None:
+            raise AssertionError(
+                f'No {vendor} query budget for {name!r} in {test}; run the '
+                f'tests with {RECORD_ENV}=1 to record one.'
+            )
+        if len(queries) > budget:
+            sql = '\n'.join(
+                f'{i}. {query["sql"]}'
+                for i, query in enumerate(queries.captured_queries, start=1)
+            )
+            raise AssertionError(
+                f'{name!r} ran {len(queries)} queries, over its budget of '
+                f'{budget} in {self.path.name}:\n{sql}'
+            )
+
+    def save(self):
+        with open(self.path, 'w') as f:
+            json.dump(self.budgets, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+
+_files = {}
+
+
+def get_budget_file(path):
+    path = str(path)
+    if path not in _files:
+        _files[path] = BudgetFile(path)
+
+    return _files[path]
+
+
+@contextmanager
+def query_budget(budget_file, test, name, using=DEFAULT_DB_ALIAS):
+    """Check the queries run in the block against test's budget for name."""
+    connection = connections[using]
+    with CaptureQueriesContext(connection) as queries:
+        yield queries
+    budget_file.check(connection.vendor, test, name, queries)
+
+
+def endpoint_name(method, path):
+    """Return e.g. 'GET book:book-list' for a request."""
+    try:
+        view_name = resolve(path).view_name
+    except Resolver404:
+        view_name = path
+
+    return f'{method} {view_name}'
+
+
+class QueryBudgetClient(APIClient):
+    """APIClient checking each request against the test's budgets."""
+
+    def __init__(self, test, **defaults):
+        super().__init__(**defaults)
+        self.test = test
+
+    def request(self, **kwargs):
+        name = endpoint_name(kwargs['REQUEST_METHOD'], kwargs['PATH_INFO'])
+        with self.test.assertQueryBudget(name):
+            return super().request(**kwargs)
+
+
+class QueryBudgetMixin:
+    """Budget the queries of every request made with self.client.
+
+    Caches are cleared first, so a response cached by an earlier test
+    does not hide queries.
+    """
+
+    def setUp(self):
+        super().setUp()
+        for cache in caches.all():
+            cache.clear()
+        self.client = QueryBudgetClient(self)
+
+    def assertQueryBudget(self, name, using=DEFAULT_DB_ALIAS):
+        module = sys.modules[type(self).__module__]
+        budget_file = get_budget_file(
+            Path(module.__file__).with_name(BUDGETS_FILE)
+        )
+
+        return query_budget(budget_file, self.id(), name, using)
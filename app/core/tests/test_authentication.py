@@ -0,0 +1,104 @@
+"""
+Tests for cached token authentication.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+
+from core.authentication import (
+    CachedTokenAuthentication,
+    LocalTokenCache,
+    get_token_cache,
+)
+
+
+@override_settings(TOKEN_AUTH_CACHE={'ALIAS': None})
+class CachedTokenAuthenticationTests(TestCase):
+    """Test token authentication with the in-process cache."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='password123',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+
+    def test_authenticate_cached_token_without_queries(self):
+        """Test a known token is resolved without querying."""
+        self.auth.authenticate_credentials(self.token.key)
+
+        with self.assertNumQueries(0):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(token, self.token)
+
+    def test_cached_user_is_not_shared(self):
+        """Test each authentication gets its own user instance."""
+        first, _ = self.auth.authenticate_credentials(self.token.key)
+        second, _ = self.auth.authenticate_credentials(self.token.key)
+
+        self.assertIsNot(first, second)
+
+    def test_deleted_token_rejected(self):
+        """Test a deleted token stops authenticating."""
+        key = self.token.key
+        self.auth.authenticate_credentials(key)
+        self.token.delete()
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.auth.authenticate_credentials(key)
+
+    def test_deactivated_user_rejected(self):
+        """Test a deactivated user stops authenticating."""
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+
+@override_settings(TOKEN_AUTH_CACHE={'ALIAS': 'default', 'TTL': 60})
+class SharedCachedTokenAuthenticationTests(CachedTokenAuthenticationTests):
+    """Test token authentication with a shared Django cache."""
+
+
+class LocalTokenCacheTests(TestCase):
+    """Test the in-process token cache."""
+
+    @override_settings(TOKEN_AUTH_CACHE={'ALIAS': None, 'TTL': 300})
+    def test_local_entries_short_lived(self):
+        """Test in-process entries use LOCAL_TTL, not the shared TTL."""
+        token_cache = get_token_cache()
+
+        self.assertIsInstance(token_cache, LocalTokenCache)
+        self.assertEqual(token_cache.ttl, 5)
+
+    def test_least_recently_used_evicted(self):
+        """Test the cache never holds more than max_size entries."""
+        cache = LocalTokenCache(max_size=2, ttl=60)
+        cache.set('a', ('user-a', 'token-a'))
+        cache.set('b', ('user-b', 'token-b'))
+        cache.get('a')
+        cache.set('c', ('user-c', 'token-c'))
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+
+    @patch('core.authentication.time.monotonic')
+    def test_entries_expire(self, patched_monotonic):
+        """Test entries are dropped after the TTL."""
+        cache = LocalTokenCache(max_size=2, ttl=60)
+        patched_monotonic.return_value = 100
+        cache.set('a', ('user-a', 'token-a'))
+
+        patched_monotonic.return_value = 159
+        self.assertIsNotNone(cache.get('a'))
+        patched_monotonic.return_value = 161
+        self.assertIsNone(cache.get('a'))
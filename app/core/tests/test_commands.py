@@ -1,11 +1,22 @@
 """
 Test custom Django management commands.
 """
+import json
+import os
+import tempfile
+from io import StringIO
 from unittest.mock import patch
 from psycopg2 import OperationalError as Psycopg2Error
-from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.core.management import (
+    CommandError,
+    call_command,
+)
 from django.db.utils import OperationalError
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Book
 
 
 @patch('core.management.commands.wait_for_db.Command.check')
@@ -27,4 +38,191 @@ class CommandTests(TestCase):
         call_command('wait_for_db')
 
         self.assertEqual(patched_check.call_count, 6)
-        patched_check.assert_called_with(databases=['default'])
\ No newline at end of file
+        patched_check.assert_called_with(databases=['default'])
+
+
+class ExportBooksCommandTests(TestCase):
+    """Test export_books command"""
+
+    def test_export_books(self):
+        """Test exporting books writes one JSON line per book"""
+        book = Book.objects.create(title='The Capital', price=3000)
+        book.authors.create(name='name1', email='test1@example.com')
+        out = StringIO()
+
+        call_command('export_books', stdout=out)
+
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['title'], book.title)
+        self.assertEqual(rows[0]['authors'][0]['email'], 'test1@example.com')
+
+    def test_export_books_csv(self):
+        """Test exporting books as CSV"""
+        Book.objects.create(title='The Capital', price=3000)
+        out = StringIO()
+
+        call_command('export_books', '--output-format', 'csv', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].endswith(',The Capital,3000,,,'))
+
+
+@override_settings(PASSWORD_HASHING={'SCRYPT': {'WORK_FACTOR': 2 ** 10}})
+class BenchmarkCommandTests(TestCase):
+    """Test benchmark command"""
+
+    def setUp(self):
+        # Tests already run in a test database.
+        patcher = patch('benchmarks.test_database')
+        self.test_database = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_benchmark_runs_in_test_database(self):
+        """Test benchmarks run in a throwaway test database"""
+        call_command('benchmark', '--keepdb', 'login', '--duration', '0.01',
+                     '--workers', '1', stdout=StringIO())
+
+        self.test_database.assert_called_once_with(True)
+
+    def test_benchmark_login(self):
+        """Test the login benchmark reports a rate per hasher"""
+        out = StringIO()
+
+        call_command('benchmark', '--json', 'login', '--duration', '0.01',
+                     '--workers', '2', stdout=out)
+
+        rows = json.loads(out.getvalue())
+        self.assertIn('scrypt', [row['hasher'] for row in rows])
+        self.assertTrue(all(row['logins/s/core'] > 0 for row in rows))
+
+    def test_benchmark_api(self):
+        """Test the API benchmark reports every scenario and cleans up"""
+        out = StringIO()
+
+        call_command('benchmark', '--json', 'api', '--books', '5',
+                     '--requests', '2', '--transport', 'client',
+                     '--thresholds', '', stdout=out)
+
+        rows = json.loads(out.getvalue())
+        self.assertEqual(
+            [row['scenario'] for row in rows],
+            ['book_list', 'book_retrieve', 'book_create', 'book_update',
+             'token_login'],
+        )
+        self.assertTrue(all(row['errors'] == 0 for row in rows))
+        self.assertTrue(all(row['queries'] > 0 for row in rows))
+        self.assertEqual(Book.objects.count(), 5)
+        self.assertFalse(get_user_model().objects.exists())
+
+    def test_benchmark_api_updates_seeded_books(self):
+        """Test updates fall back to seeded books when no create succeeds"""
+        def failing_create(count, token, password):
+            for i in range(count):
+                yield 'POST', reverse('book:book-list'), {}, token
+
+        out = StringIO()
+        with patch.dict('benchmarks.bench_api.SCENARIOS',
+                        {'book_create': failing_create}):
+            call_command('benchmark', '--json', 'api', '--books', '2',
+                         '--requests', '2', '--transport', 'client',
+                         '--thresholds', '', stdout=out)
+
+        rows = {row['scenario']: row for row in json.loads(out.getvalue())}
+        self.assertEqual(rows['book_create']['errors'], 2)
+        self.assertEqual(rows['book_update']['errors'], 0)
+
+    def test_benchmark_api_fails_over_threshold(self):
+        """Test the API benchmark fails when a threshold is exceeded"""
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as f:
+            json.dump({'book_list': {'queries': 0}}, f)
+            f.flush()
+
+            with self.assertRaisesMessage(CommandError,
+                                          'book_list (client): queries'):
+                call_command('benchmark', 'api', '--books', '1',
+                             '--requests', '1', '--transport', 'client',
+                             '--thresholds', f.name, stdout=StringIO())
+
+    def test_benchmark_user_create(self):
+        """Test the user creation benchmark rolls back its users"""
+        out = StringIO()
+
+        call_command('benchmark', '--json', 'user_create', '--duration',
+                     '0.01', '--count', '5', stdout=out)
+
+        rows = json.loads(out.getvalue())
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(all(row['ops/s'] > 0 for row in rows))
+        self.assertFalse(get_user_model().objects.exists())
+
+    def test_benchmark_serializers(self):
+        """Test the serializer benchmark reports both rendering paths"""
+        out = StringIO()
+
+        call_command('benchmark', '--json', 'serializers', '--books', '3',
+                     '--page', '2', '--duration', '0.01', stdout=out)
+
+        rows = json.loads(out.getvalue())
+        self.assertEqual([row['path'] for row in rows],
+                         ['serializer', 'values'] * 2)
+        self.assertTrue(all(row['rows/s'] > 0 for row in rows))
+
+    def test_benchmark_json(self):
+        """Test the JSON benchmark reports both libraries"""
+        out = StringIO()
+
+        call_command('benchmark', '--json', 'json', '--books', '3',
+                     '--page', '2', '--duration', '0.01', stdout=out)
+
+        rows = json.loads(out.getvalue())
+        self.assertEqual([(row['step'], row['library']) for row in rows],
+                         [('render', 'json'), ('render', 'orjson'),
+                          ('parse', 'json'), ('parse', 'orjson')])
+        self.assertTrue(all(row['pages/s'] > 0 for row in rows))
+
+
+class ImportUsersCommandTests(TestCase):
+    """Test import_users command"""
+
+    def test_import_users(self):
+        """Test users are created on a process pool with tokens"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'users.csv')
+            tokens_path = os.path.join(tmp, 'tokens.csv')
+            with open(path, 'w') as f:
+                f.write('email,password,name\n'
+                        'user1@example.com,testpass1,One\n'
+                        'user2@example.com,testpass2,Two\n'
+                        'bad,testpass3,Bad\n')
+            out = StringIO()
+            err = StringIO()
+
+            call_command('import_users', '--input-format', 'csv',
+                         '--file', path, '--processes', '2',
+                         '--tokens-file', tokens_path,
+                         stdout=out, stderr=err)
+
+            with open(tokens_path) as f:
+                tokens = f.read().splitlines()
+
+        self.assertIn('Created 2 users', out.getvalue())
+        self.assertIn('line 4:', err.getvalue())
+        self.assertEqual(tokens[0], 'email,token')
+        self.assertEqual(len(tokens), 3)
+        user = get_user_model().objects.get(email='user2@example.com')
+        self.assertTrue(user.check_password('testpass2'))
+
+
+class SeedBooksCommandTests(TestCase):
+    """Test seed_books command"""
+
+    def test_seed_books(self):
+        """Test books are added up to the wanted total"""
+        call_command('seed_books', '12', stdout=StringIO())
+        call_command('seed_books', '15', stdout=StringIO())
+
+        self.assertEqual(Book.objects.count(), 15)
+        self.assertEqual(Book.authors.through.objects.count(), 30)
+        self.assertEqual(Book.genres.through.objects.count(), 15)
@@ -0,0 +1,132 @@
+"""
+Tests for the pooled PostgreSQL backend.
+"""
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+from django.test import SimpleTestCase
+
+from app import gunicorn_conf
+from core.db.backends.postgresql_pool import base
+
+CONN_PARAMS = {'database': 'devdb', 'host': 'db'}
+
+
+@patch('core.db.backends.postgresql_pool.base.ThreadedConnectionPool')
+class ConnectionPoolTests(SimpleTestCase):
+    """Test the per-process connection pool."""
+
+    def setUp(self):
+        base._pools.clear()
+        self.addCleanup(base._pools.clear)
+
+    def test_pool_shared_per_process(self, patched_pool):
+        """Test the same parameters share one pool."""
+        first = base.get_pool(CONN_PARAMS, base.POOL_DEFAULTS)
+        second = base.get_pool(dict(CONN_PARAMS), base.POOL_DEFAULTS)
+        other = base.get_pool({**CONN_PARAMS, 'database': 'postgres'},
+                              base.POOL_DEFAULTS)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        patched_pool.assert_any_call(1, 10, **CONN_PARAMS)
+
+    @patch('core.db.backends.postgresql_pool.base.os.getpid')
+    def test_forked_process_builds_own_pool(self, patched_getpid,
+                                            patched_pool):
+        """Test a child process never reuses its parent's pool."""
+        patched_getpid.return_value = 100
+        parent = base.get_pool(CONN_PARAMS, base.POOL_DEFAULTS)
+        patched_getpid.return_value = 101
+        child = base.get_pool(CONN_PARAMS, base.POOL_DEFAULTS)
+
+        self.assertIsNot(parent, child)
+        self.assertEqual(len(base._pools), 1)
+
+    def test_exhausted_pool_times_out(self, patched_pool):
+        """Test borrowing past MAX_SIZE fails after the timeout."""
+        pool = base.ConnectionPool(CONN_PARAMS, 1, 1, timeout=0.01)
+        pool.getconn()
+
+        with self.assertRaises(psycopg2.OperationalError):
+            pool.getconn()
+
+    def test_returned_connection_frees_slot(self, patched_pool):
+        """Test returning a connection lets the next borrower in."""
+        pool = base.ConnectionPool(CONN_PARAMS, 1, 1, timeout=0.01)
+        connection = pool.getconn()
+        connection.closed = 0
+        pool.putconn(connection)
+
+        pool.getconn()
+
+        patched_pool.return_value.putconn.assert_called_once_with(
+            connection, close=False)
+
+    def test_broken_connection_replaced(self, patched_pool):
+        """Test a health check swaps out a dead connection."""
+        dead, alive = MagicMock(closed=1), MagicMock(closed=0)
+        alive.info.transaction_status = \
+            psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        patched_pool.return_value.getconn.side_effect = [dead, alive]
+        pool = base.ConnectionPool(CONN_PARAMS, 1, 2, timeout=0.01)
+
+        self.assertIs(pool.getconn(check=True), alive)
+        patched_pool.return_value.putconn.assert_called_once_with(
+            dead, close=True)
+
+
+class DatabaseWrapperTests(SimpleTestCase):
+    """Test closing pooled connections."""
+
+    def setUp(self):
+        self.wrapper = base.DatabaseWrapper({
+            'ENGINE': 'core.db.backends.postgresql_pool',
+            'NAME': 'devdb',
+            'USER': '',
+            'PASSWORD': '',
+            'HOST': 'db',
+            'PORT': '',
+            'OPTIONS': {},
+            'TIME_ZONE': None,
+            'CONN_MAX_AGE': 0,
+            'CONN_HEALTH_CHECKS': False,
+            'AUTOCOMMIT': True,
+        })
+        self.wrapper.connection = MagicMock()
+        self.wrapper.pool = MagicMock(pid=base.os.getpid())
+
+    def test_close_returns_connection_to_pool(self):
+        """Test closing hands the connection back instead of closing it."""
+        connection, pool = self.wrapper.connection, self.wrapper.pool
+
+        self.wrapper.close()
+
+        pool.putconn.assert_called_once_with(connection)
+        connection.close.assert_not_called()
+        self.assertIsNone(self.wrapper.connection)
+
+    def test_close_after_fork_leaves_parent_socket(self):
+        """Test a forked child neither closes nor returns the connection."""
+        connection, pool = self.wrapper.connection, self.wrapper.pool
+        pool.pid = -1
+
+        self.wrapper.close()
+
+        pool.putconn.assert_not_called()
+        connection.close.assert_not_called()
+
+
+class GunicornHookTests(SimpleTestCase):
+    """Test gunicorn workers warm their own pools."""
+
+    def test_worker_warms_pools(self):
+        """Test each pooled connection is warmed once the worker starts."""
+        pooled = MagicMock()
+        plain = MagicMock(spec=['close'])
+
+        with patch('django.db.connections.all',
+                   return_value=[pooled, plain]):
+            gunicorn_conf.post_worker_init(worker=MagicMock())
+
+        pooled.warm_pool.assert_called_once_with()
@@ -0,0 +1,137 @@
+"""
+Tests for the password hashing policy.
+"""
+import threading
+from importlib.util import find_spec
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.test import TestCase, override_settings
+
+from core import (
+    checks,
+    hashers,
+)
+
+FAST_SCRYPT = {'SCRYPT': {'WORK_FACTOR': 2 ** 10}}
+SCRYPT_HASHERS = [
+    'core.hashers.TunedScryptPasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+]
+ARGON2_HASHERS = [
+    'core.hashers.TunedArgon2PasswordHasher',
+    'core.hashers.TunedScryptPasswordHasher',
+]
+
+
+@override_settings(PASSWORD_HASHERS=SCRYPT_HASHERS,
+                   PASSWORD_HASHING=FAST_SCRYPT)
+class PasswordHashingTests(TestCase):
+    """Test hashing, verifying and upgrading passwords."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='password123',
+        )
+
+    def assertHashedWith(self, user, algorithm, **params):
+        user.refresh_from_db()
+        decoded = identify_hasher(user.password).decode(user.password)
+        self.assertEqual(decoded['algorithm'], algorithm)
+        for name, value in params.items():
+            self.assertEqual(decoded[name], value)
+
+    def test_new_passwords_use_tuned_cost(self):
+        """Test new passwords are hashed with the configured cost."""
+        self.assertHashedWith(self.user, 'scrypt', work_factor=2 ** 10)
+        self.assertTrue(self.user.check_password('password123'))
+        self.assertFalse(self.user.check_password('wrong'))
+
+    def test_legacy_hash_upgraded_on_login(self):
+        """Test a PBKDF2 hash is rehashed with scrypt on login."""
+        self.user.password = make_password('password123',
+                                           hasher='pbkdf2_sha256')
+        self.user.save()
+
+        user = authenticate(username='user@example.com',
+                            password='password123')
+
+        self.assertEqual(user, self.user)
+        self.assertHashedWith(self.user, 'scrypt')
+
+    def test_cost_change_upgrades_hash(self):
+        """Test a hash with an older cost is rehashed on login."""
+        with override_settings(PASSWORD_HASHING={
+            'SCRYPT': {'WORK_FACTOR': 2 ** 11},
+        }):
+            self.assertTrue(self.user.check_password('password123'))
+
+        self.assertHashedWith(self.user, 'scrypt', work_factor=2 ** 11)
+
+    @skipUnless(find_spec('argon2'), 'argon2-cffi is not installed')
+    def test_argon2_policy(self):
+        """Test the argon2 policy hashes with the configured cost."""
+        with override_settings(PASSWORD_HASHERS=ARGON2_HASHERS,
+                               PASSWORD_HASHING={'ARGON2': {
+                                   'TIME_COST': 1, 'MEMORY_COST': 1024,
+                               }}):
+            self.assertTrue(self.user.check_password('password123'))
+            self.assertHashedWith(self.user, 'argon2', memory_cost=1024)
+
+
+@override_settings(PASSWORD_HASHERS=SCRYPT_HASHERS,
+                   PASSWORD_HASHING={**FAST_SCRYPT, 'WORKERS': 2})
+class PooledPasswordHashingTests(TestCase):
+    """Test hashing on the bounded worker pool."""
+
+    def test_hashing_runs_on_pool(self):
+        """Test passwords are hashed off the request thread."""
+        threads = []
+        original = hashers.hashers.make_password
+
+        def record(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return original(*args, **kwargs)
+
+        with patch.object(hashers.hashers, 'make_password',
+                          side_effect=record):
+            get_user_model().objects.create_user(email='user@example.com',
+                                                 password='password123')
+
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith('password-hash'))
+
+    def test_upgrade_saved_from_request_thread(self):
+        """Test a pooled login still saves the upgraded hash."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='password123',
+        )
+        user.password = make_password('password123',
+                                      hasher='pbkdf2_sha256')
+        user.save()
+
+        self.assertEqual(authenticate(username='user@example.com',
+                                      password='password123'), user)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('scrypt$'))
+
+
+class PasswordHasherCheckTests(TestCase):
+    """Test the preferred hasher's library is checked at startup."""
+
+    @override_settings(PASSWORD_HASHERS=ARGON2_HASHERS)
+    def test_missing_library_reported(self):
+        """Test a missing argon2-cffi is an error."""
+        with patch('core.checks.find_spec', return_value=None):
+            errors = checks.check_password_hasher_available()
+
+        self.assertEqual([error.id for error in errors], ['core.E001'])
+
+    @override_settings(PASSWORD_HASHERS=SCRYPT_HASHERS)
+    def test_stdlib_hasher_passes(self):
+        """Test scrypt needs no extra package."""
+        self.assertEqual(checks.check_password_hasher_available(), [])
@@ -0,0 +1,63 @@
+"""
+Tests for the indexes behind the API's queries.
+"""
+from django.db import connection
+from django.test import TestCase, tag
+
+from core.models import (
+    Author,
+    Genre,
+)
+
+SEED_SIZE = 20000
+
+
+@tag('slow')
+class IndexUsageTests(TestCase):
+    """Test query plans use the indexes on a large table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Names and emails both repeat, so only the composite index
+        # narrows a (name, email) lookup down to one row.
+        Author.objects.bulk_create(
+            Author(name=f'name{i % 5000}',
+                   email=f'test{i % 4000}@example.com')
+            for i in range(SEED_SIZE)
+        )
+        Genre.objects.bulk_create(
+            Genre(name=f'genre{i}') for i in range(SEED_SIZE)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def assertUsesIndex(self, queryset, *index_names):
+        plan = queryset.explain()
+        self.assertTrue(any(name in plan for name in index_names), plan)
+
+    def test_author_list_ordering(self):
+        """Test listing authors by name reads the name index."""
+        queryset = Author.objects.order_by('-name', 'id')[:51]
+
+        self.assertUsesIndex(queryset, 'author_name_desc_idx')
+
+    def test_author_email_lookup(self):
+        """Test looking up authors by email reads the email index."""
+        queryset = Author.objects.filter(email='test10@example.com')
+
+        self.assertUsesIndex(queryset, 'author_email_idx')
+
+    def test_author_name_email_lookup(self):
+        """Test matching authors on (name, email) reads the composite index."""
+        queryset = Author.objects.filter(name='name10',
+                                         email='test10@example.com')
+
+        # SQLite backs unique constraints with an unnamed autoindex.
+        self.assertUsesIndex(queryset, 'unique_author_name_email',
+                             'sqlite_autoindex_core_author')
+
+    def test_genre_list_ordering(self):
+        """Test listing genres by name reads the name index."""
+        queryset = Genre.objects.order_by('-name', 'id')[:51]
+
+        self.assertUsesIndex(queryset, 'genre_name_desc_idx')
@@ -0,0 +1,194 @@
+"""
+Tests for request profiling.
+"""
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.generics import GenericAPIView
+from rest_framework.test import APIClient
+
+from core import profiling
+from core.models import (
+    Book,
+    Author,
+    Genre,
+)
+from book.serializers import GenreSerializer
+
+BOOKS_URL = reverse('book:book-list')
+ASYNC_BOOKS_URL = reverse('book:async-book-list')
+STATS_URL = reverse('profile-stats')
+
+
+class HistogramTests(TestCase):
+    """Test the profiling histograms."""
+
+    def test_percentiles(self):
+        """Test percentiles are the upper bound of their bucket."""
+        histogram = profiling.Histogram((1, 10, 100))
+        for value in [0.5] * 50 + [5] * 40 + [50] * 9 + [500]:
+            histogram.add(value)
+
+        stats = histogram.as_dict(100)
+        self.assertEqual(stats['p50'], 1)
+        self.assertEqual(stats['p90'], 10)
+        self.assertEqual(stats['p99'], 100)
+        self.assertEqual(stats['max'], 500)
+        self.assertEqual(stats['buckets'],
+                         {'1': 50, '10': 40, '100': 9, '+Inf': 1})
+
+
+class ProfilingMiddlewareTests(TestCase):
+    """Test profiling API requests."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(
+            email='admin@example.com',
+            password='password123',
+        )
+        cls.token = Token.objects.create(user=cls.admin)
+        for i in range(3):
+            book = Book.objects.create(title=f'book{i}', price=1000)
+            book.authors.add(Author.objects.create(
+                name=f'name{i}', email=f'test{i}@example.com',
+            ))
+
+    def setUp(self):
+        profiling.get_stats().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get_stats(self):
+        res = self.client.get(STATS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['scope'], 'process')
+
+        return res.data['endpoints']
+
+    def test_serializer_timed_without_changing_class(self):
+        """Test serialization is timed on the instance, not its class."""
+        class GenreView(profiling.SerializerProfilingMixin, GenericAPIView):
+            serializer_class = GenreSerializer
+
+        view = GenreView(request=None, format_kwarg=None)
+        profile = profiling.Profile()
+        token = profiling._profile.set(profile)
+        try:
+            serializer = view.get_serializer(
+                [Genre.objects.create(name='Novel')], many=True
+            )
+            serializer.data
+        finally:
+            profiling._profile.reset(token)
+
+        self.assertIs(type(serializer.child), GenreSerializer)
+        self.assertGreater(profile.serialize_time, 0)
+        self.assertNotIn('to_representation', vars(GenreSerializer()))
+
+    def test_not_profiled_by_default(self):
+        """Test requests are not profiled with a zero sample rate."""
+        res = self.client.get(BOOKS_URL, HTTP_X_PROFILE='1')
+
+        self.assertNotIn('X-Query-Count', res)
+        self.assertNotIn('book:book-list', self.get_stats())
+
+    @override_settings(PROFILING={'SAMPLE_RATE': 0, 'HEADERS': True})
+    def test_headers_opt_in(self):
+        """Test X-Profile requests get the query count and timings."""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(BOOKS_URL, HTTP_X_PROFILE='1')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['X-Query-Count'], str(len(queries)))
+        self.assertEqual(
+            [timing.split(';')[0] for timing in
+             res['Server-Timing'].split(', ')],
+            ['db', 'serialize', 'total'],
+        )
+        self.assertNotIn('X-Query-Count', self.client.get(BOOKS_URL))
+
+    @override_settings(PROFILING={'SAMPLE_RATE': 1})
+    def test_stats_by_endpoint_and_action(self):
+        """Test sampled requests are aggregated per endpoint and action."""
+        self.client.get(BOOKS_URL, {'page_size': 1})
+        self.client.get(BOOKS_URL, {'page_size': 2})
+        res = self.client.get(reverse('book:book-detail',
+                                      args=[Book.objects.first().id]))
+
+        self.assertNotIn('X-Query-Count', res)
+        endpoints = self.get_stats()
+        books = endpoints['book:book-list']['list']
+        self.assertEqual(books['count'], 2)
+        self.assertGreater(books['queries']['mean'], 0)
+        self.assertGreater(books['serialize_ms']['max'], 0)
+        self.assertGreaterEqual(books['total_ms']['max'],
+                                books['db_ms']['max'])
+        self.assertEqual(endpoints['book:book-detail']['retrieve']['count'],
+                         1)
+
+    @override_settings(PROFILING={'SAMPLE_RATE': 1})
+    def test_views_without_action_recorded_by_method(self):
+        """Test plain API views are recorded by HTTP method."""
+        self.client.post(reverse('user:token'),
+                         {'email': 'admin@example.com', 'password': 'bad'})
+
+        self.assertEqual(
+            self.get_stats()['user:token']['post']['count'], 1
+        )
+
+    @override_settings(PROFILING={'SAMPLE_RATE': 1})
+    async def test_async_views_profiled(self):
+        """Test async views are profiled without leaving async mode."""
+        await self.async_client.get(
+            ASYNC_BOOKS_URL, authorization=f'Token {self.token.key}',
+        )
+
+        stats = profiling.get_stats().as_dict()['book:async-book-list']
+        self.assertGreater(stats['list']['queries']['mean'], 0)
+        self.assertGreater(stats['list']['serialize_ms']['max'], 0)
+
+    @override_settings(PROFILING={'SAMPLE_RATE': 1})
+    def test_clear_stats(self):
+        """Test DELETE clears the stats."""
+        self.client.get(BOOKS_URL)
+        res = self.client.delete(STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(list(self.get_stats()), ['profile-stats'])
+
+    def test_stats_limited_to_admin(self):
+        """Test the profiling stats are limited to admin."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='password123',
+        )
+        self.client.force_authenticate(user)
+        res = self.client.get(STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(PROFILING={'SAMPLE_RATE': 1})
+    def test_api_views_profiled(self):
+        """Test plain API views are profiled without get_serializer()."""
+        res = self.client.get(reverse('book:cache-stats'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.get_stats()['book:cache-stats']['get']['count'], 1
+        )
+
+    def test_schema_generated_without_errors(self):
+        """Test the API schema covers every view without errors."""
+        with tempfile.TemporaryDirectory() as tmp:
+            call_command('spectacular', '--fail-on-warn',
+                         '--file', os.path.join(tmp, 'schema.yml'))
@@ -0,0 +1,140 @@
+"""
+Tests for the orjson renderer and parser.
+"""
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+
+DATA = {
+    'title': 'book "é" \U0001F4DA \u2028\u2029 </script>',
+    'price': 2 ** 63 - 1,
+    'ids': (1, 2, 3),
+    'birth': datetime.date(1990, 4, 10),
+    'created': datetime.datetime(2023, 1, 2, 3, 4, 5, 678901,
+                                 tzinfo=datetime.timezone.utc),
+    'naive': datetime.datetime(2023, 1, 2, 3, 4, 5),
+    'time': datetime.time(12, 30, 15, 500),
+    'duration': datetime.timedelta(hours=1, microseconds=5),
+    'decimal': Decimal('12.50'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'lazy': gettext_lazy('Check your email is valid.'),
+    'nested': ReturnDict({1: None, 'ok': True}, serializer=None),
+    'empty': [],
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """Test the renderer matches DRF's JSONRenderer."""
+
+    def assertSameRender(self, data, accepted_media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_matches_json_renderer(self):
+        """Test dates, decimals and other types render as with json."""
+        self.assertSameRender(DATA)
+        self.assertSameRender([DATA, DATA])
+        self.assertSameRender(None)
+
+    def test_indent(self):
+        """Test indented output is rendered by the json module."""
+        self.assertSameRender(DATA, 'application/json; indent=4')
+
+    def test_integers_over_64_bits(self):
+        """Test integers orjson cannot render fall back to json."""
+        self.assertSameRender({'big': 2 ** 64})
+
+    def test_errors(self):
+        """Test unsupported values raise the json module's errors."""
+        with self.assertRaisesMessage(TypeError, 'not JSON serializable'):
+            FastJSONRenderer().render({'value': object()})
+
+    @patch('core.renderers.orjson', None)
+    def test_without_orjson(self):
+        """Test the json module renders when orjson is not installed."""
+        self.assertSameRender(DATA)
+
+
+class FastJSONParserTests(SimpleTestCase):
+    """Test the parser matches DRF's JSONParser."""
+
+    def parse(self, parser_class, body, encoding='utf-8'):
+        try:
+            return parser_class().parse(io.BytesIO(body),
+                                        parser_context={'encoding': encoding})
+        except ParseError as exc:
+            return str(exc)
+
+    def assertSameParse(self, body, encoding='utf-8'):
+        expected = self.parse(JSONParser, body, encoding)
+        self.assertEqual(self.parse(FastJSONParser, body, encoding),
+                         expected)
+
+        return expected
+
+    def test_matches_json_parser(self):
+        """Test bodies parse to the same data as with json."""
+        data = self.assertSameParse(
+            '{"title": "é \U0001F4DA", "price": 1.5, "ids": [1, null]}'
+            .encode()
+        )
+        self.assertEqual(data['price'], 1.5)
+
+    def test_integers_over_64_bits(self):
+        """Test long integers stay exact."""
+        data = self.assertSameParse(b'{"id": 18446744073709551616}')
+        self.assertEqual(data['id'], 2 ** 64)
+
+    def test_errors(self):
+        """Test invalid bodies fail with the json module's messages."""
+        for body in [b'', b'{"a": }', b'NaN', b'"\\ud800"']:
+            self.assertSameParse(body)
+
+    def test_other_encodings(self):
+        """Test bodies in other encodings are decoded first."""
+        data = self.assertSameParse('{"name": "é"}'.encode('latin-1'),
+                                    'latin-1')
+        self.assertEqual(data['name'], 'é')
+
+    @patch('core.parsers.orjson', None)
+    def test_without_orjson(self):
+        """Test the json module parses when orjson is not installed."""
+        self.assertSameParse(b'{"a": [1, 2]}')
+
+
+class FastJSONApiTests(TestCase):
+    """Test the API renders and parses with the configured classes."""
+
+    def test_birth_date(self):
+        """Test a user's birth date renders as an ISO 8601 date."""
+        user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpassword',
+            birth='1990-04-10',
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+
+        res = client.patch(reverse('user:me'), {'name': 'new\u2028name'},
+                           format='json')
+
+        self.assertIsInstance(res.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(res.json()['birth'], '1990-04-10')
+        self.assertIn(b'"name":"new\\u2028name"', res.content)
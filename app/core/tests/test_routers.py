@@ -0,0 +1,123 @@
+"""
+Tests for read replica routing.
+"""
+import time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import routers
+from core.models import Book
+
+REPLICAS = {'ALIASES': ['replica1', 'replica2'], 'PIN_SECONDS': 5}
+BOOK_URL = reverse('book:book-list')
+
+
+@override_settings(READ_REPLICAS=REPLICAS)
+class PrimaryReplicaRouterTests(TestCase):
+    """Test routing decisions between the primary and two replicas."""
+
+    def setUp(self):
+        self.router = routers.PrimaryReplicaRouter()
+
+    def test_reads_use_primary_by_default(self):
+        """Test reads outside replica_reads() use the primary."""
+        self.assertEqual(self.router.db_for_read(Book), DEFAULT_DB_ALIAS)
+
+    def test_replica_reads(self):
+        """Test reads inside replica_reads() use a replica."""
+        with routers.replica_reads():
+            aliases = {self.router.db_for_read(Book) for _ in range(50)}
+
+        self.assertEqual(aliases, {'replica1', 'replica2'})
+        self.assertEqual(self.router.db_for_read(Book), DEFAULT_DB_ALIAS)
+
+    def test_writes_use_primary(self):
+        """Test writes always use the primary."""
+        book = Book(title='Sample book', price=1000)
+        book._state.db = 'replica1'
+
+        with routers.replica_reads():
+            db = self.router.db_for_write(Book, instance=book)
+
+        self.assertEqual(db, DEFAULT_DB_ALIAS)
+
+    def test_migrations_skip_replicas(self):
+        """Test migrations only run on the primary."""
+        self.assertFalse(self.router.allow_migrate('replica1', 'core'))
+        self.assertIsNone(self.router.allow_migrate(DEFAULT_DB_ALIAS, 'core'))
+
+    @override_settings(READ_REPLICAS={'ALIASES': []})
+    def test_no_replicas_configured(self):
+        """Test reads use the primary without replicas."""
+        with routers.replica_reads():
+            self.assertEqual(self.router.db_for_read(Book), DEFAULT_DB_ALIAS)
+
+
+@override_settings(READ_REPLICAS={'ALIASES': [DEFAULT_DB_ALIAS]})
+class ReplicaReadMixinTests(TestCase):
+    """Test API views choose between the primary and replicas."""
+
+    def setUp(self):
+        cache.clear()
+        self.superuser = get_user_model().objects.create_superuser(
+            email='superuser@example.com',
+            password='password123',
+        )
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='password123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        cache.clear()
+
+    def get_books(self, page_size=1):
+        """List books, returning whether reads could use a replica."""
+        decisions = []
+        original = routers.PrimaryReplicaRouter.db_for_read
+
+        def record(router, model, **hints):
+            decisions.append(routers.reading_from_replica())
+            return original(router, model, **hints)
+
+        with patch.object(routers.PrimaryReplicaRouter, 'db_for_read',
+                          autospec=True, side_effect=record):
+            self.client.get(BOOK_URL, {'page_size': page_size})
+
+        return bool(decisions) and all(decisions)
+
+    def test_safe_requests_read_replica(self):
+        """Test list requests read from a replica."""
+        self.assertTrue(self.get_books())
+
+    def test_client_pinned_after_write(self):
+        """Test a client reads its own writes from the primary."""
+        self.client.force_authenticate(self.superuser)
+        self.client.post(BOOK_URL, {'title': 'Sample book', 'price': 1000})
+        cache.delete(routers._pin_key(routers.model_key(Book)))
+
+        self.assertFalse(self.get_books())
+        self.client.force_authenticate(self.user)
+        self.assertTrue(self.get_books(page_size=2))
+
+    def test_model_pinned_after_write(self):
+        """Test every client reads a changed model from the primary."""
+        Book.objects.create(title='Sample book', price=1000)
+
+        self.assertFalse(self.get_books())
+
+    @override_settings(READ_REPLICAS={
+        'ALIASES': [DEFAULT_DB_ALIAS], 'PIN_SECONDS': 0.01,
+    })
+    def test_pin_expires(self):
+        """Test reads return to replicas once the pin expires."""
+        Book.objects.create(title='Sample book', price=1000)
+        time.sleep(0.02)
+
+        self.assertTrue(self.get_books())
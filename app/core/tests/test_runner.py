@@ -0,0 +1,23 @@
+"""
+Tests for the test runner.
+"""
+from django.test import SimpleTestCase
+
+from core.runner import TestRunner
+
+
+class TestRunnerTests(SimpleTestCase):
+    """Test slow tests are opt-in."""
+
+    def test_slow_excluded_by_default(self):
+        """Test slow tests are excluded alongside other excluded tags."""
+        runner = TestRunner(exclude_tags=['other'])
+
+        self.assertEqual(runner.exclude_tags, {'other', 'slow'})
+
+    def test_slow_run_when_tagged(self):
+        """Test --tag slow runs the slow tests."""
+        runner = TestRunner(tags=['slow'])
+
+        self.assertEqual(runner.tags, {'slow'})
+        self.assertEqual(runner.exclude_tags, set())
@@ -0,0 +1,78 @@
+"""
+Tests for the query budget harness.
+"""
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from core.models import Genre
+from core.testing import (
+    RECORD_ENV,
+    BudgetFile,
+    query_budget,
+)
+
+TEST = 'tests.Example.test_example'
+
+
+class QueryBudgetTests(TestCase):
+    """Test query budgets."""
+
+    def setUp(self):
+        # Also when the suite itself runs with QUERY_BUDGET_RECORD=1.
+        env = patch.dict(os.environ, {RECORD_ENV: ''})
+        env.start()
+        self.addCleanup(env.stop)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'query_budgets.json')
+
+    def write_budgets(self, budgets):
+        with open(self.path, 'w') as f:
+            json.dump({'sqlite': {TEST: budgets},
+                       'postgresql': {TEST: budgets}}, f)
+
+        return BudgetFile(self.path)
+
+    def test_within_budget(self):
+        """Test blocks within their budget pass."""
+        budget_file = self.write_budgets({'list': 2})
+
+        with query_budget(budget_file, TEST, 'list'):
+            list(Genre.objects.all())
+
+    def test_over_budget(self):
+        """Test blocks over their budget fail listing their queries."""
+        budget_file = self.write_budgets({'list': 1})
+
+        with self.assertRaisesRegex(AssertionError, r'ran 2 queries(.|\n)*'
+                                                    r'2\. SELECT'):
+            with query_budget(budget_file, TEST, 'list'):
+                list(Genre.objects.all())
+                list(Genre.objects.all())
+
+    def test_missing_budget_fails(self):
+        """Test blocks without a budget fail, naming how to record one."""
+        budget_file = self.write_budgets({})
+
+        with self.assertRaisesRegex(AssertionError, RECORD_ENV):
+            with query_budget(budget_file, TEST, 'list'):
+                list(Genre.objects.all())
+
+    @patch.dict(os.environ, {RECORD_ENV: '1'})
+    def test_record(self):
+        """Test recording keeps the most queries a block ran."""
+        budget_file = BudgetFile(self.path)
+
+        with query_budget(budget_file, TEST, 'list'):
+            list(Genre.objects.all())
+            list(Genre.objects.all())
+        with query_budget(budget_file, TEST, 'list'):
+            list(Genre.objects.all())
+
+        with open(self.path) as f:
+            budgets = json.load(f)
+        self.assertEqual(list(budgets.values()), [{TEST: {'list': 2}}])
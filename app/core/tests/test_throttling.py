@@ -0,0 +1,182 @@
+"""
+Tests for throttling the user APIs.
+"""
+import threading
+import time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.throttling import (
+    CacheBucketStore,
+    LocalBucketStore,
+    get_store,
+)
+
+CREATE_USER_URL = reverse('user:create')
+TOKEN_URL = reverse('user:token')
+
+
+@patch('core.throttling.time.monotonic')
+class LocalBucketStoreTests(SimpleTestCase):
+    """Test in-process token buckets."""
+
+    def test_burst_then_refill(self, patched_monotonic):
+        """Test a bucket allows a burst, then refills over the period."""
+        store = LocalBucketStore(max_keys=10)
+        patched_monotonic.return_value = 100
+
+        results = [store.take('a', 3, 60)[0] for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+        self.assertEqual(store.take('a', 3, 60), (False, 20))
+
+        patched_monotonic.return_value = 120
+        self.assertEqual(store.take('a', 3, 60), (True, 0))
+
+    def test_keys_independent_and_bounded(self, patched_monotonic):
+        """Test each key has its own bucket and old keys are dropped."""
+        store = LocalBucketStore(max_keys=2)
+        patched_monotonic.return_value = 100
+        store.take('a', 1, 60)
+
+        self.assertTrue(store.take('b', 1, 60)[0])
+        store.take('c', 1, 60)
+        self.assertTrue(store.take('a', 1, 60)[0])
+
+
+class CacheBucketStoreTests(SimpleTestCase):
+    """Test buckets in a shared Django cache."""
+
+    def test_shared_between_instances(self):
+        """Test stores on the same cache share buckets."""
+        cache.clear()
+        first = CacheBucketStore('default')
+        second = CacheBucketStore('default')
+
+        self.assertTrue(first.take('a', 1, 60)[0])
+        self.assertFalse(second.take('a', 1, 60)[0])
+
+    def test_concurrent_takes_share_tokens(self):
+        """Test concurrent workers cannot spend the same tokens."""
+        cache.clear()
+        store = CacheBucketStore('default')
+        add = store.cache.add
+
+        def slow_add(*args, **kwargs):
+            # Let every worker miss the counter before one creates it.
+            time.sleep(0.005)
+            return add(*args, **kwargs)
+
+        results = []
+        barrier = threading.Barrier(6)
+
+        def take():
+            barrier.wait()
+            results.append(store.take('a', 3, 60)[0])
+
+        with patch.object(store.cache, 'add', side_effect=slow_add):
+            threads = [threading.Thread(target=take) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(sorted(results), [False] * 3 + [True] * 3)
+
+    @patch('core.throttling.time.time')
+    def test_window_resets(self, patched_time):
+        """Test the limit resets when the next window starts."""
+        cache.clear()
+        store = CacheBucketStore('default')
+        patched_time.return_value = 6000
+
+        self.assertEqual(store.take('a', 1, 60), (True, 0))
+        patched_time.return_value = 6045
+        self.assertEqual(store.take('a', 1, 60), (False, 15))
+
+        patched_time.return_value = 6060
+        self.assertEqual(store.take('a', 1, 60), (True, 0))
+
+
+@override_settings(THROTTLING={'RATES': {
+    'login_ip': '3/min', 'login_email': '2/min', 'signup_ip': '1/hour',
+}})
+class ThrottledUserApiTests(TestCase):
+    """Test the token and signup APIs are throttled."""
+
+    def setUp(self):
+        get_store().clear()
+        self.client = APIClient()
+        get_user_model().objects.create_user(email='test@example.com',
+                                             password='testpassword')
+        self.payload = {'email': 'test@example.com', 'password': 'wrong'}
+
+    def test_login_throttled_per_email(self):
+        """Test repeated logins for an email are throttled across IPs."""
+        for ip in ['10.0.0.1', '10.0.0.2']:
+            res = self.client.post(TOKEN_URL, self.payload, REMOTE_ADDR=ip)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.post(TOKEN_URL, self.payload,
+                               REMOTE_ADDR='10.0.0.3')
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(res['Retry-After'], '30')
+
+    def test_login_throttled_per_ip(self):
+        """Test logins from one IP are throttled across emails."""
+        for i in range(3):
+            self.client.post(TOKEN_URL, {'email': f'test{i}@example.com',
+                                         'password': 'wrong'})
+
+        res = self.client.post(TOKEN_URL, self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_throttled_login_skips_hashing(self):
+        """Test a throttled login never checks the password."""
+        for _ in range(2):
+            self.client.post(TOKEN_URL, self.payload)
+
+        with patch('core.hashers.check_password') as patched_check, \
+                self.assertNumQueries(0):
+            res = self.client.post(TOKEN_URL, self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        patched_check.assert_not_called()
+
+    def test_email_case_shares_bucket(self):
+        """Test emails differing in case share a bucket."""
+        for email in ['test@example.com', 'TEST@example.com']:
+            self.client.post(TOKEN_URL, {'email': email, 'password': 'x'},
+                             REMOTE_ADDR=email)
+
+        res = self.client.post(TOKEN_URL, self.payload,
+                               REMOTE_ADDR='10.0.0.9')
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_login_body_not_an_object(self):
+        """Test a login body that is not an object is rejected, not 500."""
+        res = self.client.post(TOKEN_URL, [self.payload], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_signup_throttled_per_ip(self):
+        """Test repeated signups from one IP are throttled."""
+        payload = {'email': 'new@example.com', 'password': 'testpassword',
+                   'name': 'Test Name'}
+        res = self.client.post(CREATE_USER_URL, payload)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        payload['email'] = 'other@example.com'
+        res = self.client.post(CREATE_USER_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertFalse(get_user_model().objects.filter(
+            email='other@example.com').exists())
@@ -0,0 +1,43 @@
+"""
+Tests for the shared email validator.
+"""
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+from rest_framework import serializers
+
+from core.validators import (
+    NormalizedEmailField,
+    normalize_email,
+)
+
+
+class NormalizeEmailTests(SimpleTestCase):
+    """Test normalize_email."""
+
+    def test_domain_lowercased(self):
+        """Test only the domain is lowercased."""
+        self.assertEqual(normalize_email('Te.St+tag@Mail.Example.COM'),
+                         'Te.St+tag@mail.example.com')
+
+    def test_invalid_emails(self):
+        """Test invalid emails raise ValidationError."""
+        emails = [
+            '', 'test', 'test@', '@example.com', 'test@com', 'test@.com',
+            '.test@example.com', 'te..st@example.com', 'test@exa_mple.com',
+            'test@-example.com', 'test@example.com-', 'test@example.com\n',
+            ' test@example.com', 'a' * 310 + '@example.com', None,
+        ]
+
+        for email in emails:
+            with self.subTest(email=email):
+                with self.assertRaises(ValidationError):
+                    normalize_email(email)
+
+    def test_field_normalizes(self):
+        """Test the serializer field normalizes and rejects emails."""
+        field = NormalizedEmailField()
+
+        self.assertEqual(field.run_validation(' test@EXAMPLE.com '),
+                         'test@example.com')
+        with self.assertRaises(serializers.ValidationError):
+            field.run_validation('test@com')
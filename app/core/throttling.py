@@ -0,0 +1,196 @@
+"""
+Token bucket throttling for the user APIs.
+
+Each client key (an IP address or an email) gets a bucket holding up to
+N tokens that refills at N per period. A request takes one token or is
+answered 429 with Retry-After. Throttles run before the view, so a
+throttled login never reaches the password hasher.
+
+Buckets live in-process by default. Set THROTTLING['CACHE_ALIAS'] to
+share limits between workers through a Django cache instead. A shared
+limit is a fixed window of N requests per period, counted with the
+cache's atomic incr() and add(), so concurrent workers never allow more
+than N and usually need one cache round trip per request.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.throttling import BaseThrottle
+
+DEFAULTS = {
+    'CACHE_ALIAS': None,
+    'MAX_KEYS': 100000,
+    'RATES': {
+        'login_ip': '20/min',
+        'login_email': '5/min',
+        'signup_ip': '10/hour',
+    },
+}
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def get_options():
+    options = {**DEFAULTS, **getattr(settings, 'THROTTLING', {})}
+    options['RATES'] = {**DEFAULTS['RATES'], **options['RATES']}
+
+    return options
+
+
+def parse_rate(rate):
+    """Return (capacity, period in seconds) for a rate like '5/min'."""
+    count, period = rate.split('/')
+
+    return int(count), PERIODS[period[0]]
+
+
+def _refill(tokens, updated, now, capacity, period):
+    """Take a token from a bucket; return (tokens, allowed, wait)."""
+    per_second = capacity / period
+    tokens = min(capacity, tokens + (now - updated) * per_second)
+    if tokens >= 1:
+        return tokens - 1, True, 0
+
+    return tokens, False, (1 - tokens) / per_second
+
+
+class LocalBucketStore:
+    """Buckets in this process, dropping the least recently used."""
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, period):
+        """Take a token for key; return (allowed, seconds to wait)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens, allowed, wait = _refill(tokens, updated, now,
+                                            capacity, period)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        return allowed, wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    """Fixed window counters in a Django cache shared between workers."""
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def _incr(self, key, period):
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            if self.cache.add(key, 1, period):
+                return 1
+            # Another worker started the window first.
+            return self.cache.incr(key)
+
+    def take(self, key, capacity, period):
+        now = time.time()
+        window = int(now // period)
+        # Keys name their window, so one outliving its timeout is unused.
+        count = self._incr(f'throttle:{key}:{window}', period)
+        if count <= capacity:
+            return True, 0
+
+        return False, (window + 1) * period - now
+
+    def clear(self):
+        pass
+
+
+_store = None
+
+
+def get_store():
+    """Return the bucket store configured by THROTTLING."""
+    global _store
+    if _store is None:
+        options = get_options()
+        if options['CACHE_ALIAS']:
+            _store = CacheBucketStore(options['CACHE_ALIAS'])
+        else:
+            _store = LocalBucketStore(options['MAX_KEYS'])
+
+    return _store
+
+
+@receiver(setting_changed)
+def reset_store(*, setting, **kwargs):
+    global _store
+    if setting == 'THROTTLING':
+        _store = None
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttle by get_key() at the THROTTLING['RATES'][scope] rate."""
+    scope = None
+
+    def get_key(self, request, view):
+        """Return the client key to throttle on, or None to allow."""
+        raise NotImplementedError('.get_key() must be overridden')
+
+    def allow_request(self, request, view):
+        key = self.get_key(request, view)
+        if key is None:
+            return True
+
+        capacity, period = parse_rate(get_options()['RATES'][self.scope])
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        allowed, self._wait = get_store().take(f'{self.scope}:{digest}',
+                                               capacity, period)
+
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class IPThrottle(TokenBucketThrottle):
+    """Throttle by client IP, honouring NUM_PROXIES."""
+
+    def get_key(self, request, view):
+        return self.get_ident(request)
+
+
+class EmailThrottle(TokenBucketThrottle):
+    """Throttle by the email a request submits."""
+
+    def get_key(self, request, view):
+        # The view rejects bodies that are not objects, e.g. JSON arrays.
+        if not isinstance(request.data, Mapping):
+            return None
+        email = request.data.get('email')
+        if not isinstance(email, str) or not email:
+            return None
+
+        return email.strip().lower()
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = 'login_ip'
+
+
+class LoginEmailThrottle(EmailThrottle):
+    scope = 'login_email'
+
+
+class SignupIPThrottle(IPThrottle):
+    scope = 'signup_ip'
@@ -0,0 +1,48 @@
+"""
+Email validation and normalization shared by models and serializers.
+
+One precompiled pattern checks the format and captures the domain, so
+validating and lowercasing the domain is a single match. It accepts
+dot-atom local parts and hostname domains with the same rules as
+Django's EmailValidator, which makes it no looser than EmailField.
+"""
+import re
+
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+MAX_LENGTH = 320
+ATEXT = r"[-!#$%&'*+/=?^_`{}|~0-9A-Za-z]"
+EMAIL_RE = re.compile(
+    rf'(?P<local>{ATEXT}+(?:\.{ATEXT}+)*)'
+    r'@(?P<domain>(?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+'
+    r'[A-Za-z0-9-]{2,63}(?<!-))'
+)
+INVALID_MESSAGE = _('Enter a valid email address.')
+
+
+def normalize_email(value):
+    """Return value with its domain lowercased.
+
+    Raises ValidationError if value is not a valid email address.
+    """
+    match = None
+    if isinstance(value, str) and len(value) <= MAX_LENGTH:
+        match = EMAIL_RE.fullmatch(value)
+    if match is None:
+        raise ValidationError(INVALID_MESSAGE, code='invalid')
+
+    return f'{match["local"]}@{match["domain"].lower()}'
+
+
+class NormalizedEmailField(serializers.CharField):
+    """Email serializer field validating with normalize_email()."""
+    default_error_messages = {'invalid': INVALID_MESSAGE}
+
+    def to_internal_value(self, data):
+        value = super().to_internal_value(data)
+        try:
+            return normalize_email(value)
+        except ValidationError:
+            self.fail('invalid')
@@ -0,0 +1,43 @@
+"""
+Views for the core APIs.
+"""
+import os
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.permissions import (
+    IsAdminUser,
+    IsAuthenticated,
+)
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core import profiling
+from core.authentication import CachedTokenAuthentication
+
+
+class ProfileStatsView(APIView):
+    """Report this worker's request profiling histograms.
+
+    Histograms are kept per process, so under several workers a response
+    covers only the worker (pid) that served it; scope says so. DELETE
+    clears them, e.g. before measuring a change.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def get(self, request):
+        return Response({
+            'scope': 'process',
+            'pid': os.getpid(),
+            'sample_rate': profiling.get_options()['SAMPLE_RATE'],
+            'endpoints': profiling.get_stats().as_dict(),
+        })
+
+    @extend_schema(responses={204: None})
+    def delete(self, request):
+        profiling.get_stats().clear()
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
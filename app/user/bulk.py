@@ -0,0 +1,202 @@
+"""
+Bulk user provisioning.
+"""
+import csv
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import (
+    IntegrityError,
+    transaction,
+)
+from rest_framework.authtoken.models import Token
+
+from core import hashers
+from user.serializers import BulkUserSerializer
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_FORMATS = ['ndjson', 'csv']
+HASH_CHUNK_SIZE = 16
+CREATE_ATTEMPTS = 3
+EMAIL_TAKEN = 'user with this email already exists.'
+
+
+def _decode(lines):
+    for line in lines:
+        yield line.decode() if isinstance(line, bytes) else line
+
+
+def _iter_records(lines, input_format):
+    """Yield (line number, record) pairs; records are None if unparsable.
+
+    Empty CSV cells are left out, so optional columns may be blank.
+    """
+    lines = _decode(lines)
+    if input_format == 'csv':
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, {
+                key: value for key, value in record.items()
+                if key is not None and value not in ('', None)
+            }
+        return
+
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError:
+            yield line_no, None
+
+
+def _iter_chunks(records, chunk_size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _validate_chunk(chunk, errors, seen):
+    """Return (line number, validated data) of a chunk's valid rows.
+
+    seen holds the emails of earlier rows, so an import never creates
+    the same user twice.
+    """
+    rows = []
+    for line_no, record in chunk:
+        if not isinstance(record, dict):
+            errors.append({'line': line_no,
+                           'errors': {'non_field_errors': ['Invalid JSON.']}})
+            continue
+
+        serializer = BulkUserSerializer(data=record)
+        if not serializer.is_valid():
+            errors.append({'line': line_no, 'errors': serializer.errors})
+            continue
+
+        email = serializer.validated_data['email']
+        if email in seen:
+            errors.append({'line': line_no, 'errors': {
+                'email': ['Duplicate email in import.'],
+            }})
+            continue
+
+        seen.add(email)
+        rows.append((line_no, serializer.validated_data))
+
+    return rows
+
+
+def _drop_existing(rows, errors):
+    """Return rows whose email is not taken, with one query."""
+    existing = set(get_user_model().objects.filter(
+        email__in=[data['email'] for _, data in rows],
+    ).values_list('email', flat=True))
+    for line_no, data in rows:
+        if data['email'] in existing:
+            errors.append({'line': line_no, 'errors': {
+                'email': [EMAIL_TAKEN],
+            }})
+
+    return [row for row in rows if row[1]['email'] not in existing]
+
+
+def _hash_passwords(rows, executor):
+    """Hash the rows' passwords on executor, or inline if it is None."""
+    passwords = [data.pop('password', None) for _, data in rows]
+    if executor is None:
+        return [make_password(password) for password in passwords]
+
+    return list(executor.map(make_password, passwords,
+                             chunksize=HASH_CHUNK_SIZE))
+
+
+@transaction.atomic
+def _create_users(rows, issue_tokens):
+    """Write a chunk of hashed rows; return (users, tokens)."""
+    User = get_user_model()
+    users = User.objects.bulk_create([User(**data) for _, data in rows])
+    tokens = []
+    if issue_tokens:
+        tokens = Token.objects.bulk_create([
+            Token(key=Token.generate_key(), user=user) for user in users
+        ])
+
+    return users, tokens
+
+
+def _create_chunk(rows, issue_tokens, errors):
+    """Write rows, reporting those whose email was taken meanwhile."""
+    for _ in range(CREATE_ATTEMPTS):
+        try:
+            return _create_users(rows, issue_tokens)
+        except IntegrityError:
+            # An email was taken since the check, e.g. by a signup.
+            rows = _drop_existing(rows, errors)
+
+    # Still conflicting: write row by row to find the rows that do.
+    users, tokens = [], []
+    for line_no, data in rows:
+        try:
+            row_users, row_tokens = _create_users([(line_no, data)],
+                                                  issue_tokens)
+        except IntegrityError:
+            errors.append({'line': line_no,
+                           'errors': {'email': [EMAIL_TAKEN]}})
+            continue
+        users += row_users
+        tokens += row_tokens
+
+    return users, tokens
+
+
+def import_users(lines, input_format='ndjson', chunk_size=IMPORT_CHUNK_SIZE,
+                 executor=None, issue_tokens=False):
+    """Import users from an iterable of JSON or CSV lines.
+
+    Rows are validated, hashed and inserted one chunk at a time. Hashing
+    runs on executor, by default the password hashing pool, and can be a
+    ProcessPoolExecutor. Rows that fail are reported by line and do not
+    stop the import.
+    """
+    if executor is None:
+        executor = hashers.get_pool()
+
+    start = time.perf_counter()
+    created = 0
+    errors = []
+    tokens = []
+    seen = set()
+    records = _iter_records(lines, input_format)
+    for chunk in _iter_chunks(records, chunk_size):
+        rows = _validate_chunk(chunk, errors, seen)
+        rows = _drop_existing(rows, errors)
+        if not rows:
+            continue
+        for (_, data), encoded in zip(rows,
+                                      _hash_passwords(rows, executor)):
+            data['password'] = encoded
+        users, chunk_tokens = _create_chunk(rows, issue_tokens, errors)
+        created += len(users)
+        tokens += [{'email': token.user.email, 'token': token.key}
+                   for token in chunk_tokens]
+
+    elapsed = time.perf_counter() - start
+    result = {
+        'created': created,
+        'errors': sorted(errors, key=lambda error: error['line']),
+        'seconds': round(elapsed, 3),
+        'users_per_second': round(created / elapsed, 1) if elapsed else 0,
+    }
+    if issue_tokens:
+        result['tokens'] = tokens
+
+    return result
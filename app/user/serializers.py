@@ -6,10 +6,17 @@ from django.contrib.auth import (
     authenticate
 )
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+
+from core.validators import NormalizedEmailField
 
 
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for the user objects."""
+    email = NormalizedEmailField(
+        max_length=255,
+        validators=[UniqueValidator(queryset=get_user_model().objects.all())],
+    )
 
     class Meta:
         model = get_user_model()
@@ -31,6 +38,20 @@ class UserSerializer(serializers.ModelSerializer):
 
         return user
 
+
+class BulkUserSerializer(UserSerializer):
+    """Serializer for users in a bulk import.
+
+    Emails are checked for uniqueness per chunk by the importer rather
+    than with a query per row. Users without a password get an unusable
+    one.
+    """
+    email = NormalizedEmailField(max_length=255)
+
+    class Meta(UserSerializer.Meta):
+        extra_kwargs = {'password': {'write_only': True, 'min_length': 5,
+                                     'required': False}}
+
 class AuthTokenSerializer(serializers.Serializer):
     """Serializer for the user auth token."""
     email = serializers.EmailField()
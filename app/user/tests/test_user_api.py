@@ -1,16 +1,28 @@
 """
 Tests for the user API.
 """
+import json
+from unittest.mock import patch
+
+from django.db import (
+    IntegrityError,
+    connection,
+)
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from user import bulk
 
 CREATE_USER_URL = reverse('user:create')
 TOKEN_URL = reverse('user:token')
 ME_URL = reverse('user:me')
+IMPORT_URL = reverse('user:import')
 
 def create_user(**params):
     """Create and return a new user."""
@@ -55,6 +67,31 @@ class PublicUserApiTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_create_user_normalizes_email(self):
+        """Test the email domain is lowercased on signup."""
+        payload = {
+            'email': 'Test@EXAMPLE.com',
+            'password': 'testpassword',
+            'name': 'Test Name',
+        }
+        res = self.client.post(CREATE_USER_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['email'], 'Test@example.com')
+
+    def test_user_with_email_domain_case_exists_error(self):
+        """Test emails differing in domain case are duplicates."""
+        create_user(email='test@example.com', password='testpassword')
+        payload = {
+            'email': 'test@Example.com',
+            'password': 'testpassword',
+            'name': 'Test Name',
+        }
+        res = self.client.post(CREATE_USER_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', res.data)
+
     def test_password_too_short_error(self):
         """Test an error is returned if password less than 5 chars."""
         payload = {
@@ -174,4 +211,139 @@ class PrivateUserApiTests(TestCase):
         self.user.refresh_from_db()
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(self.user.name, payload['name'])
-        self.assertTrue(self.user.check_password(payload['password']))
\ No newline at end of file
+        self.assertTrue(self.user.check_password(payload['password']))
+
+
+class ImportUsersApiTests(TestCase):
+    """Test importing users in bulk."""
+
+    def setUp(self):
+        self.admin = create_user(email='admin@example.com',
+                                 password='testpass123',
+                                 is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_import_users(self):
+        """Test importing users from JSON lines with tokens."""
+        rows = [
+            {'email': 'user1@EXAMPLE.com', 'password': 'testpass1',
+             'name': 'User One'},
+            {'email': 'user2@example.com', 'name': 'User Two',
+             'gender': 2, 'birth': '1990-04-10'},
+        ]
+        body = '\n'.join(json.dumps(row) for row in rows)
+        res = self.client.post(IMPORT_URL + '?tokens=true', body,
+                               content_type='application/x-ndjson')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['created'], 2)
+        self.assertEqual(res.data['errors'], [])
+        user1 = get_user_model().objects.get(email='user1@example.com')
+        self.assertTrue(user1.check_password('testpass1'))
+        user2 = get_user_model().objects.get(email='user2@example.com')
+        self.assertFalse(user2.has_usable_password())
+        self.assertEqual(user2.gender, 2)
+        self.assertEqual(
+            {token['email']: token['token'] for token in res.data['tokens']},
+            dict(Token.objects.values_list('user__email', 'key')),
+        )
+
+    def test_import_users_csv(self):
+        """Test importing users from CSV with blank optional columns."""
+        body = (
+            'email,password,name,gender,birth\n'
+            'user1@example.com,testpass1,User One,1,1990-04-10\n'
+            'user2@example.com,,User Two,,\n'
+        )
+        res = self.client.post(IMPORT_URL + '?input=csv', body,
+                               content_type='text/csv')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['created'], 2)
+        self.assertNotIn('tokens', res.data)
+        self.assertFalse(Token.objects.exists())
+
+    def test_import_users_reports_row_errors(self):
+        """Test importing users reports invalid rows by line number."""
+        body = '\n'.join([
+            json.dumps({'email': 'user1@example.com', 'name': 'One'}),
+            'not json',
+            json.dumps({'email': 'admin@example.com', 'name': 'Admin'}),
+            json.dumps({'email': 'user1@Example.com', 'name': 'Again'}),
+            json.dumps({'email': 'user5@com', 'name': 'Bad'}),
+            json.dumps({'email': 'user6@example.com', 'password': 'abc',
+                        'name': 'Short'}),
+        ])
+        res = self.client.post(IMPORT_URL, body,
+                               content_type='application/x-ndjson')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['created'], 1)
+        errors = {error['line']: error['errors']
+                  for error in res.data['errors']}
+        self.assertEqual(sorted(errors), [2, 3, 4, 5, 6])
+        self.assertIn('email', errors[3])
+        self.assertIn('email', errors[4])
+        self.assertIn('email', errors[5])
+        self.assertIn('password', errors[6])
+
+    def test_import_users_query_count_is_fixed_per_chunk(self):
+        """Test importing a chunk of users costs a fixed number of queries."""
+        def import_rows(count, prefix):
+            lines = [
+                json.dumps({'email': f'{prefix}{i}@example.com',
+                            'name': f'{prefix}{i}'})
+                for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                result = bulk.import_users(lines, chunk_size=100,
+                                           issue_tokens=True)
+            self.assertEqual(result['created'], count)
+            return len(queries)
+
+        self.assertEqual(import_rows(2, 'few'), import_rows(50, 'many'))
+
+    def test_import_users_reports_rows_lost_to_races(self):
+        """Test rows whose email keeps being taken are reported."""
+        create_users = bulk._create_users
+
+        def racing_create_users(rows, issue_tokens):
+            # Lose every chunk insert; another signup takes user2.
+            if len(rows) > 1:
+                raise IntegrityError
+            if rows[0][1]['email'] == 'user2@example.com':
+                create_user(email='user2@example.com', password='other123')
+            return create_users(rows, issue_tokens)
+
+        lines = [json.dumps({'email': f'user{i}@example.com',
+                             'name': f'User {i}'}) for i in range(1, 4)]
+        with patch('user.bulk._create_users',
+                   side_effect=racing_create_users):
+            result = bulk.import_users(lines, issue_tokens=True)
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(result['errors'], [
+            {'line': 2, 'errors': {'email': [bulk.EMAIL_TAKEN]}},
+        ])
+        self.assertEqual(len(result['tokens']), 2)
+
+    def test_import_users_bad_input_format(self):
+        """Test an unknown input format is rejected."""
+        res = self.client.post(IMPORT_URL + '?input=xml', '',
+                               content_type='application/xml')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_users_limited_to_admin(self):
+        """Test importing users is limited to admin."""
+        user = create_user(email='user@example.com', password='testpass123')
+        self.client.force_authenticate(user)
+        body = json.dumps({'email': 'new@example.com', 'name': 'New'})
+        res = self.client.post(IMPORT_URL, body,
+                               content_type='application/x-ndjson')
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(
+            get_user_model().objects.filter(email='new@example.com').exists()
+        )
@@ -2,24 +2,43 @@
 Views for the user API.
 """
 
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
 from rest_framework import (generics,
-                            authentication,
-                            permissions,)
+                            permissions,
+                            serializers,)
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.settings import api_settings
 
+from core.authentication import CachedTokenAuthentication
+from core.profiling import (
+    ProfilingMixin,
+    SerializerProfilingMixin,
+)
+from core.routers import ReplicaReadMixin
+from core.throttling import (
+    LoginEmailThrottle,
+    LoginIPThrottle,
+    SignupIPThrottle,
+)
+from user import bulk
 from user.serializers import (UserSerializer,
                               AuthTokenSerializer)
 
-class CreateUserView(generics.CreateAPIView):
+class CreateUserView(SerializerProfilingMixin, ReplicaReadMixin,
+                     generics.CreateAPIView):
     """Create a new user in the system."""
     serializer_class = UserSerializer
+    throttle_classes = [SignupIPThrottle]
 
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+class ManageUserView(SerializerProfilingMixin, ReplicaReadMixin,
+                     generics.RetrieveUpdateAPIView):
     """Manage the authenticate user"""
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
@@ -27,7 +46,36 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
         return self.request.user
 
 
-class CreateTokenView(ObtainAuthToken):
+class CreateTokenView(SerializerProfilingMixin, ObtainAuthToken):
     """Create a new auth token for user"""
     serializer_class = AuthTokenSerializer
-    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
\ No newline at end of file
+    throttle_classes = [LoginIPThrottle, LoginEmailThrottle]
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+
+
+class ImportUsersView(ProfilingMixin, APIView):
+    """Create users from a JSON Lines or, with ?input=csv, CSV body.
+
+    With ?tokens=true each created user also gets an auth token, which
+    is returned with its email.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated,
+                          permissions.IsAdminUser]
+
+    @extend_schema(
+        request={'application/x-ndjson': OpenApiTypes.STR,
+                 'text/csv': OpenApiTypes.STR},
+        responses=OpenApiTypes.OBJECT,
+    )
+    def post(self, request):
+        input_format = request.query_params.get('input', 'ndjson')
+        if input_format not in bulk.IMPORT_FORMATS:
+            raise serializers.ValidationError(
+                {'input': f'Choose one of {", ".join(bulk.IMPORT_FORMATS)}.'}
+            )
+        issue_tokens = request.query_params.get('tokens') == 'true'
+        result = bulk.import_users(request.stream or [], input_format,
+                                   issue_tokens=issue_tokens)
+
+        return Response(result)